@@ -24,6 +24,8 @@ from flask import Blueprint
 from flask import request
 from flask import jsonify
 
+from mindinsight.backend.application import cache_by_data_version
+from mindinsight.backend.application import compress_response
 from mindinsight.conf import settings
 from mindinsight.utils.exceptions import ParamMissError
 from mindinsight.datavisual.common.validation import Validation
@@ -35,9 +37,11 @@ from mindinsight.datavisual.data_transform.data_manager import DATA_MANAGER
 
 
 BLUEPRINT = Blueprint("task_manager", __name__, url_prefix=settings.URL_PATH_PREFIX+settings.API_PREFIX)
+BLUEPRINT.after_request(compress_response)
 
 
 @BLUEPRINT.route("/datavisual/single-job", methods=["GET"])
+@cache_by_data_version(DATA_MANAGER)
 def query_single_train_task():
     """Query single train task"""
     plugin_name = request.args.get('plugin_name')
@@ -98,6 +102,13 @@ def cache_train_jobs():
     return jsonify({'cache_result': cache_result})
 
 
+@BLUEPRINT.route("/datavisual/memory-usage", methods=["GET"])
+def query_memory_usage():
+    """Query memory usage of the train jobs in cache."""
+    processor = TrainTaskManager(DATA_MANAGER)
+    return jsonify(processor.get_memory_usage())
+
+
 def init_module(app):
     """
     Init module entry.
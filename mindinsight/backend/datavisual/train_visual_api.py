@@ -18,10 +18,14 @@ Backend interface module.
 This module provides the interfaces to train processors functions.
 """
 from flask import Blueprint
+from flask import current_app
 from flask import request
 from flask import jsonify
 
+from mindinsight.backend.application import cache_by_data_version
+from mindinsight.backend.application import compress_response
 from mindinsight.conf import settings
+from mindinsight.datavisual.utils import columnar
 from mindinsight.datavisual.utils.tools import get_train_id
 from mindinsight.datavisual.utils.tools import if_nan_inf_to_none
 from mindinsight.datavisual.processors.histogram_processor import HistogramProcessor
@@ -33,9 +37,40 @@ from mindinsight.datavisual.data_transform.data_manager import DATA_MANAGER
 
 
 BLUEPRINT = Blueprint("train_visual", __name__, url_prefix=settings.URL_PATH_PREFIX+settings.API_PREFIX)
+BLUEPRINT.after_request(compress_response)
+
+
+def _accept_columnar():
+    """
+    Check whether the columnar binary format is preferred to JSON by the `Accept` header of the request.
+
+    Returns:
+        bool, True if the response should be encoded in columnar binary format.
+    """
+    return request.accept_mimetypes.best_match(['application/json', columnar.MIMETYPE]) == columnar.MIMETYPE
+
+
+def _make_response(document, is_columnar):
+    """
+    Make the response of the document in the format negotiated.
+
+    Args:
+        document (dict): The document, in which arrays are numpy arrays if `is_columnar` is True.
+        is_columnar (bool): Whether to encode the document in columnar binary format.
+
+    Returns:
+        Response, the response, which varies with the `Accept` header.
+    """
+    if is_columnar:
+        response = current_app.response_class(columnar.encode(document), mimetype=columnar.MIMETYPE)
+    else:
+        response = jsonify(document)
+    response.vary.add('Accept')
+    return response
 
 
 @BLUEPRINT.route("/datavisual/image/metadata", methods=["GET"])
+@cache_by_data_version(DATA_MANAGER)
 def image_metadata():
     """
     Interface to fetch metadata about the images for the particular run,tag, and zero-indexed sample.
@@ -54,6 +89,7 @@ def image_metadata():
 
 
 @BLUEPRINT.route("/datavisual/image/single-image", methods=["GET"])
+@cache_by_data_version(DATA_MANAGER)
 def single_image():
     """
     Interface to fetch raw image data for a particular image.
@@ -71,6 +107,7 @@ def single_image():
 
 
 @BLUEPRINT.route("/datavisual/scalar/metadata", methods=["GET"])
+@cache_by_data_version(DATA_MANAGER)
 def scalar_metadata():
     """
     Interface to fetch metadata about the scalars for the particular run and tag.
@@ -80,10 +117,13 @@ def scalar_metadata():
             one of which is an object containing items' wall_time, step and value.
     """
     tag = request.args.get("tag")
+    max_points = request.args.get("max_points", default=None)
+    start_step = request.args.get("start_step", default=None)
+    end_step = request.args.get("end_step", default=None)
     train_id = get_train_id(request)
 
     processor = ScalarsProcessor(DATA_MANAGER)
-    response = processor.get_metadata_list(train_id, tag)
+    response = processor.get_metadata_list(train_id, tag, max_points, start_step, end_step)
 
     metadatas = response['metadatas']
     for metadata in metadatas:
@@ -94,6 +134,7 @@ def scalar_metadata():
 
 
 @BLUEPRINT.route("/datavisual/graphs/nodes", methods=["GET"])
+@cache_by_data_version(DATA_MANAGER)
 def graph_nodes():
     """
     Interface to get graph nodes.
@@ -112,6 +153,7 @@ def graph_nodes():
 
 
 @BLUEPRINT.route("/datavisual/graphs/nodes/names", methods=["GET"])
+@cache_by_data_version(DATA_MANAGER)
 def graph_node_names():
     """
     Interface to query node names.
@@ -131,6 +173,7 @@ def graph_node_names():
 
 
 @BLUEPRINT.route("/datavisual/graphs/single-node", methods=["GET"])
+@cache_by_data_version(DATA_MANAGER)
 def graph_search_single_node():
     """
     Interface to search single node.
@@ -148,49 +191,61 @@ def graph_search_single_node():
 
 
 @BLUEPRINT.route("/datavisual/histograms", methods=["GET"])
+@cache_by_data_version(DATA_MANAGER)
 def histogram():
     """
     Interface to obtain histogram data.
 
     Returns:
-        Response, which contains a JSON object.
+        Response, which contains a JSON object, or columnar binary if it is accepted.
     """
     tag = request.args.get("tag", default=None)
+    since_version = request.args.get("since_version", default=None)
     train_id = get_train_id(request)
+    is_columnar = _accept_columnar()
 
     processor = HistogramProcessor(DATA_MANAGER)
-    response = processor.get_histograms(train_id, tag)
-    return jsonify(response)
+    response = processor.get_histograms(train_id, tag, columnar=is_columnar, since_version=since_version)
+    return _make_response(response, is_columnar)
 
 
 @BLUEPRINT.route("/datavisual/scalars", methods=["GET"])
+@cache_by_data_version(DATA_MANAGER)
 def get_scalars():
-    """Get scalar data for given train_ids and tags."""
+    """Get scalar data for given train_ids and tags, in JSON or columnar binary if it is accepted."""
     train_ids = request.args.getlist('train_id')
     tags = request.args.getlist('tag')
+    max_points = request.args.get('max_points', default=None)
+    start_step = request.args.get('start_step', default=None)
+    end_step = request.args.get('end_step', default=None)
+    since_version = request.args.get('since_version', default=None)
+    is_columnar = _accept_columnar()
 
     processor = ScalarsProcessor(DATA_MANAGER)
-    scalars = processor.get_scalars(train_ids, tags)
-    return jsonify({'scalars': scalars})
+    scalars = processor.get_scalars(train_ids, tags, max_points, start_step, end_step, columnar=is_columnar,
+                                    since_version=since_version)
+    return _make_response({'scalars': scalars}, is_columnar)
 
 
 @BLUEPRINT.route("/datavisual/tensors", methods=["GET"])
+@cache_by_data_version(DATA_MANAGER)
 def get_tensors():
     """
     Interface to obtain tensor data.
 
     Returns:
-        Response, which contains a JSON object.
+        Response, which contains a JSON object, or columnar binary if it is accepted.
     """
     train_ids = request.args.getlist('train_id')
     tags = request.args.getlist('tag')
     step = request.args.get("step", default=None)
     dims = request.args.get("dims", default=None)
     detail = request.args.get("detail", default=None)
+    is_columnar = _accept_columnar()
 
     processor = TensorProcessor(DATA_MANAGER)
-    response = processor.get_tensors(train_ids, tags, step, dims, detail)
-    return jsonify(response)
+    response = processor.get_tensors(train_ids, tags, step, dims, detail, columnar=is_columnar)
+    return _make_response(response, is_columnar)
 
 
 def init_module(app):
@@ -62,3 +62,7 @@ MAX_GRAPH_STEP_SIZE_PER_TAG = 1
 MAX_HISTOGRAM_STEP_SIZE_PER_TAG = 50
 MAX_TENSOR_STEP_SIZE_PER_TAG = 20
 MAX_TENSOR_RESPONSE_DATA_SIZE = 100000
+
+# Approximate max bytes of the events data of all the train jobs in cache, 0 for unlimited. When it is exceeded,
+# the train jobs least recently accessed are evicted first, and then the samples of heavy plugins.
+MAX_DETAIL_CACHE_BYTES = 4 * 1024 * 1024 * 1024
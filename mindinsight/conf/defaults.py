@@ -36,4 +36,6 @@ ENABLE_DEBUGGER = False
 # Datavisual default settings.
 ####################################
 RELOAD_INTERVAL = 3 # Seconds
+# Watch changes of summary directories through inotify on Linux, instead of reloading every reload interval.
+ENABLE_INOTIFY = True
 SUMMARY_BASE_DIR = os.getcwd()
@@ -67,6 +67,46 @@ class Validation:
             raise ParamValueError("'limit' should in [{}, {}].".format(min_value, max_value))
         return limit
 
+    @classmethod
+    def check_max_points(cls, max_points, min_value=4):
+        """
+        Check max_points parameter, it should be greater than or equal to min_value.
+
+        Args:
+            max_points (Union[str, int, None]): Value can be string number or int.
+            min_value (int): Max points should greater or equal this value. Default: 4.
+
+        Returns:
+            Union[int, None], max points, None if it is not given.
+        """
+
+        if max_points is None:
+            return None
+
+        max_points = to_int(max_points, 'max_points')
+        if max_points < min_value:
+            raise ParamValueError("'max_points' should be greater than or equal to {}.".format(min_value))
+        return max_points
+
+    @classmethod
+    def check_step_range(cls, start_step, end_step):
+        """
+        Check start_step and end_step parameters, start_step should not be greater than end_step.
+
+        Args:
+            start_step (Union[str, int, None]): Value can be string number or int.
+            end_step (Union[str, int, None]): Value can be string number or int.
+
+        Returns:
+            tuple[Union[int, None], Union[int, None]], start step and end step, None if it is not given.
+        """
+
+        start_step = None if start_step is None else to_int(start_step, 'start_step')
+        end_step = None if end_step is None else to_int(end_step, 'end_step')
+        if start_step is not None and end_step is not None and start_step > end_step:
+            raise ParamValueError("'start_step' should be less than or equal to 'end_step'.")
+        return start_step, end_step
+
     @classmethod
     def check_param_empty(cls, **kwargs):
         """
@@ -17,6 +17,7 @@ from mindinsight.utils.exceptions import PathNotExistError
 from mindinsight.datavisual.common.log import logger
 from mindinsight.datavisual.utils.tools import to_str
 from mindinsight.datavisual.data_access.local_file_system import LocalFileSystem
+from mindinsight.datavisual.data_access.mmap_reader import MmapReader
 
 _DEFAULT_BUFFER_SIZE = 24 * 1024 * 1024
 
@@ -26,7 +27,12 @@ _FILE_SYSTEMS[""] = LocalFileSystem()
 
 
 class FileHandler:
-    """File handler."""
+    """
+    File handler.
+
+    Files on local file system opened in binary mode are read through a memory mapping, and `read` returns
+    memoryview slices of the file, which callers copy only if they keep the data.
+    """
 
     def __init__(self, file_path, mode='rb'):
         """
@@ -50,6 +56,9 @@ class FileHandler:
         self._buff_offset = 0
         self._offset = 0
         self._binary_mode = 'b' in mode
+        self._mmap_reader = None
+        if self._binary_mode and 'r' in mode and isinstance(self._file_system, LocalFileSystem):
+            self._mmap_reader = MmapReader(self._file_path)
 
     @staticmethod
     def get_file_system(path):
@@ -137,13 +146,19 @@ class FileHandler:
             size (Union[None, int]): Number of bytes to read, If set None, read the whole file. Default: None.
 
         Returns:
-            str, a certain number of bytes.
+            Union[str, bytes, memoryview], a certain number of bytes. A memoryview is returned if the file is
+                read through a memory mapping.
         """
         if size is None:
             result = self._file_system.read(self._file_path, self._binary_mode)
             self._offset = len(result)
             return result
 
+        if self._mmap_reader is not None:
+            result = self._mmap_reader.read(self._offset, size)
+            self._offset += len(result)
+            return result
+
         result = None
         if self._buff and len(self._buff) > self._buff_offset:
             read_offset = self._buff_offset + size if size is not None else len(self._buff)
@@ -182,6 +197,11 @@ class FileHandler:
         self._buff_offset += read_size
         return self._buff[old_buff_offset:old_buff_offset + read_size]
 
+    def close(self):
+        """Close the memory mapping of the file, if the file is read through one."""
+        if self._mmap_reader is not None:
+            self._mmap_reader.close()
+
     def reset_offset(self, offset):
         """
         Reset offset and buff_offset, clean buff.
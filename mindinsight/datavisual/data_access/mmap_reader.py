@@ -0,0 +1,109 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Memory-mapped reader for local files."""
+import mmap
+import os
+
+from mindinsight.datavisual.common.log import logger
+from mindinsight.datavisual.utils.tools import to_str
+
+
+class MmapReader:
+    """
+    Read-only memory-mapped reader of a local file.
+
+    Data are returned as memoryview slices of the mapping, so headers and checksums are read and checked without
+    copying. Callers keeping the data or sending it to other processes still copy it, e.g. the summary parser copies
+    each event body once to send it to the worker processes.
+    The mapping is created lazily and is extended when a read goes beyond the mapped size and the file has grown,
+    e.g. when training is still appending to a summary file.
+
+    Note that the file should only be appended to. Accessing the pages of a mapped file beyond its end makes the
+    process crash with SIGBUS, so the file is mapped again if it is found truncated before reading, which narrows
+    but can not close the window of a file truncated while the bytes read are still in use.
+
+    Args:
+        file_path (str): File path.
+    """
+
+    def __init__(self, file_path):
+        self._file_path = to_str(file_path)
+        self._mmap = None
+        self._view = memoryview(b'')
+
+    @property
+    def file_path(self):
+        """Get file path."""
+        return self._file_path
+
+    @property
+    def mapped_size(self):
+        """Get the size of the current mapping."""
+        return len(self._view)
+
+    def remap(self):
+        """
+        Map the file again if it has grown since it was mapped.
+
+        Returns:
+            int, the size of the current mapping.
+        """
+        file_size = os.path.getsize(self._file_path)
+        if file_size <= len(self._view):
+            return len(self._view)
+
+        with open(self._file_path, 'rb') as file:
+            mapped_file = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        logger.debug("Map file %s, old size %d, new size %d.", self._file_path, len(self._view), len(mapped_file))
+        self.close()
+        self._mmap = mapped_file
+        self._view = memoryview(mapped_file)
+        return len(self._view)
+
+    def close(self):
+        """
+        Close the mapping and the file descriptor it holds.
+
+        If slices handed out are still in use, the mapping is closed once all of them are released.
+        """
+        self._view.release()
+        self._view = memoryview(b'')
+        mapped_file = self._mmap
+        if mapped_file is None:
+            return
+        self._mmap = None
+        try:
+            mapped_file.close()
+        except BufferError:
+            logger.debug("Mapping of file %s is in use and will be closed when it is released.", self._file_path)
+
+    def read(self, offset, size=None):
+        """
+        Read bytes from the mapping.
+
+        Args:
+            offset (int): The start offset to read bytes from.
+            size (Union[None, int]): Number of bytes to read. If set None, read to the end of file. Default: None.
+
+        Returns:
+            memoryview, the bytes read, which may be shorter than `size` if the end of file is reached.
+        """
+        end = None if size is None else offset + size
+        if self._mmap is not None and self._mmap.size() < len(self._view):
+            logger.warning("File %s is truncated and will be mapped again.", self._file_path)
+            self.close()
+        if end is None or end > len(self._view):
+            self.remap()
+        return self._view[offset:end]
@@ -17,6 +17,7 @@ DataLoader is an adapter for all other loaders.
 
 This module can identify what loader should be used to load data.
 """
+import threading
 
 from mindinsight.datavisual.common.log import logger
 from mindinsight.datavisual.data_transform.ms_data_loader import MSDataLoader
@@ -33,38 +34,75 @@ class DataLoader:
     def __init__(self, summary_dir):
         self._summary_dir = summary_dir
         self._loader = None
+        self._loader_mutex = threading.Lock()
 
-    def load(self, executor=None):
-        """Load the data when loader is exist.
-
-        Args:
-            executor (Optional[Executor]): The executor instance.
+    def _init_loader(self):
+        """
+        Initialize the loader, and restore the events data from snapshot if there is one.
 
         Returns:
-            bool, True if the loader is finished loading.
+            bool, True if there is a loader for the directory.
         """
+        with self._loader_mutex:
+            if self._loader is not None:
+                return True
 
-        if self._loader is None:
             ms_dataloader = MSDataLoader(self._summary_dir)
             loaders = [ms_dataloader]
             for loader in loaders:
                 if loader.filter_valid_files():
+                    loader.restore_snapshot()
                     self._loader = loader
-                    break
+                    return True
+            return False
+
+    def load(self, executor=None):
+        """Load the data when loader is exist.
+
+        Args:
+            executor (Optional[Executor]): The executor instance.
+
+        Returns:
+            bool, True if the loader is finished loading.
+        """
 
-            if self._loader is None:
-                logger.warning("No valid files can be loaded, summary_dir: %s.", self._summary_dir)
-                raise exceptions.SummaryLogPathInvalid()
+        if not self._init_loader():
+            logger.warning("No valid files can be loaded, summary_dir: %s.", self._summary_dir)
+            raise exceptions.SummaryLogPathInvalid()
 
         return self._loader.load(executor)
 
+    def save_snapshot(self, force=False):
+        """
+        Save snapshot of the events data, called after all the tasks submitted are finished.
+
+        Args:
+            force (bool): Whether to save snapshot even if the files are still changing. Default: False.
+        """
+        if self._loader is not None:
+            self._loader.save_snapshot(force)
+
+    def get_nbytes_by_plugin(self):
+        """
+        Get the approximate number of bytes of the events data of each plugin.
+
+        Returns:
+            dict[str, int], the number of bytes by plugin name, empty if the events data is not restored or loaded.
+        """
+        if self._loader is None:
+            return {}
+        return self._loader.get_events_data().get_nbytes_by_plugin()
+
     def get_events_data(self):
         """
         Get events data from log file.
 
+        The events data is restored from snapshot on first access, before it is loaded.
+
         Returns:
             EventsData, indiciates events data.
         """
+        self._init_loader()
         return self._loader.get_events_data()
 
     def has_valid_files(self):
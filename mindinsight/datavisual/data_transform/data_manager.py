@@ -21,12 +21,14 @@ It can read events data through the DataLoader.
 This module also acts as a thread pool manager.
 """
 import abc
+import atexit
 import datetime
 import threading
 import time
 import os
 from typing import Iterable, Optional
 
+from mindinsight.datavisual.data_transform.summary_change_watcher import SummaryChangeWatcher
 from mindinsight.datavisual.data_transform.summary_watcher import SummaryWatcher
 
 from mindinsight.conf import settings
@@ -38,12 +40,22 @@ from mindinsight.datavisual.common.enums import PluginNameEnum
 from mindinsight.datavisual.common.exceptions import TrainJobNotExistError
 from mindinsight.datavisual.data_transform.loader_generators.loader_generator import MAX_DATA_LOADER_SIZE
 from mindinsight.datavisual.data_transform.loader_generators.data_loader_generator import DataLoaderGenerator
-from mindinsight.utils.computing_resource_mgr import ComputingResourceManager
+from mindinsight.datavisual.data_transform.reservoir import SamplesDelta
+from mindinsight.utils.computing_resource_mgr import ComputingResourceManager, TaskPriority
 from mindinsight.utils.exceptions import MindInsightException
 from mindinsight.utils.exceptions import ParamValueError
 from mindinsight.utils.exceptions import UnknownError
 from mindinsight.datavisual.utils.tools import exception_wrapper
 
+# Train jobs accessed within this time, in seconds, are loaded before the others.
+FOREGROUND_ACCESS_TIME = 120
+# While foreground train jobs are loading, background ones are loaded in turn within this ratio of the time taken
+# by the foreground ones in every round.
+BACKGROUND_TIME_SLICE_RATIO = 1 / 3
+
+# Plugins whose samples are evicted when the memory budget of detail cache is exceeded.
+_EVICTABLE_PLUGINS = (PluginNameEnum.TENSOR.value, PluginNameEnum.IMAGE.value, PluginNameEnum.HISTOGRAM.value)
+
 
 class _BasicTrainJob:
     """
@@ -125,6 +137,7 @@ class CachedTrainJob:
     def __init__(self, basic_info: _BasicTrainJob):
         self._basic_info = basic_info
         self._last_access_time = datetime.datetime.utcnow()
+        self._accessed = False
 
         # Other cached content is stored here.
         self._content = {}
@@ -145,12 +158,27 @@ class CachedTrainJob:
     def update_access_time(self):
         """Update last access time of this cache item."""
         self._last_access_time = datetime.datetime.utcnow()
+        self._accessed = True
 
     @property
     def last_access_time(self):
         """Get last access time for purposes such as LRU."""
         return self._last_access_time
 
+    def is_recently_accessed(self, access_time=FOREGROUND_ACCESS_TIME):
+        """
+        Check whether this cache item is accessed recently.
+
+        Args:
+            access_time (int): Time in seconds. Default: FOREGROUND_ACCESS_TIME.
+
+        Returns:
+            bool, True if this cache item is accessed within the given time.
+        """
+        if not self._accessed:
+            return False
+        return datetime.datetime.utcnow() - self._last_access_time < datetime.timedelta(seconds=access_time)
+
     @property
     def abs_summary_dir(self):
         """Get summary directory path."""
@@ -354,7 +382,7 @@ class _BaseCacheManager:
         """Whether this cache manager has train jobs."""
         return bool(self._cache_items)
 
-    def update_cache(self, executor):
+    def update_cache(self, executor, train_ids=None):
         """
         Update cache according to given train jobs on disk.
 
@@ -362,6 +390,8 @@ class _BaseCacheManager:
 
         Args:
             executor (Executor): The Executor instance.
+            train_ids (Optional[set[str]]): Train ids of the changed train jobs. If it is None, all the train jobs
+                are updated. Default: None.
         """
         raise NotImplementedError()
 
@@ -378,13 +408,52 @@ class _BriefCacheManager(_BaseCacheManager):
         Args:
             train_id (str): Train Id.
         """
-        if train_id in self._cache_items:
-            self._cache_items[train_id].update_access_time()
-
+        self.update_access_time(train_id)
         return False
 
-    def update_cache(self, executor):
+    def update_access_time(self, train_id):
+        """
+        Update last access time of given train job, if it is cached.
+
+        Args:
+            train_id (str): Train Id.
+        """
+        cache_item = self._cache_items.get(train_id)
+        if cache_item is not None:
+            cache_item.update_access_time()
+
+    def is_recently_accessed(self, train_id):
+        """
+        Check whether given train job is accessed recently.
+
+        Args:
+            train_id (str): Train Id.
+
+        Returns:
+            bool, True if the train job is accessed within `FOREGROUND_ACCESS_TIME`.
+        """
+        cache_item = self._cache_items.get(train_id)
+        return cache_item is not None and cache_item.is_recently_accessed()
+
+    def get_last_access_time(self, train_id):
+        """
+        Get last access time of given train job.
+
+        Args:
+            train_id (str): Train Id.
+
+        Returns:
+            Union[datetime.datetime, None], the last access time, None if the train job is not cached.
+        """
+        cache_item = self._cache_items.get(train_id)
+        return None if cache_item is None else cache_item.last_access_time
+
+    def update_cache(self, executor, train_ids=None):
         """Update cache."""
+        if train_ids is not None:
+            self._update_train_jobs(train_ids)
+            return
+
         logger.info('Start to update BriefCacheManager.')
         summaries_info = SummaryWatcher().list_summary_directories(self._summary_base_dir)
 
@@ -402,6 +471,34 @@ class _BriefCacheManager(_BaseCacheManager):
             for cache_item in self._cache_items.values():
                 updater.update_item(cache_item)
 
+    def _update_train_jobs(self, train_ids):
+        """
+        Update the given train jobs, without walking the whole summary base directory.
+
+        Args:
+            train_ids (set[str]): Train ids of the changed train jobs.
+        """
+        summary_watcher = SummaryWatcher()
+        updated_cache_items = []
+        with self._lock:
+            for train_id in train_ids:
+                info = summary_watcher.get_summary_directory(self._summary_base_dir, train_id)
+                if info is None:
+                    self._cache_items.pop(train_id, None)
+                    continue
+                train_job = _BasicTrainJob(abs_summary_base_dir=self._summary_base_dir, entry=info)
+                cache_item = self._cache_items.get(train_job.train_id)
+                if cache_item is None:
+                    cache_item = CachedTrainJob(train_job)
+                    self._cache_items[train_job.train_id] = cache_item
+                else:
+                    cache_item.basic_info = train_job
+                updated_cache_items.append(cache_item)
+
+        for updater in self._updaters.values():
+            for cache_item in updated_cache_items:
+                updater.update_item(cache_item)
+
     def _merge_with_disk(self, disk_train_jobs: Iterable[_BasicTrainJob]):
         """
         Merge train jobs in cache with train jobs from disk
@@ -438,12 +535,38 @@ DATAVISUAL_CACHE_KEY = "datavisual"
 
 
 class _DetailCacheManager(_BaseCacheManager):
-    """A cache manager that holds detailed info for most recently used train jobs."""
-    def __init__(self, summary_base_dir):
+    """
+    A cache manager that holds detailed info for most recently used train jobs.
+
+    Loaders of foreground train jobs, which are requested to be cached or accessed recently, are executed first in
+    every round. The others are executed as background tasks, in turn within a time slice of every round until the
+    foreground ones are finished loading, and all of them in every round after that.
+
+    The approximate bytes of the events data are limited by `MAX_DETAIL_CACHE_BYTES`. When it is exceeded, loaders of
+    background train jobs are evicted from the least recently accessed one, and they are not loaded again until they
+    are requested to be cached, or the events data shrink to half of the budget. Then every other sample of the
+    heaviest plugins is evicted.
+
+    Args:
+        summary_base_dir (str): Base summary directory.
+        is_recently_accessed (Optional[Callable[[str], bool]]): Check whether a train job is accessed recently by
+            train id. Default: None.
+        get_last_access_time (Optional[Callable[[str], Union[datetime.datetime, None]]]): Get last access time of
+            a train job by train id. Default: None.
+    """
+    def __init__(self, summary_base_dir, is_recently_accessed=None, get_last_access_time=None):
         super().__init__(summary_base_dir)
+        self._is_recently_accessed = is_recently_accessed
+        self._get_last_access_time = get_last_access_time
+        # Train ids of the train jobs requested to be cached and not finished loading yet.
+        self._requested_train_ids = set()
         self._loader_pool = {}
+        # Loader ids evicted to keep the memory budget.
+        self._evicted_loader_ids = set()
         self._deleted_id_list = []
         self._loader_pool_mutex = threading.Lock()
+        # Index of the background loader to be executed first in the next time slice.
+        self._background_loader_index = 0
         self._loader_generators = [DataLoaderGenerator(summary_base_dir)]
         self._loading_mutex = threading.Lock()
 
@@ -466,7 +589,7 @@ class _DetailCacheManager(_BaseCacheManager):
         """Get loader pool size."""
         return len(self._loader_pool)
 
-    def update_cache(self, executor):
+    def update_cache(self, executor, train_ids=None):
         """
         Update cache.
 
@@ -474,11 +597,15 @@ class _DetailCacheManager(_BaseCacheManager):
 
         Args:
             executor (Executor): The Executor instance.
+            train_ids (Optional[set[str]]): Train ids of the changed train jobs. If it is None, loaders are
+                generated by walking the summary base directory and all of them are executed. Default: None.
         """
         with self._loading_mutex:
             load_in_cache = exception_wrapper(self._execute_load_data)
             try:
-                while not load_in_cache(executor):
+                if train_ids is not None:
+                    exception_wrapper(self._add_changed_loaders)(train_ids)
+                while not load_in_cache(executor, train_ids):
                     yield
             except UnknownError as ex:
                 logger.warning("Load event data failed. Detail: %s.", str(ex))
@@ -501,7 +628,9 @@ class _DetailCacheManager(_BaseCacheManager):
                 if loader is None:
                     raise TrainJobNotExistError(train_id)
 
+                self._evicted_loader_ids.discard(loader.loader_id)
                 self._add_loader(loader)
+                self._requested_train_ids.add(loader.loader_id)
                 need_reload = True
 
         self._update_loader_latest_update_time(loader.loader_id)
@@ -540,6 +669,7 @@ class _DetailCacheManager(_BaseCacheManager):
         if self._loader_pool.get(loader_id) is not None:
             logger.debug("delete loader %s", loader_id)
             self._loader_pool.pop(loader_id)
+        self._requested_train_ids.discard(loader_id)
 
     def _execute_loader(self, loader_id, executor):
         """
@@ -577,6 +707,19 @@ class _DetailCacheManager(_BaseCacheManager):
                 self._delete_loader(loader_id)
             return True
 
+    def save_snapshots(self, force=False):
+        """
+        Save snapshots of the events data of all the loaders, called after all the tasks submitted are finished.
+
+        Args:
+            force (bool): Whether to save snapshots even if the files are still changing. Default: False.
+        """
+        for loader_id, loader in self._get_snapshot_loader_pool().items():
+            try:
+                loader.data_loader.save_snapshot(force)
+            except MindInsightException as ex:
+                logger.warning("Save snapshot of data loader %r failed. Detail: %s", loader_id, ex)
+
     def _generate_loaders(self):
         """This function generates the loader from given path."""
         loader_dict = {}
@@ -598,9 +741,12 @@ class _DetailCacheManager(_BaseCacheManager):
         """
 
         with self._loader_pool_mutex:
+            # Train jobs removed or no longer among the latest ones are forgotten.
+            self._evicted_loader_ids.intersection_update(loader_id for loader_id, _ in latest_loaders)
             for loader_id, loader in latest_loaders:
                 if self._loader_pool.get(loader_id, None) is None:
-                    self._add_loader(loader)
+                    if loader_id not in self._evicted_loader_ids:
+                        self._add_loader(loader)
                     continue
 
                 # If this loader was updated manually before,
@@ -608,15 +754,181 @@ class _DetailCacheManager(_BaseCacheManager):
                 if self._loader_pool[loader_id].latest_update_time < loader.latest_update_time:
                     self._update_loader_latest_update_time(loader_id, loader.latest_update_time)
 
-    def _execute_load_data(self, executor):
-        """Load data through multiple threads."""
-        self._generate_loaders()
+    def _add_changed_loaders(self, train_ids):
+        """
+        Add loaders of the changed train jobs which are not in loader pool.
+
+        Args:
+            train_ids (set[str]): Train ids of the changed train jobs.
+        """
+        for train_id in train_ids:
+            if train_id in self._evicted_loader_ids or \
+                    self._is_loader_in_loader_pool(train_id, self._get_snapshot_loader_pool()):
+                continue
+            for generator in self._loader_generators:
+                if not generator.check_train_job_exist(train_id):
+                    continue
+                loader = generator.generate_loader_by_train_id(train_id)
+                if loader.data_loader.has_valid_files():
+                    with self._loader_pool_mutex:
+                        self._add_loader(loader)
+                    break
+
+    def _execute_load_data(self, executor, train_ids=None):
+        """
+        Load data through multiple threads.
+
+        Args:
+            executor (Executor): The Executor instance.
+            train_ids (Optional[set[str]]): Train ids of the changed train jobs. If it is None, loaders are
+                generated by walking the summary base directory and all of them are executed. Default: None.
+
+        Returns:
+            bool, True if the loaders are finished loading.
+        """
+        if train_ids is None:
+            self._generate_loaders()
         loader_pool = self._get_snapshot_loader_pool()
-        loaded = True
+        with self._loader_pool_mutex:
+            requested_train_ids = set(self._requested_train_ids)
+        foreground_loader_ids = []
+        background_loader_ids = []
         for loader_id in loader_pool:
-            loaded = self._execute_loader(loader_id, executor) and loaded
+            if loader_id in requested_train_ids:
+                # Train jobs just requested are loaded first, even if they are not changed.
+                foreground_loader_ids.insert(0, loader_id)
+            elif train_ids is not None and loader_id not in train_ids:
+                continue
+            elif self._is_recently_accessed is not None and self._is_recently_accessed(loader_id):
+                foreground_loader_ids.append(loader_id)
+            else:
+                background_loader_ids.append(loader_id)
+
+        loaded = True
+        start_time = time.time()
+        for loader_id in foreground_loader_ids:
+            if self._execute_loader(loader_id, executor):
+                with self._loader_pool_mutex:
+                    self._requested_train_ids.discard(loader_id)
+            else:
+                loaded = False
+            self._check_memory_budget()
+
+        deadline = None
+        if not loaded and background_loader_ids:
+            # One round of all the loaders takes much longer, so only some of the background loaders are executed
+            # in turn, to not starve them while the foreground ones are loading.
+            deadline = time.time() + (time.time() - start_time) * BACKGROUND_TIME_SLICE_RATIO
+            index = self._background_loader_index % len(background_loader_ids)
+            background_loader_ids = background_loader_ids[index:] + background_loader_ids[:index]
+
+        with executor.priority(TaskPriority.BACKGROUND):
+            for loader_id in background_loader_ids:
+                with self._loader_pool_mutex:
+                    requested = not self._requested_train_ids.issubset(requested_train_ids)
+                if requested:
+                    # Start the next round at once for the train jobs requested in this round.
+                    return False
+                loaded = self._execute_loader(loader_id, executor) and loaded
+                self._check_memory_budget()
+                if deadline is not None:
+                    self._background_loader_index += 1
+                    if time.time() >= deadline:
+                        break
         return loaded
 
+    def _is_foreground(self, loader_id):
+        """Check whether the train job is requested to be cached or accessed recently."""
+        with self._loader_pool_mutex:
+            if loader_id in self._requested_train_ids:
+                return True
+        return self._is_recently_accessed is not None and self._is_recently_accessed(loader_id)
+
+    def _get_access_order(self, loader_id):
+        """Get the sort key of the train job by last access time, the train jobs never accessed come first."""
+        last_access_time = None
+        if self._get_last_access_time is not None:
+            last_access_time = self._get_last_access_time(loader_id)
+        return last_access_time or datetime.datetime.min
+
+    def _check_memory_budget(self):
+        """Evict loaders of background train jobs, and then samples of heavy plugins, if memory budget is exceeded."""
+        max_bytes = settings.MAX_DETAIL_CACHE_BYTES
+        if not max_bytes:
+            with self._loader_pool_mutex:
+                self._evicted_loader_ids.clear()
+            return
+        loader_pool = self._get_snapshot_loader_pool()
+        nbytes_by_loader = {loader_id: loader.data_loader.get_nbytes_by_plugin()
+                            for loader_id, loader in loader_pool.items()}
+        total_bytes = sum(sum(nbytes_by_plugin.values()) for nbytes_by_plugin in nbytes_by_loader.values())
+        if total_bytes <= max_bytes:
+            if total_bytes <= max_bytes // 2:
+                self._readmit_evicted_loader()
+            return
+
+        # The most recently accessed loader is always kept, and the latest updated one if none is accessed.
+        sorted_loaders = sorted(loader_pool.values(),
+                                key=lambda loader: (self._get_access_order(loader.loader_id),
+                                                    loader.latest_update_time))[:-1]
+        for loader in sorted_loaders:
+            if total_bytes <= max_bytes:
+                return
+            if self._is_foreground(loader.loader_id):
+                continue
+            with self._loader_pool_mutex:
+                self._delete_loader(loader.loader_id)
+                self._evicted_loader_ids.add(loader.loader_id)
+            nbytes = sum(nbytes_by_loader.pop(loader.loader_id).values())
+            total_bytes -= nbytes
+            logger.info("Evict loader %r of %d bytes to keep memory budget.", loader.loader_id, nbytes)
+
+        evictable_bytes = {(loader_id, plugin_name): nbytes_by_plugin.get(plugin_name, 0)
+                           for loader_id, nbytes_by_plugin in nbytes_by_loader.items()
+                           for plugin_name in _EVICTABLE_PLUGINS}
+        while total_bytes > max_bytes and evictable_bytes:
+            loader_id, plugin_name = max(evictable_bytes, key=evictable_bytes.get)
+            events_data = loader_pool[loader_id].data_loader.get_events_data()
+            freed_bytes = events_data.evict_samples(plugin_name)
+            if freed_bytes <= 0:
+                evictable_bytes.pop((loader_id, plugin_name))
+                continue
+            evictable_bytes[(loader_id, plugin_name)] -= freed_bytes
+            total_bytes -= freed_bytes
+            logger.info("Evict %d bytes of %s samples of loader %r to keep memory budget.",
+                        freed_bytes, plugin_name, loader_id)
+
+    def _readmit_evicted_loader(self):
+        """
+        Readmit the most recently accessed one of the evicted train jobs, which is loaded again in the next reload.
+
+        Only one train job is readmitted at a time, so that the readmitted ones do not exceed the budget again at once.
+        """
+        with self._loader_pool_mutex:
+            if not self._evicted_loader_ids:
+                return
+            loader_id = max(self._evicted_loader_ids, key=self._get_access_order)
+            self._evicted_loader_ids.discard(loader_id)
+        logger.info("Readmit evicted loader %r as memory budget is available.", loader_id)
+
+    def get_memory_usage(self):
+        """
+        Get the approximate memory usage of the events data of the train jobs in cache.
+
+        Returns:
+            dict, the memory budget, the total bytes, and the bytes of each train job by plugin.
+        """
+        train_jobs = []
+        for loader_id, loader in self._get_snapshot_loader_pool().items():
+            nbytes_by_plugin = loader.data_loader.get_nbytes_by_plugin()
+            train_jobs.append(dict(train_id=loader_id,
+                                   nbytes=sum(nbytes_by_plugin.values()),
+                                   nbytes_by_plugin=nbytes_by_plugin))
+        train_jobs.sort(key=lambda train_job: train_job['nbytes'], reverse=True)
+        return dict(max_bytes=settings.MAX_DETAIL_CACHE_BYTES,
+                    total_bytes=sum(train_job['nbytes'] for train_job in train_jobs),
+                    train_jobs=train_jobs)
+
     def delete_train_job(self, train_id):
         """
         Delete train job with a train id.
@@ -627,6 +939,7 @@ class _DetailCacheManager(_BaseCacheManager):
         """
         with self._loader_pool_mutex:
             self._delete_loader(train_id)
+            self._evicted_loader_ids.discard(train_id)
 
     def list_tensors(self, train_id, tag):
         """
@@ -643,16 +956,45 @@ class _DetailCacheManager(_BaseCacheManager):
                 the value will contain the given tag data.
 
         """
+        return self._get_tensors(train_id, lambda events_data: events_data.tensors(tag), [])
+
+    def list_tensors_since(self, train_id, tag, version):
+        """
+        List tensors of the given train job and tag changed since the version, see `Reservoir.samples_since`.
+
+        Args:
+            train_id (str): ID for train job.
+            tag (str): The tag name.
+            version (int): Version of the tensors got before.
+
+        Returns:
+            SamplesDelta, the tensors changed.
+        """
+        return self._get_tensors(train_id, lambda events_data: events_data.tensors_since(tag, version),
+                                 SamplesDelta(None, None, []))
+
+    def _get_tensors(self, train_id, get_tensors, default):
+        """
+        Get tensors from the events data of the given train job.
+
+        Args:
+            train_id (str): ID for train job.
+            get_tensors (Callable[[EventsData], Any]): Get tensors from the events data.
+            default (Any): Tensors returned if the train job has been deleted or it has not loaded data.
+
+        Returns:
+            Any, the tensors got.
+        """
         loader_pool = self._get_snapshot_loader_pool()
         if not self._is_loader_in_loader_pool(train_id, loader_pool):
             raise TrainJobNotExistError("Can not find the given train job in cache.")
 
         data_loader = loader_pool[train_id].data_loader
 
-        tensors = []
+        tensors = default
         try:
             events_data = data_loader.get_events_data()
-            tensors = events_data.tensors(tag)
+            tensors = get_tensors(events_data)
         except KeyError:
             error_msg = "Can not find any data in this train job by given tag."
             raise ParamValueError(error_msg)
@@ -662,6 +1004,28 @@ class _DetailCacheManager(_BaseCacheManager):
 
         return tensors
 
+    def get_data_version(self, train_id):
+        """
+        Get the version of the data of the given train job, which changes whenever the data change.
+
+        Args:
+            train_id (str): ID for train job.
+
+        Returns:
+            Union[tuple, None], the cache status of the train job and the version of its events data, None if the
+                train job is not in cache or it has not loaded data.
+        """
+        loader = self._get_loader(train_id)
+        if loader is None:
+            return None
+        try:
+            events_data = loader.data_loader.get_events_data()
+        except AttributeError:
+            return None
+        if events_data is None:
+            return None
+        return (loader.cache_status.value,) + events_data.version
+
     def _check_train_job_exist(self, train_id, loader_pool):
         """
         Check train job exist, if not exist, will raise exception.
@@ -841,13 +1205,21 @@ class DataManager:
         self._status = DataManagerStatus.INIT.value
         self._status_mutex = threading.Lock()
 
-        self._detail_cache = _DetailCacheManager(self._summary_base_dir)
         self._brief_cache = _BriefCacheManager(self._summary_base_dir)
+        self._detail_cache = _DetailCacheManager(self._summary_base_dir,
+                                                 self._brief_cache.is_recently_accessed,
+                                                 self._brief_cache.get_last_access_time)
 
         # This lock is used to make sure that only one self._load_data_in_thread() is running.
         # Because self._load_data_in_thread() will create process pool when loading files, we can not
         # afford to run multiple self._load_data_in_thread() simultaneously (will create too many processes).
         self._load_data_lock = threading.Lock()
+        # Watcher of the changes in summary base directory, None if changes are found by polling.
+        self._change_watcher = None
+        # Set to wake up the loading thread polling changes, when a train job is requested to be cached.
+        self._reload_event = threading.Event()
+        # Worker processes are kept across reloads, to avoid the cost of spawning processes and importing modules.
+        self._computing_resource_mgr = None
 
     @property
     def summary_base_dir(self):
@@ -892,9 +1264,12 @@ class DataManager:
         if self._load_data_lock.locked():
             return
         with self._load_data_lock:
+            if reload_interval and settings.ENABLE_INOTIFY:
+                self._start_change_watcher()
+            train_ids = None
             while True:
                 try:
-                    exception_wrapper(self._load_data)()
+                    exception_wrapper(self._load_data)(train_ids)
                 except UnknownError as exc:
                     # Not raising the exception here to ensure that data reloading does not crash.
                     logger.warning(exc.message)
@@ -902,35 +1277,102 @@ class DataManager:
                     self._status = DataManagerStatus.DONE.value
                 if not reload_interval:
                     break
-                time.sleep(reload_interval)
+                train_ids = self._wait_changes(reload_interval)
+
+    def _start_change_watcher(self):
+        """Start watching the changes in summary base directory, before the first load to not miss any change."""
+        if self._change_watcher is not None:
+            return
+        change_watcher = SummaryChangeWatcher(self._summary_base_dir)
+        if change_watcher.start():
+            self._change_watcher = change_watcher
+
+    def _wait_changes(self, reload_interval):
+        """
+        Wait until the next reload.
 
-    def _load_data(self):
-        """This function will load data once and ignore it if the status is loading."""
+        Args:
+            reload_interval (int): Time to reload data again, if changes are not watched.
+
+        Returns:
+            Union[set[str], None], train ids of the changed train jobs, or None if all the train jobs should be
+                reloaded.
+        """
+        change_watcher = self._change_watcher
+        if change_watcher is not None:
+            try:
+                return change_watcher.wait_changes()
+            except OSError as ex:
+                logger.warning("Watch changes failed, changes will be found by polling. Detail: %s.", str(ex))
+                self._change_watcher = None
+                change_watcher.close()
+        self._reload_event.wait(reload_interval)
+        self._reload_event.clear()
+        return None
+
+    def _get_computing_resource_mgr(self):
+        """
+        Get the computing resource manager, which is created on the first load and reused by later loads.
+
+        Returns:
+            ComputingResourceManager, the computing resource manager.
+        """
+        if self._computing_resource_mgr is None:
+            self._computing_resource_mgr = ComputingResourceManager(executors_cnt=1,
+                                                                    max_processes_cnt=settings.MAX_PROCESSES_COUNT)
+            atexit.register(self.shutdown)
+        return self._computing_resource_mgr
+
+    def shutdown(self):
+        """
+        Shut down the worker processes kept across reloads, and save snapshots if no data is loading.
+
+        It is called at exit, and the data loaded are kept. Worker processes are created again by the next load.
+        """
+        atexit.unregister(self.shutdown)
+        with self._status_mutex:
+            # The events data being loaded are not consistent with the state of loaders, so they are not saved.
+            if self.status != DataManagerStatus.LOADING.value:
+                self._detail_cache.save_snapshots(force=True)
+        computing_resource_mgr = self._computing_resource_mgr
+        if computing_resource_mgr is not None:
+            self._computing_resource_mgr = None
+            computing_resource_mgr.shutdown()
+
+    def _load_data(self, train_ids=None):
+        """
+        This function will load data once and ignore it if the status is loading.
+
+        Args:
+            train_ids (Optional[set[str]]): Train ids of the changed train jobs. If it is None, all the train jobs
+                are loaded. Default: None.
+        """
         with self._status_mutex:
             if self.status == DataManagerStatus.LOADING.value:
                 logger.debug("Current status is %s , will ignore to load data.", self.status)
                 return
             self.status = DataManagerStatus.LOADING.value
 
-        with ComputingResourceManager(executors_cnt=1,
-                                      max_processes_cnt=settings.MAX_PROCESSES_COUNT) as computing_resource_mgr:
-            with computing_resource_mgr.get_executor() as executor:
-                self._brief_cache.update_cache(executor)
-                brief_cache_update = time.time()
-                for _ in self._detail_cache.update_cache(executor):
-                    update_interval = time.time() - brief_cache_update
-                    logger.debug('Loading one round of detail cache taking %ss.', update_interval)
-                    if update_interval > 3: # Use 3 seconds as threshold to avoid updating too often
-                        self._brief_cache.update_cache(executor)
-                        brief_cache_update += update_interval
-                executor.wait_all_tasks_finish()
-            with self._status_mutex:
-                if not self._brief_cache.has_content() and not self._detail_cache.has_content():
-                    self.status = DataManagerStatus.INVALID.value
-                else:
-                    self.status = DataManagerStatus.DONE.value
+        computing_resource_mgr = self._get_computing_resource_mgr()
+        with computing_resource_mgr.lease_executor() as executor:
+            self._brief_cache.update_cache(executor, train_ids)
+            brief_cache_update = time.time()
+            for _ in self._detail_cache.update_cache(executor, train_ids):
+                update_interval = time.time() - brief_cache_update
+                logger.debug('Loading one round of detail cache taking %ss.', update_interval)
+                if update_interval > 3: # Use 3 seconds as threshold to avoid updating too often
+                    self._brief_cache.update_cache(executor, train_ids)
+                    brief_cache_update += update_interval
+            executor.wait_all_tasks_finish()
+            self._detail_cache.save_snapshots()
+        logger.info("Computing resource metrics: %s.", computing_resource_mgr.get_metrics())
+        with self._status_mutex:
+            if not self._brief_cache.has_content() and not self._detail_cache.has_content():
+                self.status = DataManagerStatus.INVALID.value
+            else:
+                self.status = DataManagerStatus.DONE.value
 
-                logger.info("Load brief data end, and loader pool size is %r.", self._detail_cache.loader_pool_size())
+            logger.info("Load brief data end, and loader pool size is %r.", self._detail_cache.loader_pool_size())
 
     def get_train_job_by_plugin(self, train_id, plugin_name):
         """
@@ -948,6 +1390,7 @@ class DataManager:
 
         """
         self._check_status_valid()
+        self._brief_cache.update_access_time(train_id)
         return self._detail_cache.get_train_job_by_plugin(train_id, plugin_name)
 
     def delete_train_job(self, train_id, only_delete_from_cache=True):
@@ -980,8 +1423,47 @@ class DataManager:
 
         """
         self._check_status_valid()
+        self._brief_cache.update_access_time(train_id)
         return self._detail_cache.list_tensors(train_id, tag)
 
+    def list_tensors_since(self, train_id, tag, version):
+        """
+        List tensors of the given train job and tag changed since the version, for clients to update incrementally.
+
+        Args:
+            train_id (str): ID for train job.
+            tag (str): The tag name.
+            version (int): Version of the tensors got before, see `Reservoir.samples_since`.
+
+        Returns:
+            SamplesDelta, the tensors changed, and the version of them.
+        """
+        self._check_status_valid()
+        self._brief_cache.update_access_time(train_id)
+        return self._detail_cache.list_tensors_since(train_id, tag, version)
+
+    def get_data_version(self, train_ids):
+        """
+        Get the version of the data of the given train jobs, for responses to be cached and validated by it.
+
+        Getting the version does not count as accessing the train jobs, which are accessed by reading the data.
+
+        Args:
+            train_ids (list[str]): IDs of train jobs.
+
+        Returns:
+            Union[tuple, None], the version, None if it is unknown, e.g. when any train job has not loaded data.
+        """
+        if self.status == DataManagerStatus.INIT.value:
+            return None
+        versions = []
+        for train_id in train_ids:
+            version = self._detail_cache.get_data_version(train_id)
+            if version is None:
+                return None
+            versions.append(version)
+        return self.status, tuple(versions)
+
     def _check_status_valid(self):
         """Check if the status is valid to load data."""
 
@@ -1024,6 +1506,12 @@ class DataManager:
         brief_need_reload = self._brief_cache.cache_train_job(train_id)
         detail_need_reload = self._detail_cache.cache_train_job(train_id)
         if brief_need_reload or detail_need_reload:
+            change_watcher = self._change_watcher
+            if change_watcher is not None:
+                # The loading thread is waiting for changes.
+                change_watcher.notify(train_id)
+            else:
+                self._reload_event.set()
             self.start_load_data()
 
     def register_brief_cache_item_updater(self, updater: BaseCacheItemUpdater):
@@ -1034,6 +1522,15 @@ class DataManager:
         """Get brief cache."""
         return self._brief_cache
 
+    def get_memory_usage(self):
+        """
+        Get the approximate memory usage of the events data in cache.
+
+        Returns:
+            dict, refer to `_DetailCacheManager.get_memory_usage`.
+        """
+        return self._detail_cache.get_memory_usage()
+
     def get_brief_train_job(self, train_id):
         """Get brief train job."""
         return self._brief_cache.get_train_job(train_id)
@@ -98,7 +98,7 @@ class EventsData:
 
         with self._reservoir_mutex_lock:
             if tag not in self._reservoir_by_tag:
-                reservoir_size = self._get_reservoir_size(tensor_event.plugin_name)
+                reservoir_size = self.get_reservoir_size(tensor_event.plugin_name)
                 self._reservoir_by_tag[tag] = reservoir.ReservoirFactory().create_reservoir(
                     plugin_name, reservoir_size
                 )
@@ -138,6 +138,47 @@ class EventsData:
             if tag in self._reservoir_by_tag:
                 self._reservoir_by_tag.pop(tag)
 
+    def get_state(self):
+        """
+        Get the state of EventsData, which can be restored by `restore_state`.
+
+        Returns:
+            dict, the tags and the state of the reservoir of each tag.
+        """
+        tags_by_plugin = {}
+        for plugin_name, lock in list(self._tags_by_plugin_mutex_lock.items()):
+            with lock:
+                tags_by_plugin[plugin_name] = list(self._tags_by_plugin[plugin_name])
+        with self._reservoir_mutex_lock:
+            reservoir_by_tag = dict(self._reservoir_by_tag)
+        return dict(tags=list(self._tags),
+                    deleted_tags=list(self._deleted_tags),
+                    tags_by_plugin=tags_by_plugin,
+                    reservoirs={tag: reservoir_by_tag[tag].get_state() for tag in reservoir_by_tag})
+
+    def restore_state(self, state):
+        """
+        Restore the state of EventsData.
+
+        Args:
+            state (dict): The state got by `get_state`.
+        """
+        self._tags = list(state['tags'])
+        self._deleted_tags = set(state['deleted_tags'])
+        for plugin_name, tags in state['tags_by_plugin'].items():
+            with self._tags_by_plugin_mutex_lock[plugin_name]:
+                self._tags_by_plugin[plugin_name] = list(tags)
+
+        plugin_name_by_tag = {tag: plugin_name
+                              for plugin_name, tags in state['tags_by_plugin'].items() for tag in tags}
+        with self._reservoir_mutex_lock:
+            for tag, reservoir_state in state['reservoirs'].items():
+                plugin_name = plugin_name_by_tag[tag]
+                tensor_reservoir = reservoir.ReservoirFactory().create_reservoir(
+                    plugin_name, self.get_reservoir_size(plugin_name))
+                tensor_reservoir.restore_state(reservoir_state)
+                self._reservoir_by_tag[tag] = tensor_reservoir
+
     def list_tags_by_plugin(self, plugin_name):
         """
         Return all the tag names of the plugin.
@@ -157,6 +198,63 @@ class EventsData:
             # Return a snapshot to avoid concurrent mutation and iteration issues.
             return list(self._tags_by_plugin[plugin_name])
 
+    @property
+    def version(self):
+        """
+        Get the version of the samples of all the tags, which changes whenever any tag or sample changes.
+
+        As versions of reservoirs are unique and increasing, the latest one changes whenever a sample is added or
+        removed, or a tag is added, and the number of tags changes whenever a tag is deleted.
+
+        Returns:
+            tuple[int, int], the number of tags and the latest version of their reservoirs.
+        """
+        with self._reservoir_mutex_lock:
+            return len(self._reservoir_by_tag), max((tensor_reservoir.version for tensor_reservoir
+                                                     in self._reservoir_by_tag.values()), default=0)
+
+    @property
+    def nbytes(self):
+        """Get the approximate number of bytes of the samples of all the tags."""
+        with self._reservoir_mutex_lock:
+            reservoirs = list(self._reservoir_by_tag.values())
+        return sum(tensor_reservoir.nbytes for tensor_reservoir in reservoirs)
+
+    def get_nbytes_by_plugin(self):
+        """
+        Get the approximate number of bytes of the samples of each plugin.
+
+        Returns:
+            dict[str, int], the number of bytes by plugin name.
+        """
+        nbytes_by_plugin = {}
+        with self._reservoir_mutex_lock:
+            reservoir_by_tag = dict(self._reservoir_by_tag)
+        for plugin_name, lock in list(self._tags_by_plugin_mutex_lock.items()):
+            with lock:
+                tags = list(self._tags_by_plugin[plugin_name])
+            nbytes_by_plugin[plugin_name] = sum(reservoir_by_tag[tag].nbytes for tag in tags if tag in reservoir_by_tag)
+        return nbytes_by_plugin
+
+    def evict_samples(self, plugin_name):
+        """
+        Evict every other sample of each tag of the plugin to free memory, the latest sample of each tag is kept.
+
+        The reservoir of each tag keeps at most the samples left afterwards, see `Reservoir.evict_samples`.
+
+        Args:
+            plugin_name (str): The plugin name.
+
+        Returns:
+            int, the approximate number of bytes freed.
+        """
+        with self._tags_by_plugin_mutex_lock[plugin_name]:
+            tags = list(self._tags_by_plugin[plugin_name])
+        with self._reservoir_mutex_lock:
+            reservoirs = [self._reservoir_by_tag[tag] for tag in tags if tag in self._reservoir_by_tag]
+
+        return sum(tensor_reservoir.evict_samples() for tensor_reservoir in reservoirs)
+
     def tensors(self, tag):
         """
          Return all tensors of the tag.
@@ -171,6 +269,21 @@ class EventsData:
             raise KeyError('TAG %r could not be found.' % tag)
         return self._reservoir_by_tag[tag].samples()
 
+    def tensors_since(self, tag, version):
+        """
+        Return the tensors of the tag changed since the version.
+
+        Args:
+            tag (str): The tag name.
+            version (int): Version of the tensors got before, see `Reservoir.samples_since`.
+
+        Returns:
+            SamplesDelta, the tensors changed, and the version of them.
+        """
+        if tag not in self._reservoir_by_tag:
+            raise KeyError('TAG %r could not be found.' % tag)
+        return self._reservoir_by_tag[tag].samples_since(version)
+
     def _is_out_of_order_step(self, step, tag):
         """
         If the current step is smaller than the latest one, it is out-of-order step.
@@ -182,12 +295,10 @@ class EventsData:
         Returns:
             bool, boolean value.
         """
-        if self.tensors(tag):
-            tensors = self.tensors(tag)
-            last_step = tensors[-1].step
-            if step <= last_step:
-                return True
-        return False
+        if tag not in self._reservoir_by_tag:
+            raise KeyError('TAG %r could not be found.' % tag)
+        last_step = self._reservoir_by_tag[tag].latest_step()
+        return last_step is not None and step <= last_step
 
     @staticmethod
     def purge_reservoir_data(filename, start_step, tensor_reservoir):
@@ -207,7 +318,16 @@ class EventsData:
 
         return cnt_out_of_order
 
-    def _get_reservoir_size(self, plugin_name):
+    def get_reservoir_size(self, plugin_name):
+        """
+        Get the reservoir size of given plugin.
+
+        Args:
+            plugin_name (str): The plugin name.
+
+        Returns:
+            int, the reservoir size, 0 for unlimited.
+        """
         max_step_sizes_per_tag = self._config['max_step_sizes_per_tag']
         return max_step_sizes_per_tag.get(plugin_name, _DEFAULT_STEP_SIZES_PER_TAG)
 
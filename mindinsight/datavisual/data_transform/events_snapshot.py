@@ -0,0 +1,438 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""
+Snapshot of the events data of a summary directory, to warm start after restarting.
+
+A snapshot is a directory in the workspace, with an npz file for each tag. Samples of a tag are stored as columns:
+every sample has a step, wall time and file id, and its value is stored as plain columns for scalars, and as raw
+buffers with offsets for images, histograms and tensors. Tensors are stored as float32, which is the type of their
+data in summary files. Images referring to summary files are stored as the references. Graphs are pickled, as they
+are sent to other processes, and interned again when they are loaded. The tags, the state of the reservoirs and the
+state of the loader are stored as a JSON document, with the digest of the samples of each tag, so only the tags
+whose samples change are saved again.
+
+Pickled values are loaded only from the files owned by the current user and not writable by others, and only if
+their checksum matches, as unpickling runs arbitrary code.
+
+Snapshots of summary directories which no longer exist are removed, and so are the least recently used ones beyond
+`MAX_SNAPSHOT_COUNT`, when the snapshot of a new summary directory is saved.
+"""
+import collections
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import stat
+
+import numpy as np
+
+from mindinsight.conf import settings
+from mindinsight.datavisual.common.enums import PluginNameEnum
+from mindinsight.datavisual.common.log import logger
+from mindinsight.datavisual.data_transform.events_data import _Tensor
+from mindinsight.datavisual.data_transform.graph.graph_cache import GRAPH_CACHE
+from mindinsight.datavisual.data_transform.histogram import Bucket
+from mindinsight.datavisual.data_transform.histogram_container import HistogramContainer
+from mindinsight.datavisual.data_transform.image_container import ImageContainer, ImageReference
+from mindinsight.datavisual.data_transform.tensor_container import TensorContainer
+
+# Max count of the snapshots kept in the workspace, the least recently used ones are removed.
+MAX_SNAPSHOT_COUNT = 100
+_SNAPSHOT_VERSION = 6
+_META_FILENAME = 'meta.json'
+# Plugins whose values are stored as columns, the values of other plugins are pickled.
+_COLUMN_PLUGINS = (PluginNameEnum.SCALAR.value, PluginNameEnum.IMAGE.value,
+                   PluginNameEnum.HISTOGRAM.value, PluginNameEnum.TENSOR.value)
+
+# Messages to rebuild containers, which have the same fields as the proto buffer messages.
+_ImageMessage = collections.namedtuple('_ImageMessage', ['height', 'width', 'colorspace', 'encoded_image'])
+_HistogramMessage = collections.namedtuple('_HistogramMessage', ['buckets', 'max', 'min'])
+_TensorMessage = collections.namedtuple('_TensorMessage', ['dims', 'data_type', 'float_data'])
+
+
+def get_snapshot_dir():
+    """Get the directory to store snapshots."""
+    return os.path.join(settings.WORKSPACE, 'cache', 'events_snapshot')
+
+
+def get_snapshot_path(summary_dir):
+    """
+    Get the snapshot path of given summary directory.
+
+    Args:
+        summary_dir (str): Summary directory.
+
+    Returns:
+        str, the snapshot path, which is a directory.
+    """
+    key = hashlib.sha256(os.path.realpath(summary_dir).encode('utf-8')).hexdigest()
+    return os.path.join(get_snapshot_dir(), key)
+
+
+def _get_tag_file_path(snapshot_path, plugin_name, tag):
+    """Get the path of the file of given tag in snapshot, the plugin name tells how the values are stored."""
+    key = hashlib.sha256(tag.encode('utf-8')).hexdigest()
+    return os.path.join(snapshot_path, '{}.{}.npz'.format(plugin_name, key))
+
+
+def _write_file(file_path, write):
+    """Write a file readable and writable by the current user only, replacing the old file at once."""
+    tmp_file_path = file_path + '.tmp'
+    try:
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+        with os.fdopen(os.open(tmp_file_path, flags, stat.S_IRUSR | stat.S_IWUSR), 'wb') as file:
+            write(file)
+        os.replace(tmp_file_path, file_path)
+    finally:
+        if os.path.exists(tmp_file_path):
+            os.remove(tmp_file_path)
+
+
+def _open_file(file_path):
+    """
+    Open a file for reading.
+
+    Args:
+        file_path (str): File path.
+
+    Returns:
+        tuple[file, bool], the file, and whether it is trusted, i.e. it is owned by the current user and is not
+            writable by others.
+    """
+    file = open(file_path, 'rb')
+    file_stat = os.fstat(file.fileno())
+    trusted = file_stat.st_uid == os.getuid() and not file_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+    return file, trusted
+
+
+def _get_samples_digest(samples):
+    """Get the digest of the samples of a tag, which changes whenever a sample is added or dropped."""
+    keys = [(sample.filename, sample.step, sample.wall_time) for sample in samples]
+    return hashlib.sha256(json.dumps(keys).encode('utf-8')).hexdigest()
+
+
+def _concat_buffers(buffers, dtype):
+    """Concatenate buffers, and get the offsets of each buffer."""
+    offsets = np.zeros(len(buffers) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(buffer) for buffer in buffers])
+    if not buffers:
+        return np.zeros(0, dtype=dtype), offsets
+    return np.concatenate([np.asarray(buffer, dtype=dtype) for buffer in buffers]), offsets
+
+
+def _split_buffer(buffer, offsets):
+    """Split concatenated buffer by offsets."""
+    return [buffer[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
+
+
+def _encode_image_references(values, file_paths):
+    """Encode references of images as (file path id, offset, value index), file path id is -1 if there is none."""
+    file_path_ids = {file_path: file_path_id for file_path_id, file_path in enumerate(file_paths)}
+    references = []
+    for value in values:
+        reference = value.reference
+        if reference is None:
+            references.append((-1, 0, 0))
+            continue
+        if reference.file_path not in file_path_ids:
+            file_path_ids[reference.file_path] = len(file_paths)
+            file_paths.append(reference.file_path)
+        references.append((file_path_ids[reference.file_path], reference.offset, reference.value_index))
+    return np.array(references, dtype=np.int64).reshape(-1, 3)
+
+
+def _encode_values(plugin_name, values, columns, file_paths):
+    """Encode the values of samples of given plugin into columns, and add the file paths referred to."""
+    if plugin_name == PluginNameEnum.SCALAR.value:
+        columns['value'] = np.array(values, dtype=np.float64)
+    elif plugin_name == PluginNameEnum.IMAGE.value:
+        columns['shape'] = np.array([(value.height, value.width, value.colorspace) for value in values],
+                                    dtype=np.int64).reshape(-1, 3)
+        columns['reference'] = _encode_image_references(values, file_paths)
+        columns['data'], columns['offsets'] = _concat_buffers(
+            [np.frombuffer(value.encoded_image if value.reference is None else b'', dtype=np.uint8)
+             for value in values], np.uint8)
+    elif plugin_name == PluginNameEnum.HISTOGRAM.value:
+        columns['range'] = np.array([(value.max, value.min) for value in values], dtype=np.float64).reshape(-1, 2)
+        columns['data'], columns['offsets'] = _concat_buffers(
+            [value.histogram.original_buckets() for value in values], np.float64)
+    elif plugin_name == PluginNameEnum.TENSOR.value:
+        columns['data_type'] = np.array([value.data_type for value in values], dtype=np.int64)
+        columns['dims'], columns['dims_offsets'] = _concat_buffers([value.dims for value in values], np.int64)
+        # Tensor data are float32 in summary files, so they are stored as float32 without losing precision.
+        columns['data'], columns['offsets'] = _concat_buffers(
+            [value.ndarray.reshape(-1) for value in values], np.float32)
+    else:
+        columns['data'], columns['offsets'] = _concat_buffers(
+            [np.frombuffer(pickle.dumps(value), dtype=np.uint8) for value in values], np.uint8)
+
+
+def _decode_values(plugin_name, columns, file_paths):
+    """Decode the values of samples of given plugin from columns."""
+    if plugin_name == PluginNameEnum.SCALAR.value:
+        return columns['value'].tolist()
+    if plugin_name == PluginNameEnum.IMAGE.value:
+        return [ImageContainer(_ImageMessage(height, width, colorspace, data.tobytes()),
+                               ImageReference(file_paths[file_path_id], offset, value_index)
+                               if file_path_id >= 0 else None)
+                for (height, width, colorspace), (file_path_id, offset, value_index), data in zip(
+                    columns['shape'].tolist(), columns['reference'].tolist(),
+                    _split_buffer(columns['data'], columns['offsets']))]
+    if plugin_name == PluginNameEnum.HISTOGRAM.value:
+        return [HistogramContainer(_HistogramMessage([Bucket(left, width, int(count))
+                                                      for left, width, count in buckets.tolist()], max_val, min_val))
+                for (max_val, min_val), buckets in zip(columns['range'].tolist(),
+                                                       _split_buffer(columns['data'], columns['offsets']))]
+    if plugin_name == PluginNameEnum.TENSOR.value:
+        # Tensors are restored as float64, the same as loaded from summary files.
+        return [TensorContainer(_TensorMessage(dims.tolist(), data_type, data.astype(np.float64)))
+                for data_type, dims, data in zip(columns['data_type'].tolist(),
+                                                 _split_buffer(columns['dims'], columns['dims_offsets']),
+                                                 _split_buffer(columns['data'], columns['offsets']))]
+    # The pickled values are checked by the caller before they are decoded.
+    values = [pickle.loads(data.tobytes()) for data in _split_buffer(columns['data'], columns['offsets'])]
+    if plugin_name == PluginNameEnum.GRAPH.value:
+        values = [GRAPH_CACHE.intern(value) for value in values]
+    return values
+
+
+def _save_tag(file_path, plugin_name, tag, digest, samples):
+    """Save the samples of a tag, the file ids of samples are local to the tag file."""
+    filenames = []
+    filename_ids = {}
+    for sample in samples:
+        if sample.filename not in filename_ids:
+            filename_ids[sample.filename] = len(filenames)
+            filenames.append(sample.filename)
+
+    file_paths = []
+    columns = dict(file_id=np.array([filename_ids[sample.filename] for sample in samples], dtype=np.int64),
+                   step=np.array([sample.step for sample in samples], dtype=np.int64),
+                   wall_time=np.array([sample.wall_time for sample in samples], dtype=np.float64))
+    _encode_values(plugin_name, [sample.value for sample in samples], columns, file_paths)
+    checksum = None
+    if plugin_name not in _COLUMN_PLUGINS:
+        checksum = hashlib.sha256(columns['data'].tobytes()).hexdigest()
+    meta = dict(version=_SNAPSHOT_VERSION,
+                plugin_name=plugin_name,
+                tag=tag,
+                digest=digest,
+                filenames=filenames,
+                file_paths=file_paths,
+                checksum=checksum)
+    columns['meta'] = np.frombuffer(json.dumps(meta).encode('utf-8'), dtype=np.uint8)
+    _write_file(file_path, lambda file: np.savez(file, **columns))
+
+
+def _load_tag(file_path, plugin_name, tag, digest):
+    """
+    Load the samples of a tag.
+
+    Raises:
+        ValueError, if the tag file does not match the snapshot, or its pickled values are not trusted.
+    """
+    file, trusted = _open_file(file_path)
+    with file, np.load(file, allow_pickle=False) as arrays:
+        columns = {name: arrays[name] for name in arrays.files}
+    meta = json.loads(columns.pop('meta').tobytes().decode('utf-8'))
+    if meta.get('version') != _SNAPSHOT_VERSION or meta.get('digest') != digest or \
+            meta.get('plugin_name') != plugin_name or meta.get('tag') != tag:
+        raise ValueError("tag file {} does not match the snapshot".format(file_path))
+    if plugin_name not in _COLUMN_PLUGINS:
+        if not trusted:
+            raise ValueError("tag file {} is not owned by the current user or is writable by others".format(
+                file_path))
+        if hashlib.sha256(columns['data'].tobytes()).hexdigest() != meta['checksum']:
+            raise ValueError("tag file {} is broken".format(file_path))
+
+    filenames = meta['filenames']
+    values = _decode_values(plugin_name, columns, meta['file_paths'])
+    return [_Tensor(wall_time=wall_time, step=step, value=value, filename=filenames[file_id])
+            for file_id, step, wall_time, value in zip(columns['file_id'].tolist(), columns['step'].tolist(),
+                                                       columns['wall_time'].tolist(), values)]
+
+
+def _load_meta(snapshot_path):
+    """Load the meta of snapshot, None if there is no valid one."""
+    meta_path = os.path.join(snapshot_path, _META_FILENAME)
+    if not os.path.exists(meta_path):
+        return None
+    file, _ = _open_file(meta_path)
+    with file:
+        meta = json.loads(file.read().decode('utf-8'))
+    if not isinstance(meta, dict) or meta.get('version') != _SNAPSHOT_VERSION:
+        return None
+    return meta
+
+
+def remove_old_snapshots():
+    """
+    Remove the snapshots of summary directories which no longer exist, the snapshots of older versions, and the
+    least recently used ones beyond `MAX_SNAPSHOT_COUNT`.
+    """
+    snapshot_dir = get_snapshot_dir()
+    try:
+        filenames = os.listdir(snapshot_dir)
+    except OSError as ex:
+        logger.debug("List events snapshots failed, detail: %s.", str(ex))
+        return
+
+    access_times = {}
+    removed_paths = []
+    for filename in filenames:
+        path = os.path.join(snapshot_dir, filename)
+        if not os.path.isdir(path):
+            # Snapshots of older versions are single files.
+            removed_paths.append(path)
+            continue
+        try:
+            meta = _load_meta(path)
+            if meta is None or not os.path.exists(meta['summary_dir']):
+                removed_paths.append(path)
+                continue
+            access_times[path] = os.path.getmtime(os.path.join(path, _META_FILENAME))
+        except (OSError, ValueError, KeyError, TypeError) as ex:
+            # The snapshot may be saved by other loaders at the same time.
+            logger.debug("Check events snapshot failed, detail: %s, path: %s.", str(ex), path)
+    removed_paths.extend(sorted(access_times, key=access_times.get)[:-MAX_SNAPSHOT_COUNT])
+
+    for path in removed_paths:
+        try:
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+        except OSError as ex:
+            logger.debug("Remove events snapshot failed, detail: %s, path: %s.", str(ex), path)
+    if removed_paths:
+        logger.info("Remove %d old events snapshots.", len(removed_paths))
+
+
+def save_snapshot(summary_dir, loader_state, events_state):
+    """
+    Save snapshot of given summary directory to workspace.
+
+    Only the tags whose samples have changed since the latest snapshot are saved again.
+
+    Args:
+        summary_dir (str): Summary directory.
+        loader_state (dict): The state of loader, which can be dumped to JSON.
+        events_state (dict): The state of events data, see `EventsData.get_state`.
+
+    Returns:
+        bool, True if the snapshot is saved.
+    """
+    plugin_name_by_tag = {tag: plugin_name
+                          for plugin_name, tags in events_state['tags_by_plugin'].items() for tag in tags}
+    tags = list(events_state['reservoirs'])
+    reservoirs = {}
+    samples_by_tag = {}
+    for tag in tags:
+        reservoir_state = dict(events_state['reservoirs'][tag])
+        samples_by_tag[tag] = reservoir_state.pop('samples')
+        reservoirs[tag] = reservoir_state
+    digests = {tag: _get_samples_digest(samples) for tag, samples in samples_by_tag.items()}
+
+    snapshot_path = get_snapshot_path(summary_dir)
+    meta = dict(version=_SNAPSHOT_VERSION,
+                summary_dir=os.path.realpath(summary_dir),
+                loader=loader_state,
+                tags=events_state['tags'],
+                deleted_tags=events_state['deleted_tags'],
+                tags_by_plugin=events_state['tags_by_plugin'],
+                reservoir_tags=tags,
+                reservoirs=reservoirs,
+                digests=digests)
+    saved_count = 0
+    try:
+        os.makedirs(snapshot_path, mode=stat.S_IRWXU, exist_ok=True)
+        try:
+            old_meta = _load_meta(snapshot_path)
+        except (OSError, ValueError) as ex:
+            logger.debug("Load meta of events snapshot failed, detail: %s, summary dir: %s.", str(ex), summary_dir)
+            old_meta = None
+        is_new_snapshot = old_meta is None
+        old_digests = {} if is_new_snapshot or old_meta.get('summary_dir') != meta['summary_dir'] \
+            else old_meta.get('digests', {})
+        file_paths = set()
+        for tag, samples in samples_by_tag.items():
+            file_path = _get_tag_file_path(snapshot_path, plugin_name_by_tag[tag], tag)
+            file_paths.add(file_path)
+            if old_digests.get(tag) == digests[tag] and os.path.exists(file_path):
+                continue
+            _save_tag(file_path, plugin_name_by_tag[tag], tag, digests[tag], samples)
+            saved_count += 1
+        _write_file(os.path.join(snapshot_path, _META_FILENAME),
+                    lambda file: file.write(json.dumps(meta).encode('utf-8')))
+        for filename in os.listdir(snapshot_path):
+            file_path = os.path.join(snapshot_path, filename)
+            if filename.endswith('.npz') and file_path not in file_paths:
+                os.remove(file_path)
+    except OSError as ex:
+        logger.warning("Save events snapshot failed, detail: %s, summary dir: %s.", str(ex), summary_dir)
+        return False
+    logger.info("Save events snapshot, %d of %d tags saved, summary dir: %s.", saved_count, len(tags), summary_dir)
+    if is_new_snapshot:
+        remove_old_snapshots()
+    return True
+
+
+def load_snapshot(summary_dir):
+    """
+    Load snapshot of given summary directory from workspace.
+
+    Args:
+        summary_dir (str): Summary directory.
+
+    Returns:
+        Union[tuple[dict, dict], None], the state of loader and the state of events data, None if there is no
+            valid snapshot.
+    """
+    snapshot_path = get_snapshot_path(summary_dir)
+    meta_path = os.path.join(snapshot_path, _META_FILENAME)
+    samples_by_tag = {}
+    try:
+        meta = _load_meta(snapshot_path)
+        if meta is None or meta.get('summary_dir') != os.path.realpath(summary_dir):
+            return None
+        plugin_name_by_tag = {tag: plugin_name
+                              for plugin_name, tags in meta['tags_by_plugin'].items() for tag in tags}
+        for tag, digest in meta['digests'].items():
+            plugin_name = plugin_name_by_tag[tag]
+            samples_by_tag[tag] = _load_tag(_get_tag_file_path(snapshot_path, plugin_name, tag), plugin_name, tag,
+                                            digest)
+        # The modification time is updated to keep the recently used snapshots.
+        os.utime(meta_path)
+    except (OSError, ValueError, KeyError, IndexError, pickle.UnpicklingError) as ex:
+        logger.warning("Load events snapshot failed, detail: %s, summary dir: %s.", str(ex), summary_dir)
+        # The meta is removed, so all the tags are saved again instead of keeping the invalid files.
+        try:
+            if os.path.exists(meta_path):
+                os.remove(meta_path)
+        except OSError as remove_ex:
+            logger.warning("Remove events snapshot failed, detail: %s, summary dir: %s.", str(remove_ex),
+                           summary_dir)
+        return None
+
+    tags = meta['reservoir_tags']
+    reservoirs = meta['reservoirs']
+    for tag in tags:
+        reservoirs[tag]['samples'] = samples_by_tag.get(tag, [])
+    events_state = dict(tags=meta['tags'],
+                        deleted_tags=meta['deleted_tags'],
+                        tags_by_plugin=meta['tags_by_plugin'],
+                        reservoirs=reservoirs)
+    return meta['loader'], events_state
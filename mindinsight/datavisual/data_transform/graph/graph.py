@@ -26,6 +26,7 @@ from mindinsight.utils.exceptions import ParamMissError
 from mindinsight.utils.exceptions import ParamValueError
 from .node import NodeTypeEnum
 from .node import Node
+from .node_name_index import NodeNameIndex
 
 
 def check_invalid_character(string):
@@ -48,9 +49,16 @@ class Graph:
     # Limit the size of a single attribute value per node to avoid storing too much data
     MAX_NODE_ATTRIBUTE_VALUE_BYTES = 1024
 
+    # Approximate bytes of a node with its attributes and edges, about 2.1KB, measured by tracemalloc to be 1.95KB on
+    # the LeNet graph and 1.93KB to 1.96KB on graphs of 70k to 175k nodes.
+    APPROXIMATE_NODE_BYTES = 2100
+
     # In the same scope, the number of children of the same type exceeds this threshold, and we will combine them.
     MIN_GROUP_NODE_COUNT = 5
 
+    # Max count of the node dicts cached for listing nodes by scope.
+    MAX_CACHED_NODE_DICT_COUNT = 20000
+
     def __init__(self):
         # Used to cache all nodes, and the key is node name, value is `Node` object.
         self._normal_node_map = {}
@@ -64,6 +72,17 @@ class Graph:
         self._leaf_nodes = {}
         self._full_name_map_name = {}
 
+        # Index of the nodes by their scope, the key is scope, value is a dict of node name and `Node` object of the
+        # children in the order of `_normal_node_map`. It is built after the graph is built.
+        self._children_by_scope = None
+        # The dicts of the children listed by scope, cleared whenever any node is changed.
+        self._children_dicts_by_scope = {}
+        # Index for searching nodes by name, built on the first search and dropped whenever any node is changed.
+        self._node_name_index = None
+        # Digest of the serialized proto the graph is built from, to share the graph among train jobs, see
+        # `GraphCache`. None if the graph is not shared.
+        self.digest = None
+
     def build_graph(self, proto_data):
         """This method is used to build the graph."""
         logger.info("Start to build graph")
@@ -82,6 +101,7 @@ class Graph:
         self._calc_subnode_count()
         self._leaf_nodes = self._get_leaf_nodes()
         self._full_name_map_name = self._get_leaf_node_full_name_map()
+        self._children_by_scope = self._get_children_by_scope()
 
         precision = 6
         time_consuming = round(time.time() - start_time, precision)
@@ -141,11 +161,33 @@ class Graph:
             list[dict], a list object contain `Node` object.
         """
         scope = "" if scope is None else scope
-        nodes = []
-        for node in self._normal_node_map.values():
-            if node.scope == scope:
-                nodes.append(node.to_dict())
-        return nodes
+        nodes = self._children_dicts_by_scope.get(scope)
+        if nodes is None:
+            if self._children_by_scope is None:
+                self._children_by_scope = self._get_children_by_scope()
+            children = self._children_by_scope.get(scope, {})
+            nodes = [node.to_dict() for node in children.values()]
+            if sum(map(len, self._children_dicts_by_scope.values())) + len(nodes) > self.MAX_CACHED_NODE_DICT_COUNT:
+                self._children_dicts_by_scope.clear()
+            self._children_dicts_by_scope[scope] = nodes
+
+        # Callers may add items to the dicts, e.g. the watch status of debugger.
+        return [dict(node) for node in nodes]
+
+    def _get_children_by_scope(self):
+        """Get the index of all the nodes by their scope."""
+        children_by_scope = defaultdict(dict)
+        for node_name, node in self._normal_node_map.items():
+            children_by_scope[node.scope][node_name] = node
+        return dict(children_by_scope)
+
+    def _get_node_name_index(self):
+        """Get the index for searching nodes by name."""
+        node_name_index = self._node_name_index
+        if node_name_index is None:
+            node_name_index = NodeNameIndex(self._normal_node_map.values(), self._leaf_nodes)
+            self._node_name_index = node_name_index
+        return node_name_index
 
     def search_single_node(self, node_name):
         """
@@ -438,6 +480,11 @@ class Graph:
 
         raise ParamMissError('Method requires an argument that is not None.')
 
+    @property
+    def nbytes(self):
+        """Get the approximate number of bytes of the graph."""
+        return self.normal_node_count * self.APPROXIMATE_NODE_BYTES
+
     @property
     def normal_node_count(self):
         """Get the normal node count."""
@@ -455,6 +502,11 @@ class Graph:
         self._normal_node_map.update({node.name: node})
         self._node_id_map_name.update({node.node_id: node.name})
 
+        if self._children_by_scope is not None:
+            self._children_by_scope.setdefault(node.scope, {})[node.name] = node
+        self._children_dicts_by_scope.clear()
+        self._node_name_index = None
+
     def _delete_nodes_of_cache(self, node_names):
         """Delete node from cache."""
         logger.debug("These nodes will be removed from the cache, node names: %s.", str(node_names))
@@ -468,6 +520,26 @@ class Graph:
             node = self._get_normal_node(node_name=name)
             self._normal_node_map.pop(name)
             self._node_id_map_name.pop(node.node_id)
+            self._delete_node_of_scope_index(name, node)
+
+        self._children_dicts_by_scope.clear()
+        self._node_name_index = None
+
+    def _delete_node_of_scope_index(self, name, node):
+        """Delete node from the index of nodes by scope."""
+        if self._children_by_scope is None:
+            return
+        scope = node.scope
+        if self._children_by_scope.get(scope, {}).get(name) is not node:
+            # The scope of the node has been changed before it is deleted, e.g. when it is being renamed.
+            scope = next((scope for scope, children in self._children_by_scope.items()
+                          if children.get(name) is node), None)
+            if scope is None:
+                return
+        children = self._children_by_scope[scope]
+        children.pop(name)
+        if not children:
+            self._children_by_scope.pop(scope)
 
     def _update_node_name_of_cache(self, node, new_name, update_parent=False):
         """
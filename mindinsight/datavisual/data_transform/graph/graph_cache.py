@@ -0,0 +1,273 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""
+This file is used to share the graphs built from the same proto.
+
+Train jobs of a hyper-parameter sweep usually record the same graph. A built graph is keyed by the digest of the
+serialized proto it is built from, and the graphs of the same digest are interned as one graph, which is shared
+read-only by all the events data. Built graphs are also pickled to the workspace, so they are loaded instead of
+being built again after restarting.
+"""
+import collections
+import gc
+import hashlib
+import os
+import pickle
+import threading
+import weakref
+
+from mindinsight.conf import settings
+from mindinsight.datavisual.common.log import logger
+
+# Max count of the graph files kept in the workspace, the least recently used ones are removed.
+MAX_GRAPH_FILE_COUNT = 100
+# Version of the graph files, increase it whenever the built graphs change to drop the files of older versions.
+_GRAPH_FILE_VERSION = 2
+
+# Reference to a graph interned in the parent process, returned by worker processes instead of building the graph.
+GraphReference = collections.namedtuple('GraphReference', ['digest'])
+# Graph pickled in a graph file, returned by worker processes as it is read, so it is unpickled only once.
+PickledGraph = collections.namedtuple('PickledGraph', ['digest', 'data'])
+
+
+def get_graph_digest(proto_bytes):
+    """
+    Get the digest of a serialized graph proto.
+
+    Args:
+        proto_bytes (Union[bytes, memoryview]): The serialized `GraphProto` or `ModelProto`.
+
+    Returns:
+        str, the digest.
+    """
+    return hashlib.sha256(proto_bytes).hexdigest()
+
+
+class GraphCache:
+    """
+    Interned graphs keyed by their digest.
+
+    The graphs are referred to weakly, so a graph is counted by the references from all the events data holding it,
+    and is dropped as soon as the last of them releases it, without any loader releasing it explicitly.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._graphs = weakref.WeakValueDictionary()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._graphs)
+
+    def get_graphs(self):
+        """
+        Get the interned graphs.
+
+        The graphs returned are referred to strongly, so they are kept as long as the dict is kept, e.g. until the
+        graph references returned by worker processes are resolved.
+
+        Returns:
+            dict[str, Graph], the graphs keyed by their digest.
+        """
+        with self._lock:
+            return dict(self._graphs.items())
+
+    def intern(self, graph):
+        """
+        Intern the graph.
+
+        Args:
+            graph (Graph): The graph, which is interned only if it has a digest.
+
+        Returns:
+            Graph, the interned graph of the same digest if there is one, else the given graph.
+        """
+        if graph.digest is None:
+            return graph
+        with self._lock:
+            interned_graph = self._graphs.get(graph.digest)
+            if interned_graph is None:
+                self._graphs[graph.digest] = graph
+                return graph
+        return interned_graph
+
+    def resolve(self, value, graphs):
+        """
+        Resolve the value parsed by worker processes as an interned graph.
+
+        Args:
+            value (Union[Graph, GraphReference, PickledGraph]): The graph built, a reference to the graph interned,
+                or the graph read from graph file.
+            graphs (dict[str, Graph]): The graphs got by `get_graphs` when the work was submitted.
+
+        Returns:
+            Union[Graph, None], the interned graph, None if the graph read from graph file is invalid.
+        """
+        if isinstance(value, GraphReference):
+            return self.intern(graphs[value.digest])
+        if isinstance(value, PickledGraph):
+            with self._lock:
+                interned_graph = self._graphs.get(value.digest)
+            if interned_graph is not None:
+                return interned_graph
+            value = load_pickled_graph(value)
+            if value is None:
+                return None
+        return self.intern(value)
+
+
+GRAPH_CACHE = GraphCache()
+
+
+def get_graph_file_dir():
+    """Get the directory to store graph files."""
+    return os.path.join(settings.WORKSPACE, 'cache', 'graph')
+
+
+def load_pickled_graph(pickled_graph):
+    """
+    Unpickle the graph read from graph file.
+
+    Args:
+        pickled_graph (PickledGraph): The graph read from graph file.
+
+    Returns:
+        Union[Graph, None], the graph, None if it is invalid.
+    """
+    # Collecting garbage while loading millions of objects costs several times the loading itself.
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        graph = pickle.loads(pickled_graph.data)
+    except (EOFError, ValueError, TypeError, AttributeError, ImportError, pickle.UnpicklingError) as ex:
+        logger.warning("Unpickle graph failed, detail: %s, digest: %s.", str(ex), pickled_graph.digest)
+        return None
+    finally:
+        if gc_enabled:
+            gc.enable()
+    if getattr(graph, 'digest', None) != pickled_graph.digest:
+        logger.warning("Unpickle graph failed, the digest does not match: %s.", pickled_graph.digest)
+        return None
+    return graph
+
+
+class GraphFileCache:
+    """
+    Built graphs pickled in files keyed by their digest.
+
+    A graph file has a header of the file version and the checksum of the pickled graph, which are checked before
+    the pickled graph is returned. It is sent to worker processes with the parse tasks, as settings changed in the
+    parent process are not seen by the workers.
+
+    Args:
+        file_dir (str): The directory of the graph files.
+    """
+
+    def __init__(self, file_dir):
+        self._file_dir = file_dir
+
+    def _get_file_path(self, digest):
+        """Get the path of the graph file of given digest."""
+        return os.path.join(self._file_dir, digest + '.pkl')
+
+    def read(self, digest):
+        """
+        Read the pickled graph of given digest, which is unpickled by `load_pickled_graph`.
+
+        Args:
+            digest (str): The digest of the graph.
+
+        Returns:
+            Union[PickledGraph, None], the pickled graph, None if there is no valid graph file.
+        """
+        file_path = self._get_file_path(digest)
+        if not os.path.exists(file_path):
+            return None
+        try:
+            with open(file_path, 'rb') as graph_file:
+                version, checksum = pickle.load(graph_file)
+                if version != _GRAPH_FILE_VERSION:
+                    return None
+                data = graph_file.read()
+            if hashlib.sha256(data).hexdigest() != checksum:
+                logger.warning("Graph file is broken, file path: %s.", file_path)
+                return None
+            # The modification time is updated to keep the recently used files.
+            os.utime(file_path)
+        except (OSError, EOFError, ValueError, TypeError, pickle.UnpicklingError) as ex:
+            logger.warning("Read graph file failed, detail: %s, file path: %s.", str(ex), file_path)
+            return None
+        return PickledGraph(digest, data)
+
+    def load(self, digest):
+        """
+        Load the graph of given digest.
+
+        Args:
+            digest (str): The digest of the graph.
+
+        Returns:
+            Union[Graph, None], the graph, None if there is no valid graph file.
+        """
+        pickled_graph = self.read(digest)
+        if pickled_graph is None:
+            return None
+        return load_pickled_graph(pickled_graph)
+
+    def save(self, graph):
+        """
+        Save the graph, and remove the least recently used files if there are too many.
+
+        Args:
+            graph (Graph): The graph, which has a digest.
+
+        Returns:
+            bool, True if the graph is saved.
+        """
+        file_path = self._get_file_path(graph.digest)
+        tmp_file_path = '{}.{}.tmp'.format(file_path, os.getpid())
+        try:
+            data = pickle.dumps(graph, protocol=pickle.HIGHEST_PROTOCOL)
+            os.makedirs(self._file_dir, exist_ok=True)
+            with open(tmp_file_path, 'wb') as graph_file:
+                pickle.dump((_GRAPH_FILE_VERSION, hashlib.sha256(data).hexdigest()), graph_file)
+                graph_file.write(data)
+            os.replace(tmp_file_path, file_path)
+        except (OSError, TypeError, AttributeError, RecursionError, pickle.PicklingError) as ex:
+            logger.warning("Save graph file failed, detail: %s, file path: %s.", str(ex), file_path)
+            return False
+        finally:
+            if os.path.exists(tmp_file_path):
+                try:
+                    os.remove(tmp_file_path)
+                except OSError as ex:
+                    logger.warning("Remove temp graph file failed, detail: %s, file path: %s.", str(ex),
+                                   tmp_file_path)
+        self._remove_old_files()
+        return True
+
+    def _remove_old_files(self):
+        """Remove the least recently used graph files beyond `MAX_GRAPH_FILE_COUNT`."""
+        try:
+            file_paths = [os.path.join(self._file_dir, filename)
+                          for filename in os.listdir(self._file_dir) if filename.endswith('.pkl')]
+            if len(file_paths) <= MAX_GRAPH_FILE_COUNT:
+                return
+            file_paths.sort(key=os.path.getmtime)
+            for file_path in file_paths[:-MAX_GRAPH_FILE_COUNT]:
+                os.remove(file_path)
+        except OSError as ex:
+            # The files may be removed by other worker processes at the same time.
+            logger.debug("Remove old graph files failed, detail: %s.", str(ex))
@@ -13,6 +13,9 @@
 # limitations under the License.
 # ============================================================================
 """This file is used to define the MindSpore graph."""
+import itertools
+import sys
+
 from mindinsight.datavisual.common.log import logger
 from mindinsight.datavisual.proto_files.mindinsight_anf_ir_pb2 import DataType
 from mindinsight.datavisual.common.enums import PluginNameEnum
@@ -71,16 +74,17 @@ class MSGraph(Graph):
 
             node = Node(name=node_name, node_id=node_proto.name)
             node.full_name = node_proto.full_name
-            node.type = node_proto.op_type
+            # Strings repeated by many nodes are interned to be shared.
+            node.type = sys.intern(node_proto.op_type)
 
             self._parse_attributes(node_proto.attribute, node)
             self._parse_inputs(node_proto.input, node)
 
             node.output_i = node_proto.output_i
-            node.scope = node_proto.scope
+            node.scope = sys.intern(node_proto.scope)
             node.output_shape = self._get_shape_by_parse_type_proto(node_proto.output_type)
             node.output_nums = len(node.output_shape)
-            node.output_data_type = self._get_data_type_by_parse_type_proto(node_proto.output_type, node)
+            node.output_data_type = sys.intern(self._get_data_type_by_parse_type_proto(node_proto.output_type, node))
 
             self._cache_node(node)
 
@@ -101,10 +105,10 @@ class MSGraph(Graph):
             node.type = NodeTypeEnum.PARAMETER.value
             node.output_shape = self._get_shape_by_parse_type_proto(parameter.type)
             node.output_nums = len(node.output_shape)
-            node.output_data_type = self._get_data_type_by_parse_type_proto(parameter.type, node)
+            node.output_data_type = sys.intern(self._get_data_type_by_parse_type_proto(parameter.type, node))
             attr = dict(
-                type=self._get_data_type_by_parse_type_proto(parameter.type, node),
-                shape=str(self._get_shape_by_parse_type_proto(parameter.type))
+                type=sys.intern(self._get_data_type_by_parse_type_proto(parameter.type, node)),
+                shape=sys.intern(str(self._get_shape_by_parse_type_proto(parameter.type)))
             )
             node.add_attr(attr)
 
@@ -193,7 +197,7 @@ class MSGraph(Graph):
             tensor_type_proto = type_proto.tensor_type
             value = type_proto.tensor_type.elem_type
             elem_type_name = self._get_data_type_name_by_value(tensor_type_proto, value, field_name='elem_type')
-            node.elem_types.append(elem_type_name)
+            node.elem_types.append(sys.intern(elem_type_name))
             return f'{data_type_name}[{elem_type_name}]'
 
         if type_proto.data_type == DataType.DT_TUPLE:
@@ -202,7 +206,7 @@ class MSGraph(Graph):
                 data_types.append(self._get_data_type_by_parse_type_proto(elem_type, node))
             return f'{data_type_name}{str(data_types)}'
 
-        node.elem_types.append(data_type_name)
+        node.elem_types.append(sys.intern(data_type_name))
 
         return data_type_name
 
@@ -261,16 +265,12 @@ class MSGraph(Graph):
             list[Node], a list of nodes.
         """
         if pattern is not None:
-            pattern = pattern.lower()
-            searched_nodes = [
-                node for name, node in self._leaf_nodes.items()
-                if pattern in name.lower()
-            ]
+            searched_nodes = list(self._get_node_name_index().search(pattern, leaf_only=True))
         else:
             searched_nodes = [node for node in self._leaf_nodes.values()]
         return searched_nodes
 
-    def search_nodes_by_pattern(self, pattern):
+    def search_nodes_by_pattern(self, pattern, offset=0, limit=None):
         """
         Search node by a given pattern.
 
@@ -279,19 +279,17 @@ class MSGraph(Graph):
 
         Args:
             pattern (Union[str, None]): The pattern of the node to search.
+            offset (int): The number of nodes searched to skip. Default: 0.
+            limit (Union[int, None]): The max number of nodes to return, if None, return all. Default: None.
 
         Returns:
             list[Node], a list of nodes.
         """
-        searched_nodes = []
-        if pattern and pattern != '/':
-            pattern = pattern.lower()
-            for name, node in self._normal_node_map.items():
-                name = name.lower()
-                pattern_index = name.rfind(pattern)
-                if pattern_index >= 0 and name.find('/', pattern_index + len(pattern)) == -1:
-                    searched_nodes.append(node)
-        return searched_nodes
+        if not pattern or pattern == '/':
+            return []
+        searched_nodes = self._get_node_name_index().search(pattern, in_last_segment=True)
+        stop = None if limit is None else offset + limit
+        return list(itertools.islice(searched_nodes, offset, stop))
 
     def _build_node_tree(self, root, node_name, node_type):
         """
@@ -371,7 +369,7 @@ class MSGraph(Graph):
                           f"is over {self.MAX_NODE_ATTRIBUTE_VALUE_BYTES} Bytes, will ignore."
                 logger.warning(message)
                 continue
-            node.add_attr({attr.name: str(attr.value)})
+            node.add_attr({sys.intern(attr.name): sys.intern(str(attr.value))})
 
     def _update_input_after_create_node(self):
         """Update the input of node after create node."""
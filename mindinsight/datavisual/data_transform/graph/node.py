@@ -16,6 +16,10 @@
 This file is used to define the node of graph and associated base types.
 """
 from enum import Enum
+from types import MappingProxyType
+
+# Proxy inputs and outputs of most nodes are empty, so they share this read-only mapping until any is added.
+_EMPTY_PROXIES = MappingProxyType({})
 
 
 class NodeTypeEnum(Enum):
@@ -30,10 +34,15 @@ class Node:
     """
     Define a node object.
 
+    Nodes are slotted, as a graph may have hundreds of thousands of them.
+
     Args:
         name (str): Name of new node.
         node_id (str): The id of this node, and node id is unique in graph.
     """
+    __slots__ = ('_node_id', 'name', 'type', '_attr', '_input', 'output_i', '_output', '_proxy_input',
+                 '_proxy_output', 'subnode_count', 'scope', 'independent_layout', 'output_shape', 'output_data_type',
+                 'output_nums', 'elem_types', 'full_name')
 
     def __init__(self, name, node_id):
         self._node_id = node_id
@@ -43,8 +52,8 @@ class Node:
         self._input = dict()
         self.output_i = 0
         self._output = {}
-        self._proxy_input = {}
-        self._proxy_output = {}
+        self._proxy_input = None
+        self._proxy_output = None
         self.subnode_count = 0
         self.scope = ""
         self.independent_layout = False
@@ -63,8 +72,8 @@ class Node:
             'input': self._input,
             'output': self._output,
             'output_i': self.output_i,
-            'proxy_input': self._proxy_input,
-            'proxy_output': self._proxy_output,
+            'proxy_input': self._proxy_input if self._proxy_input is not None else {},
+            'proxy_output': self._proxy_output if self._proxy_output is not None else {},
             'subnode_count': self.subnode_count,
             'independent_layout': self.independent_layout
         }
@@ -162,8 +171,8 @@ class Node:
 
     @property
     def proxy_inputs(self):
-        """Return proxy input, type is dict."""
-        return self._proxy_input
+        """Return proxy input, type is dict, or a read-only empty mapping if there is no proxy input."""
+        return self._proxy_input if self._proxy_input is not None else _EMPTY_PROXIES
 
     def add_proxy_inputs(self, src_name, attr):
         """
@@ -175,16 +184,20 @@ class Node:
 
             - edge_type (str): The edge type, refer to `EdgeTypeEnum`.
         """
+        if self._proxy_input is None:
+            self._proxy_input = {}
         self._proxy_input.update({src_name: attr})
 
     def delete_proxy_inputs(self, src_name):
         """Delete a proxy input by the src name."""
+        if self._proxy_input is None:
+            raise KeyError(src_name)
         self._proxy_input.pop(src_name)
 
     @property
     def proxy_outputs(self):
-        """Get proxy output, data type is dict."""
-        return self._proxy_output
+        """Get proxy output, data type is dict, or a read-only empty mapping if there is no proxy output."""
+        return self._proxy_output if self._proxy_output is not None else _EMPTY_PROXIES
 
     def add_proxy_outputs(self, dst_name, attr):
         """
@@ -196,10 +209,14 @@ class Node:
 
             - edge_type (str): The edge type, refer to `EdgeTypeEnum`.
         """
+        if self._proxy_output is None:
+            self._proxy_output = {}
         self._proxy_output.update({dst_name: attr})
 
     def delete_proxy_outputs(self, dst_name):
         """Delete a proxy output by dst name."""
+        if self._proxy_output is None:
+            raise KeyError(dst_name)
         self._proxy_output.pop(dst_name)
 
     @staticmethod
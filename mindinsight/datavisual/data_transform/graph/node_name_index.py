@@ -0,0 +1,79 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""
+This file is used to define the index for searching nodes by name.
+"""
+import bisect
+
+
+class NodeNameIndex:
+    """
+    Case-insensitive index of node names for searching nodes by substring.
+
+    The names are lowercased once when the index is built instead of on every search. They are also joined into one
+    string, in which a pattern is found by `str.find` at the speed of C, and each match is mapped to its node by the
+    offsets of the names. Nodes are searched lazily, so a page of results stops the search once it is filled.
+
+    Args:
+        nodes (list[Node]): The nodes, in the order of search results.
+        leaf_node_names (Collection[str]): Names of the leaf nodes.
+    """
+    # Node names can not contain it, so a match never spans two names.
+    _SEPARATOR = '\0'
+
+    def __init__(self, nodes, leaf_node_names):
+        self._nodes = list(nodes)
+        self._names = [node.name.lower() for node in self._nodes]
+        self._is_leaf = [node.name in leaf_node_names for node in self._nodes]
+        self._starts = []
+        start = 0
+        for name in self._names:
+            self._starts.append(start)
+            start += len(name) + len(self._SEPARATOR)
+        self._corpus = self._SEPARATOR.join(self._names)
+
+    def search(self, pattern, in_last_segment=False, leaf_only=False):
+        """
+        Search nodes whose name contains the pattern, case-insensitively.
+
+        Args:
+            pattern (str): The pattern.
+            in_last_segment (bool): If True, only the nodes whose last match of the pattern ends in the last segment
+                of the name are searched. Example: pattern=ops, the node default/ops is searched, and the node
+                default/ops/weight is not. Default: False.
+            leaf_only (bool): If True, only leaf nodes are searched. Default: False.
+
+        Yields:
+            Node, the nodes searched, in order.
+        """
+        pattern = pattern.lower()
+        if not self._nodes or self._SEPARATOR in pattern:
+            return
+        names = self._names
+        position = self._corpus.find(pattern)
+        while position >= 0:
+            index = bisect.bisect_right(self._starts, position) - 1
+            # Names matched are often next to each other, e.g. in the same scope, and checking them one by one costs
+            # less than finding and mapping each match.
+            while index < len(names) and pattern in names[index]:
+                name = names[index]
+                if leaf_only and not self._is_leaf[index]:
+                    pass
+                elif not in_last_segment or name.find('/', name.rfind(pattern) + len(pattern)) == -1:
+                    yield self._nodes[index]
+                index += 1
+            if index == len(names):
+                return
+            position = self._corpus.find(pattern, self._starts[index])
@@ -15,6 +15,8 @@
 """Histogram data."""
 import math
 
+import numpy as np
+
 from mindinsight.utils.exceptions import ParamValueError
 from mindinsight.datavisual.utils.utils import calc_histogram_bins
 
@@ -75,7 +77,7 @@ class Histogram:
     Histogram data class.
 
     Args:
-        buckets (tuple[Bucket]): The buckets of histogram data.
+        buckets (numpy.ndarray): The buckets of histogram data, an array of (left, width, count) sorted by left.
         max_val (number): The max value of histogram data.
         min_val (number): The min value of histogram data.
         count (int): The count of histogram data.
@@ -88,17 +90,31 @@ class Histogram:
         self._visual_max = max_val
         self._visual_min = min_val
         self._count = count
-        self._original_buckets = buckets
+        self._original_buckets = np.asarray(buckets, dtype=np.float64).reshape(-1, 3)
         # default bin number
         self._visual_bins = calc_histogram_bins(count)
-        # Note that tuple is immutable, so sharing tuple is often safe.
-        self._re_sampled_buckets = ()
+        # Note that tuple is immutable, so sharing tuple is often safe. None if buckets should be re-sampled.
+        self._re_sampled_buckets = None
+
+    @property
+    def count(self):
+        """Gets count of histogram data."""
+        return self._count
 
     @property
     def original_buckets_count(self):
         """Gets original buckets quantity."""
         return len(self._original_buckets)
 
+    def original_buckets(self):
+        """
+        Gets original buckets.
+
+        Returns:
+            numpy.ndarray, the array of (left, width, count) of the original buckets.
+        """
+        return self._original_buckets
+
     def set_visual_range(self, max_val: float, min_val: float, bins: int) -> None:
         """
         Sets visual range for later re-sampling.
@@ -124,99 +140,130 @@ class Histogram:
         if bins < 1:
             raise ParamValueError("Invalid input bins({}). Must be greater than 0.".format(bins))
 
+        if (max_val, min_val, bins) == (self._visual_max, self._visual_min, self._visual_bins):
+            # Re-sampled buckets are still valid.
+            return
+
         self._visual_max = max_val
         self._visual_min = min_val
         self._visual_bins = bins
 
-        # mark _re_sampled_buckets to empty
-        self._re_sampled_buckets = ()
-
-    def _calc_intersection_len(self, max1, min1, max2, min2):
-        """Calculates intersection length of [min1, max1] and [min2, max2]."""
-        if max1 < min1:
-            raise ParamValueError(
-                "Invalid input. max1({}) is less than min1({}).".format(max1, min1))
+        # mark _re_sampled_buckets to be re-sampled
+        self._re_sampled_buckets = None
 
-        if max2 < min2:
-            raise ParamValueError(
-                "Invalid input. max2({}) is less than min2({}).".format(max2, min2))
-
-        if min1 <= min2:
-            if max1 <= min2:
-                # return value must be calculated by max1.__sub__
-                return max1 - max1
-            if max1 <= max2:
-                return max1 - min2
-            # max1 > max2
-            return max2 - min2
-
-        # min1 > min2
-        if max2 <= min1:
-            return max2 - max2
-        if max2 <= max1:
-            return max2 - min1
-        return max1 - min1
-
-    def _re_sample_buckets(self):
-        """Re-samples buckets according to visual_max, visual_min and visual_bins."""
-        if self._visual_max == self._visual_min:
-            # Adjust visual range if max equals min.
-            self._visual_max += 0.5
-            self._visual_min -= 0.5
+    def _calc_visited_ranges(self, bin_lefts, bin_rights):
+        """
+        Calculates the range of original buckets sampled by each visual bucket.
 
-        width = (self._visual_max - self._visual_min) / self._visual_bins
+        Original buckets are walked along with visual buckets, and a visual bucket samples the original buckets from
+        the first one not on its left, to the first one reaching its right. Buckets out of the range are not sampled
+        even if they intersect the visual bucket by a rounding error, and a bucket of zero width is sampled as a whole
+        whenever it is in the range.
 
-        if not self._count:
-            self._re_sampled_buckets = tuple(
-                Bucket(self._visual_min + width * i, width, 0)
-                for i in range(self._visual_bins))
-            return
+        Args:
+            bin_lefts (numpy.ndarray): Left edges of visual buckets.
+            bin_rights (numpy.ndarray): Right edges of visual buckets.
 
-        re_sampled = []
+        Returns:
+            tuple[numpy.ndarray, numpy.ndarray], the start and the end of the range of each visual bucket.
+        """
+        lefts = self._original_buckets[:, 0]
+        rights = lefts + self._original_buckets[:, 1]
+        buckets_count = len(lefts)
+        if buckets_count > 1 and (rights[1:] < rights[:-1]).any():
+            # Overlapped buckets can only be walked one by one.
+            return self._walk_visited_ranges(lefts.tolist(), rights.tolist(), bin_lefts.tolist(), bin_rights.tolist())
+
+        # The walk never goes back. It stops at the first bucket reaching the right of the visual bucket, and starts
+        # from the first bucket not on the left of the visual bucket.
+        stop_positions = np.searchsorted(rights, bin_rights, side='left')
+        prev_positions = np.empty_like(stop_positions)
+        prev_positions[0] = 0
+        prev_positions[1:] = stop_positions[:-1]
+        starts = np.maximum(prev_positions, np.searchsorted(rights, bin_lefts, side='right'))
+        ends = np.minimum(stop_positions + 1, buckets_count)
+        # Visual buckets on the left of the bucket where the walk stays are skipped.
+        prev_positions[prev_positions >= buckets_count] = buckets_count - 1
+        ends[(bin_rights <= lefts[prev_positions]) | (starts >= buckets_count)] = 0
+        return starts, ends
+
+    @staticmethod
+    def _walk_visited_ranges(lefts, rights, bin_lefts, bin_rights):
+        """Calculates the range of original buckets sampled by each visual bucket by walking through buckets."""
+        buckets_count = len(lefts)
+        starts, ends = [], []
         original_pos = 0
-        original_bucket = self._original_buckets[original_pos]
-        for i in range(self._visual_bins):
-            cur_left = self._visual_min + width * i
-            cur_right = cur_left + width
-            cur_estimated_count = 0.0
-
+        current_pos = 0
+        for cur_left, cur_right in zip(bin_lefts, bin_rights):
             # Skip no bucket range.
-            if cur_right <= original_bucket.left:
-                re_sampled.append(Bucket(cur_left, width, math.ceil(cur_estimated_count)))
+            if cur_right <= lefts[current_pos]:
+                starts.append(0)
+                ends.append(0)
                 continue
 
             # Skip no intersect range.
-            while cur_left >= original_bucket.right:
+            while cur_left >= rights[current_pos]:
                 original_pos += 1
-                if original_pos >= len(self._original_buckets):
-                    break
-                original_bucket = self._original_buckets[original_pos]
-
-            # entering with this condition: cur_right > original_bucket.left and cur_left < original_bucket.right
-            while True:
-                if original_pos >= len(self._original_buckets):
+                if original_pos >= buckets_count:
                     break
-                original_bucket = self._original_buckets[original_pos]
+                current_pos = original_pos
 
-                intersection = self._calc_intersection_len(
-                    min1=cur_left, max1=cur_right,
-                    min2=original_bucket.left, max2=original_bucket.right)
-                if not original_bucket.width:
-                    estimated_count = original_bucket.count
-                else:
-                    estimated_count = (intersection / original_bucket.width) * original_bucket.count
-
-                cur_estimated_count += estimated_count
-                if cur_right > original_bucket.right:
+            start = original_pos
+            while original_pos < buckets_count:
+                current_pos = original_pos
+                if cur_right > rights[original_pos]:
                     # Need to sample next original bucket to this visual bucket.
                     original_pos += 1
                 else:
                     # Current visual bucket has taken all intersect buckets into account.
                     break
+            starts.append(start)
+            ends.append(min(original_pos + 1, buckets_count))
+        return np.array(starts), np.array(ends)
 
-            re_sampled.append(Bucket(cur_left, width, math.ceil(cur_estimated_count)))
+    def _re_sample_buckets(self):
+        """Re-samples buckets according to visual_max, visual_min and visual_bins."""
+        visual_max, visual_min = self._visual_max, self._visual_min
+        if visual_max == visual_min:
+            # Adjust visual range if max equals min.
+            visual_max += 0.5
+            visual_min -= 0.5
 
-        self._re_sampled_buckets = tuple(re_sampled)
+        width = (visual_max - visual_min) / self._visual_bins
+        bin_lefts = np.arange(self._visual_bins) * width + visual_min
+
+        if not self._count or not len(self._original_buckets):
+            self._re_sampled_buckets = self._to_buckets(bin_lefts, width, np.zeros(self._visual_bins, dtype=np.int64))
+            return
+
+        bin_rights = bin_lefts + width
+        starts, ends = self._calc_visited_ranges(bin_lefts, bin_rights)
+        # Only the buckets visited are sampled.
+        first, last = starts.min(), ends.max()
+        if first >= last:
+            self._re_sampled_buckets = self._to_buckets(bin_lefts, width, np.zeros(self._visual_bins, dtype=np.int64))
+            return
+        lefts, widths, counts = self._original_buckets[first:last].T
+        zero_widths = widths == 0
+
+        # Estimated counts of each original bucket (row) in each visual bucket (column) by the intersection length.
+        estimated_counts = np.minimum(bin_rights, (lefts + widths)[:, None])
+        estimated_counts -= np.maximum(bin_lefts, lefts[:, None])
+        np.maximum(estimated_counts, 0, out=estimated_counts)
+        estimated_counts /= np.where(zero_widths, 1, widths)[:, None]
+        estimated_counts *= counts[:, None]
+        estimated_counts[zero_widths] = counts[zero_widths, None]
+
+        positions = np.arange(first, last)[:, None]
+        estimated_counts *= (positions >= starts) & (positions < ends)
+        # Sum sequentially in the order of original buckets, the same as walking through them.
+        estimated_counts = np.add.accumulate(estimated_counts, axis=0)[-1]
+        self._re_sampled_buckets = self._to_buckets(bin_lefts, width, np.ceil(estimated_counts).astype(np.int64))
+
+    @staticmethod
+    def _to_buckets(bin_lefts, width, bin_counts):
+        """Converts re-sampled buckets to a tuple of (left, width, count)."""
+        return tuple(zip(bin_lefts.tolist(), [width] * len(bin_lefts), bin_counts.tolist()))
 
     def buckets(self, convert_to_tuple=True):
         """
@@ -228,10 +275,10 @@ class Histogram:
         Returns:
             tuple, contains buckets.
         """
-        if not self._re_sampled_buckets:
+        if self._re_sampled_buckets is None:
             self._re_sample_buckets()
 
         if not convert_to_tuple:
-            return self._re_sampled_buckets
+            return tuple(Bucket(left, width, count) for left, width, count in self._re_sampled_buckets)
 
-        return tuple(bucket.as_tuple() for bucket in self._re_sampled_buckets)
+        return self._re_sampled_buckets
@@ -13,7 +13,9 @@
 # limitations under the License.
 # ============================================================================
 """Histogram data container."""
-from mindinsight.datavisual.data_transform.histogram import Histogram, Bucket, mask_invalid_number
+import numpy as np
+
+from mindinsight.datavisual.data_transform.histogram import Histogram, mask_invalid_number
 from mindinsight.datavisual.proto_files.mindinsight_summary_pb2 import Summary
 
 
@@ -26,13 +28,14 @@ class HistogramContainer:
     """
 
     def __init__(self, histogram_message: Summary.Histogram):
-        original_buckets = [Bucket(bucket.left, bucket.width, bucket.count) for bucket in histogram_message.buckets]
+        original_buckets = np.array([(bucket.left, bucket.width, bucket.count)
+                                     for bucket in histogram_message.buckets], dtype=np.float64).reshape(-1, 3)
         # Ensure buckets are sorted from min to max.
-        original_buckets.sort(key=lambda bucket: bucket.left)
-        self._count = sum(bucket.count for bucket in original_buckets)
+        original_buckets = original_buckets[np.argsort(original_buckets[:, 0], kind='stable')]
+        self._count = sum(bucket.count for bucket in histogram_message.buckets)
         self._max = mask_invalid_number(histogram_message.max)
         self._min = mask_invalid_number(histogram_message.min)
-        self._histogram = Histogram(tuple(original_buckets), self._max, self._min, self._count)
+        self._histogram = Histogram(original_buckets, self._max, self._min, self._count)
 
     @property
     def max(self):
@@ -54,6 +57,11 @@ class HistogramContainer:
         """Gets histogram data"""
         return self._histogram
 
+    @property
+    def nbytes(self):
+        """Gets the number of bytes of histogram buckets."""
+        return self._histogram.original_buckets().nbytes
+
     def buckets(self):
         """Gets histogram buckets"""
         return self._histogram.buckets()
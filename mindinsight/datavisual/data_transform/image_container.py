@@ -13,18 +13,145 @@
 # limitations under the License.
 # ============================================================================
 """Image container."""
-from mindinsight.datavisual.proto_files.mindinsight_summary_pb2 import Summary
+import collections
+import struct
+import threading
+
+from google.protobuf.message import DecodeError
+
+from mindinsight.datavisual.common.log import logger
+from mindinsight.datavisual.data_access.file_handler import FileHandler
+from mindinsight.datavisual.proto_files.mindinsight_summary_pb2 import Event, Summary
+from mindinsight.datavisual.utils import crc32
+from mindinsight.utils.exceptions import MindInsightException
+
+# Max bytes of the encoded images read from summary files to be kept in memory.
+MAX_IMAGE_CACHE_BYTES = 64 * 1024 * 1024
+
+_HEADER_SIZE = 8
+_CRC_STR_SIZE = 4
+
+# Reference of an image in summary file, `value_index` is the index of the image value in the summary of the event.
+ImageReference = collections.namedtuple('ImageReference', ['file_path', 'offset', 'value_index'])
+
+
+class _EncodedImageCache:
+    """
+    LRU cache of the encoded images read from summary files, bounded by bytes.
+
+    Args:
+        max_bytes (int): Max bytes of the encoded images kept.
+    """
+
+    def __init__(self, max_bytes):
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self._images = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, reference):
+        """Get the encoded image, None if it is not cached."""
+        with self._lock:
+            encoded_image = self._images.get(reference)
+            if encoded_image is not None:
+                self._images.move_to_end(reference)
+            return encoded_image
+
+    def put(self, reference, encoded_image):
+        """Cache the encoded image, and evict the least recently used ones if the cache is full."""
+        if len(encoded_image) > self._max_bytes:
+            return
+        with self._lock:
+            if reference in self._images:
+                return
+            self._images[reference] = encoded_image
+            self._bytes += len(encoded_image)
+            while self._bytes > self._max_bytes:
+                _, evicted_image = self._images.popitem(last=False)
+                self._bytes -= len(evicted_image)
+
+
+_IMAGE_CACHE = _EncodedImageCache(MAX_IMAGE_CACHE_BYTES)
+
+
+def _read_encoded_image(reference):
+    """
+    Read the encoded image from summary file.
+
+    Args:
+        reference (ImageReference): Reference of the image.
+
+    Returns:
+        Union[bytes, None], the encoded image, None if the record does not hold the image any more.
+    """
+    file_system = FileHandler.get_file_system(reference.file_path)
+    header_record = file_system.read(reference.file_path, True, _HEADER_SIZE + _CRC_STR_SIZE, reference.offset)
+    if len(header_record) != _HEADER_SIZE + _CRC_STR_SIZE or \
+            not crc32.CheckValueAgainstData(header_record[_HEADER_SIZE:], header_record[:_HEADER_SIZE], _HEADER_SIZE):
+        return None
+    event_len = struct.unpack('Q', header_record[:_HEADER_SIZE])[0]
+    event_record = file_system.read(reference.file_path, True, event_len + _CRC_STR_SIZE,
+                                    reference.offset + _HEADER_SIZE + _CRC_STR_SIZE)
+    if len(event_record) != event_len + _CRC_STR_SIZE or \
+            not crc32.CheckValueAgainstData(event_record[event_len:], event_record[:event_len], event_len):
+        return None
+
+    values = Event.FromString(event_record[:event_len]).summary.value
+    if reference.value_index >= len(values) or not values[reference.value_index].HasField('image'):
+        return None
+    return values[reference.value_index].image.encoded_image
 
 
 class ImageContainer:
     """
     Container for image to allow pickling.
 
+    If the reference of the image in summary file is given, the encoded image is not kept, but read from the file on
+    demand and cached in a bounded LRU cache shared by all the images.
+
     Args:
         image_message (Summary.Image): Image proto buffer message.
+        reference (Optional[ImageReference]): Reference of the image in summary file. Default: None.
     """
-    def __init__(self, image_message: Summary.Image):
+    def __init__(self, image_message: Summary.Image, reference=None):
         self.height = image_message.height
         self.width = image_message.width
         self.colorspace = image_message.colorspace
-        self.encoded_image = image_message.encoded_image
+        self._reference = reference
+        self._encoded_image = image_message.encoded_image if reference is None else None
+
+    @property
+    def reference(self):
+        """Get reference of the image in summary file, None if the encoded image is kept in memory."""
+        return self._reference
+
+    @property
+    def nbytes(self):
+        """Get the number of bytes of the encoded image kept in memory, the images cached are not included."""
+        return len(self._encoded_image) if self._encoded_image is not None else 0
+
+    @property
+    def encoded_image(self):
+        """
+        Get the encoded image.
+
+        Returns:
+            Union[bytes, None], the encoded image, None if it can not be read from summary file.
+        """
+        if self._reference is None:
+            return self._encoded_image
+
+        encoded_image = _IMAGE_CACHE.get(self._reference)
+        if encoded_image is not None:
+            return encoded_image
+        try:
+            encoded_image = _read_encoded_image(self._reference)
+        except (OSError, DecodeError, MindInsightException) as ex:
+            logger.warning("Read image failed, detail: %s, file path: %s.", str(ex), self._reference.file_path)
+            return None
+        if encoded_image is None:
+            logger.warning("Image is not found at offset %d, file path: %s.",
+                           self._reference.offset, self._reference.file_path)
+            return None
+        _IMAGE_CACHE.put(self._reference, encoded_image)
+        return encoded_image
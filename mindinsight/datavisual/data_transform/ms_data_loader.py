@@ -19,8 +19,10 @@ This module is used to load the MindSpore training log file.
 Each instance will read an entire run, a run can contain one or
 more log file.
 """
+import collections
 import re
 import struct
+import time
 
 from google.protobuf.message import DecodeError
 from google.protobuf.text_format import ParseError
@@ -29,23 +31,110 @@ from mindinsight.datavisual.common import exceptions
 from mindinsight.datavisual.common.enums import PluginNameEnum
 from mindinsight.datavisual.common.log import logger
 from mindinsight.datavisual.data_access.file_handler import FileHandler
+from mindinsight.datavisual.data_access.local_file_system import LocalFileSystem
+from mindinsight.datavisual.data_transform import events_snapshot
 from mindinsight.datavisual.data_transform.events_data import EventsData
 from mindinsight.datavisual.data_transform.events_data import TensorEvent
 from mindinsight.datavisual.data_transform.graph import MSGraph
+from mindinsight.datavisual.data_transform.graph.graph_cache import GRAPH_CACHE, GraphReference, get_graph_digest
+from mindinsight.datavisual.data_transform.graph.graph_cache import GraphFileCache, get_graph_file_dir
 from mindinsight.datavisual.data_transform.histogram import Histogram
 from mindinsight.datavisual.data_transform.histogram_container import HistogramContainer
-from mindinsight.datavisual.data_transform.image_container import ImageContainer
+from mindinsight.datavisual.data_transform.image_container import ImageContainer, ImageReference
+from mindinsight.datavisual.data_transform.summary_index import SummaryIndex, calc_fingerprint
 from mindinsight.datavisual.data_transform.tensor_container import TensorContainer, MAX_TENSOR_COUNT
 from mindinsight.datavisual.proto_files import mindinsight_anf_ir_pb2 as anf_ir_pb2
 from mindinsight.datavisual.proto_files import mindinsight_summary_pb2 as summary_pb2
 from mindinsight.datavisual.utils import crc32
 from mindinsight.datavisual.utils.tools import exception_no_raise_wrapper
 from mindinsight.utils.computing_resource_mgr import ComputingResourceManager, Executor
+from mindinsight.utils.exceptions import MindInsightException
 from mindinsight.utils.exceptions import UnknownError
 
 HEADER_SIZE = 8
 CRC_STR_SIZE = 4
 MAX_EVENT_STRING = 500000000
+# Limits of records read and submitted as one parse task.
+MAX_BATCH_RECORDS = 2000
+MAX_BATCH_BYTES = 8 * 1024 * 1024
+# Min interval, in seconds, between the snapshots of a summary directory which is still being written.
+SNAPSHOT_MIN_INTERVAL = 600
+_GRAPH_DEF_FIELD_NUMBER = summary_pb2.Event.DESCRIPTOR.fields_by_name['graph_def'].number
+
+# Wire types of protocol buffers.
+_WIRE_TYPE_VARINT = 0
+_WIRE_TYPE_FIXED64 = 1
+_WIRE_TYPE_LENGTH_DELIMITED = 2
+_WIRE_TYPE_FIXED32 = 5
+
+
+def _decode_varint(buffer, position):
+    """
+    Decode a varint of protocol buffers.
+
+    Args:
+        buffer (memoryview): The buffer.
+        position (int): The position of the varint.
+
+    Returns:
+        Union[tuple[int, int], None], the value and the position after the varint, None if the buffer ends before
+            the varint does.
+    """
+    value = 0
+    shift = 0
+    while position < len(buffer):
+        byte = buffer[position]
+        position += 1
+        value |= (byte & 0x7f) << shift
+        if not byte & 0x80:
+            return value, position
+        shift += 7
+    return None
+
+
+def _get_field_span(message_bytes, field_number):
+    """
+    Find a length-delimited field in a serialized message, without parsing the message.
+
+    Args:
+        message_bytes (bytes): The serialized message.
+        field_number (int): The field number.
+
+    Returns:
+        Union[tuple[int, int, int], None], the start offset of the field, and the start and end offset of its value,
+            None if the field is not found or the message is malformed, which is left to the parser to report.
+    """
+    buffer = memoryview(message_bytes)
+    position = 0
+    while position < len(buffer):
+        field_start = position
+        decoded = _decode_varint(buffer, position)
+        if decoded is None:
+            return None
+        key, position = decoded
+        wire_type = key & 0x7
+        if wire_type == _WIRE_TYPE_VARINT:
+            decoded = _decode_varint(buffer, position)
+            if decoded is None:
+                return None
+            position = decoded[1]
+        elif wire_type == _WIRE_TYPE_FIXED64:
+            position += 8
+        elif wire_type == _WIRE_TYPE_FIXED32:
+            position += 4
+        elif wire_type == _WIRE_TYPE_LENGTH_DELIMITED:
+            decoded = _decode_varint(buffer, position)
+            if decoded is None:
+                return None
+            length, position = decoded
+            if position + length > len(buffer):
+                return None
+            if key >> 3 == field_number:
+                return field_start, position, position + length
+            position += length
+        else:
+            return None
+    return None
 
 
 class MSDataLoader:
@@ -64,11 +153,102 @@ class MSDataLoader:
         self._parser_list = []
         self._parser_list.append(_SummaryParser(summary_dir))
         self._parser_list.append(_PbParser(summary_dir))
+        # The state of loader saved in the latest snapshot, and the time it is saved.
+        self._snapshot_state = None
+        self._snapshot_time = time.time()
+        # The state of loader when saving snapshot is checked last time.
+        self._checked_state = None
 
     def get_events_data(self):
         """Return events data read from log file."""
         return self._events_data
 
+    def _get_state(self):
+        """
+        Get the state of loader, which is saved in snapshot with the events data.
+
+        Returns:
+            dict, the state of parsers, and the size and modification time of the files which are finished loading.
+        """
+        parser_states = [parser.get_state() for parser in self._parser_list]
+        growing_filenames = set(parser.growing_filename for parser in self._parser_list)
+        file_stats = {}
+        for filename in self._valid_filenames:
+            if filename in growing_filenames:
+                continue
+            file_stat = FileHandler.file_stat(FileHandler.join(self._summary_dir, filename))
+            file_stats[filename] = [file_stat.size, file_stat.mtime]
+        return dict(valid_filenames=list(self._valid_filenames),
+                    file_stats=file_stats,
+                    parsers=parser_states)
+
+    def save_snapshot(self, force=False):
+        """
+        Save snapshot of the events data to workspace, if anything is loaded since the latest snapshot.
+
+        As the summary files being written change in every reload, the snapshot is saved only when nothing is loaded
+        since the last check, i.e. the files stop changing, or when `SNAPSHOT_MIN_INTERVAL` has passed since the
+        latest snapshot. It should be called after all the tasks submitted are finished, so the events data is
+        consistent with the state of parsers.
+
+        Args:
+            force (bool): Whether to save snapshot even if the files are still changing, e.g. on shutdown.
+                Default: False.
+        """
+        for parser in self._parser_list:
+            parser.flush()
+        try:
+            state = self._get_state()
+        except (OSError, MindInsightException) as ex:
+            logger.warning("Get state of loader failed, detail: %s, summary dir: %s.", str(ex), self._summary_dir)
+            return
+        if state == self._snapshot_state:
+            return
+        is_idle = state == self._checked_state
+        self._checked_state = state
+        if not force and not is_idle and time.time() - self._snapshot_time < SNAPSHOT_MIN_INTERVAL:
+            return
+        if events_snapshot.save_snapshot(self._summary_dir, state, self._events_data.get_state()):
+            self._snapshot_state = state
+            self._snapshot_time = time.time()
+
+    def restore_snapshot(self):
+        """
+        Restore the events data and the state of parsers from the snapshot in workspace.
+
+        The snapshot is used only if the files finished loading are not modified, and loading continues from where
+        the snapshot ended.
+
+        Returns:
+            bool, True if the snapshot is restored.
+        """
+        snapshot = events_snapshot.load_snapshot(self._summary_dir)
+        if snapshot is None:
+            return False
+        state, events_state = snapshot
+
+        try:
+            for filename, (size, mtime) in state['file_stats'].items():
+                file_stat = FileHandler.file_stat(FileHandler.join(self._summary_dir, filename))
+                if file_stat.size != size or file_stat.mtime != mtime:
+                    logger.info("File %s is modified, ignore the events snapshot.", filename)
+                    return False
+            for parser, parser_state in zip(self._parser_list, state['parsers']):
+                if not parser.set_state(parser_state):
+                    logger.info("Parser state does not match files, ignore the events snapshot.")
+                    self.__init__(self._summary_dir)
+                    return False
+        except (OSError, KeyError, ValueError, MindInsightException) as ex:
+            logger.info("Check events snapshot failed, detail: %s, summary dir: %s.", str(ex), self._summary_dir)
+            self.__init__(self._summary_dir)
+            return False
+
+        self._valid_filenames = state['valid_filenames']
+        self._events_data.restore_state(events_state)
+        self._snapshot_state = state
+        logger.info("Restore events snapshot, summary dir: %s.", self._summary_dir)
+        return True
+
     def _check_files_deleted(self, filenames, old_filenames):
         """
         Check the file list for updates.
@@ -107,6 +287,8 @@ class MSDataLoader:
                 while not self._load(new_executor):
                     pass
                 new_executor.wait_all_tasks_finish()
+                for parser in self._parser_list:
+                    parser.flush()
                 return True
 
     def _load(self, executor):
@@ -132,6 +314,11 @@ class MSDataLoader:
         finished = True
         for parser in self._parser_list:
             finished = parser.parse_files(executor, filenames, events_data=self._events_data) and finished
+            if parser.reload_required:
+                logger.warning("The events data loaded do not match the files, "
+                               "we will reload all files in path %s.", self._summary_dir)
+                self.__init__(self._summary_dir)
+                return False
         return finished
 
     def filter_valid_files(self):
@@ -160,6 +347,7 @@ class _Parser:
     def __init__(self, summary_dir):
         self._summary_dir = summary_dir
         self._latest_filename = ''
+        self._reload_required = False
 
     def parse_files(self, executor, filenames, events_data):
         """
@@ -184,6 +372,41 @@ class _Parser:
         """
         raise NotImplementedError
 
+    def flush(self):
+        """Persist the state of parsing, called after all the tasks submitted are finished."""
+
+    @property
+    def growing_filename(self):
+        """Get the name of the file which may still be appended to, empty if there is none."""
+        return ''
+
+    @property
+    def reload_required(self):
+        """Whether the events data loaded do not match the files, and all the files should be reloaded."""
+        return self._reload_required
+
+    def get_state(self):
+        """
+        Get the state of parser, which can be restored by `set_state`.
+
+        Returns:
+            dict, the state of parser, which can be dumped to JSON.
+        """
+        return dict(latest_filename=self._latest_filename)
+
+    def set_state(self, state):
+        """
+        Restore the state of parser.
+
+        Args:
+            state (dict): The state got by `get_state`.
+
+        Returns:
+            bool, True if the state matches the files and is restored.
+        """
+        self._latest_filename = state['latest_filename']
+        return True
+
 
 class _PbParser(_Parser):
     """This class is used to parse pb file."""
@@ -198,15 +421,34 @@ class _PbParser(_Parser):
         for filename in pb_filenames:
             if not self._set_latest_file(filename):
                 continue
-            future = executor.submit(self._parse_pb_file, self._summary_dir, filename)
+            # The graphs are kept until the graph references returned are resolved.
+            graphs = GRAPH_CACHE.get_graphs()
+            future = executor.submit(self._parse_pb_file, self._summary_dir, filename, frozenset(graphs),
+                                     GraphFileCache(get_graph_file_dir()))
             def add_tensor_event(future_value):
                 tensor_event = future_value.result()
-                if tensor_event is not None:
-                    events_data.add_tensor_event(tensor_event)
+                if tensor_event is None:
+                    return
+                graph = GRAPH_CACHE.resolve(tensor_event.value, graphs)
+                if graph is None:
+                    logger.warning("Load graph failed and ignore it, file name: %s.", tensor_event.filename)
+                    return
+                events_data.add_tensor_event(tensor_event._replace(value=graph))
             future.add_done_callback(exception_no_raise_wrapper(add_tensor_event))
             return False
         return True
 
+    def get_state(self):
+        """Get state, see parent class for details."""
+        state = super().get_state()
+        state['latest_mtime'] = self._latest_mtime
+        return state
+
+    def set_state(self, state):
+        """Restore state, see parent class for details."""
+        self._latest_mtime = state['latest_mtime']
+        return super().set_state(state)
+
     def filter_files(self, filenames):
         """
         Get a list of pb files.
@@ -249,12 +491,16 @@ class _PbParser(_Parser):
         return True
 
     @staticmethod
-    def _parse_pb_file(summary_dir, filename):
+    def _parse_pb_file(summary_dir, filename, graph_digests=frozenset(), graph_file_cache=None):
         """
         Parse pb file and write content to `EventsData`.
 
         Args:
             filename (str): The file path of pb file.
+            graph_digests (frozenset[str]): Digests of the graphs interned, which are referred to instead of being
+                built again. Default: frozenset().
+            graph_file_cache (Optional[GraphFileCache]): The cache of graph files, to read the pickled graph instead
+                of building it, and to save the graph built. Default: None.
 
         Returns:
             TensorEvent, if load pb file and build graph success, will return tensor event, else return None.
@@ -262,9 +508,47 @@ class _PbParser(_Parser):
         file_path = FileHandler.join(summary_dir, filename)
         logger.info("Start to load graph from pb file, file path: %s.", file_path)
         filehandler = FileHandler(file_path)
+        model_bytes = filehandler.read()
+        digest = get_graph_digest(model_bytes)
+        if digest in graph_digests:
+            logger.info("Graph of pb file is built by other train jobs, file path: %s.", file_path)
+            graph = GraphReference(digest)
+        else:
+            graph = graph_file_cache.read(digest) if graph_file_cache is not None else None
+            if graph is None:
+                graph = _PbParser._build_graph(model_bytes, file_path)
+                if graph is None:
+                    return None
+                graph.digest = digest
+                if graph_file_cache is not None:
+                    graph_file_cache.save(graph)
+                logger.info("Build graph success, file path: %s.", file_path)
+            else:
+                logger.info("Read graph from graph file cache, file path: %s.", file_path)
+
+        tensor_event = TensorEvent(wall_time=FileHandler.file_stat(file_path).mtime,
+                                   step=0,
+                                   tag=filename,
+                                   plugin_name=PluginNameEnum.GRAPH.value,
+                                   value=graph,
+                                   filename=filename)
+        return tensor_event
+
+    @staticmethod
+    def _build_graph(model_bytes, file_path):
+        """
+        Build graph from the content of pb file.
+
+        Args:
+            model_bytes (bytes): The content of pb file.
+            file_path (str): The file path of pb file.
+
+        Returns:
+            MSGraph, the graph built, None if the pb file is invalid.
+        """
         model_proto = anf_ir_pb2.ModelProto()
         try:
-            model_proto.ParseFromString(filehandler.read())
+            model_proto.ParseFromString(model_bytes)
         except ParseError:
             logger.warning("The given file is not a valid pb file, file path: %s.", file_path)
             return None
@@ -279,16 +563,7 @@ class _PbParser(_Parser):
             logger.error("Build graph failed, file path: %s.", file_path)
             logger.exception(ex)
             raise UnknownError(str(ex))
-
-        tensor_event = TensorEvent(wall_time=FileHandler.file_stat(file_path).mtime,
-                                   step=0,
-                                   tag=filename,
-                                   plugin_name=PluginNameEnum.GRAPH.value,
-                                   value=graph,
-                                   filename=filename)
-
-        logger.info("Build graph success, file path: %s.", file_path)
-        return tensor_event
+        return graph
 
 
 class _SummaryParser(_Parser):
@@ -298,6 +573,9 @@ class _SummaryParser(_Parser):
         super(_SummaryParser, self).__init__(summary_dir)
         self._latest_file_size = 0
         self._summary_file_handler = None
+        self._summary_index = None
+        # (offset, length) of the indexed records to load before resuming at the end offset of the index.
+        self._indexed_records = collections.deque()
 
     def parse_files(self, executor, filenames, events_data):
         """
@@ -321,12 +599,16 @@ class _SummaryParser(_Parser):
             file_path = FileHandler.join(self._summary_dir, filename)
 
             if filename != self._latest_filename:
+                self.flush()
+                if self._summary_file_handler is not None:
+                    self._summary_file_handler.close()
                 self._summary_file_handler = FileHandler(file_path, 'rb')
                 self._latest_filename = filename
                 self._latest_file_size = 0
+                self._load_summary_index(file_path, events_data)
 
             new_size = FileHandler.file_stat(file_path).size
-            if new_size == self._latest_file_size:
+            if new_size == self._latest_file_size and not self._indexed_records:
                 continue
 
             try:
@@ -340,8 +622,85 @@ class _SummaryParser(_Parser):
             except UnknownError as ex:
                 logger.warning("Parse summary file failed, detail: %r,"
                                "file path: %s.", str(ex), file_path)
+        self.flush()
         return True
 
+    def _load_summary_index(self, file_path, events_data):
+        """
+        Load the index of summary file, and resume loading at the end offset of the index.
+
+        The records to fill the reservoirs are selected from the index, and will be loaded before resuming.
+
+        Args:
+            file_path (str): Summary file path.
+            events_data (EventsData): The container of event data.
+        """
+        self._indexed_records = collections.deque()
+        if not isinstance(FileHandler.get_file_system(file_path), LocalFileSystem):
+            self._summary_index = None
+            return
+
+        self._summary_index = SummaryIndex.load(file_path)
+        if not self._summary_index.end_offset:
+            return
+        self._indexed_records = collections.deque(self._summary_index.select_records(events_data.get_reservoir_size))
+        self._summary_file_handler.reset_offset(self._summary_index.end_offset)
+        logger.info("Load summary index, %d records selected, resume at offset %d, file path: %s.",
+                    len(self._indexed_records), self._summary_index.end_offset, file_path)
+
+    def flush(self):
+        """Save the index of the summary file being loaded."""
+        if self._summary_index is not None:
+            self._summary_index.save()
+
+    @property
+    def growing_filename(self):
+        """Get the name of the summary file being loaded."""
+        return self._latest_filename
+
+    def get_state(self):
+        """Get state, see parent class for details."""
+        state = super().get_state()
+        if self._latest_filename:
+            offset = self._summary_file_handler.offset
+            state.update(latest_file_size=self._latest_file_size,
+                         offset=offset,
+                         fingerprint=calc_fingerprint(FileHandler.join(self._summary_dir, self._latest_filename),
+                                                      offset))
+        return state
+
+    def set_state(self, state):
+        """
+        Restore state, see parent class for details.
+
+        The summary file being loaded is checked by the fingerprint of the content loaded, and loading continues
+        from the offset in state.
+        """
+        if not state['latest_filename']:
+            return super().set_state(state)
+
+        file_path = FileHandler.join(self._summary_dir, state['latest_filename'])
+        offset = state['offset']
+        if FileHandler.file_stat(file_path).size < offset or \
+                calc_fingerprint(file_path, offset) != state['fingerprint']:
+            return False
+
+        if self._summary_file_handler is not None:
+            self._summary_file_handler.close()
+        self._summary_file_handler = FileHandler(file_path, 'rb')
+        self._summary_file_handler.reset_offset(offset)
+        self._latest_file_size = state['latest_file_size']
+        self._indexed_records = collections.deque()
+        self._summary_index = None
+        if isinstance(FileHandler.get_file_system(file_path), LocalFileSystem):
+            summary_index = SummaryIndex.load(file_path)
+            if summary_index.end_offset == offset:
+                self._summary_index = summary_index
+            else:
+                logger.debug("Summary index does not match the events snapshot and is not used, file path: %s.",
+                             file_path)
+        return super().set_state(state)
+
     def filter_files(self, filenames):
         """
         Gets a list of summary files.
@@ -358,7 +717,11 @@ class _SummaryParser(_Parser):
 
     def _load_single_file(self, file_handler, executor, events_data):
         """
-        Load a log file data.
+        Load a batch of records from a log file.
+
+        Records are read until either `MAX_BATCH_RECORDS` records or `MAX_BATCH_BYTES` bytes are collected, so
+        batches of small events (such as scalars) hold many records while batches of big events (such as tensors)
+        hold only a few. The whole batch is parsed by one task to amortize the cost of inter-process communication.
 
         Args:
             file_handler (FileHandler): A file handler.
@@ -368,50 +731,142 @@ class _SummaryParser(_Parser):
         Returns:
             bool, True if the summary file is finished loading.
         """
-        while True:
+        if self._indexed_records:
+            self._load_indexed_records(file_handler, executor, events_data)
+            return False
+
+        event_strs = []
+        records = []
+        batch_start_offset = file_handler.offset
+        batch_bytes = 0
+        finished = False
+        while len(event_strs) < MAX_BATCH_RECORDS and batch_bytes < MAX_BATCH_BYTES:
             start_offset = file_handler.offset
             try:
                 event_str = self._event_load(file_handler)
                 if event_str is None:
                     file_handler.reset_offset(start_offset)
-                    return True
+                    finished = True
+                    break
                 if len(event_str) > MAX_EVENT_STRING:
                     logger.warning("file_path: %s, event string: %d exceeds %d and drop it.",
                                    file_handler.file_path, len(event_str), MAX_EVENT_STRING)
                     continue
-
-                future = executor.submit(self._event_parse, event_str, self._latest_filename)
-
-                def _add_tensor_event_callback(future_value):
-                    tensor_values = future_value.result()
-                    for tensor_value in tensor_values:
-                        if tensor_value.plugin_name == PluginNameEnum.GRAPH.value:
-                            try:
-                                graph_tags = events_data.list_tags_by_plugin(PluginNameEnum.GRAPH.value)
-                            except KeyError:
-                                graph_tags = []
-
-                            summary_tags = self.filter_files(graph_tags)
-                            for tag in summary_tags:
-                                events_data.delete_tensor_event(tag)
-
-                        events_data.add_tensor_event(tensor_value)
-
-                future.add_done_callback(exception_no_raise_wrapper(_add_tensor_event_callback))
-                return False
+                # Event strings read through memory mapping are copied once here, as they are sent to other
+                # processes to parse.
+                event_strs.append(bytes(event_str))
+                records.append((start_offset, file_handler.offset - start_offset))
+                batch_bytes += len(event_str)
             except exceptions.CRCFailedError:
                 file_handler.reset_offset(start_offset)
                 logger.warning("Check crc faild and ignore this file, file_path=%s, "
                                "offset=%s.", file_handler.file_path, file_handler.offset)
-                return True
+                finished = True
+                break
             except (OSError, DecodeError, exceptions.MindInsightException) as ex:
                 logger.warning("Parse log file fail, and ignore this file, detail: %r,"
                                "file path: %s.", str(ex), file_handler.file_path)
-                return True
+                finished = True
+                break
             except Exception as ex:
                 logger.exception(ex)
                 raise UnknownError(str(ex))
 
+        batch_range = (batch_start_offset, file_handler.offset)
+        if event_strs:
+            logger.debug("Submit %d records (%d bytes) to parse, file path: %s.",
+                         len(event_strs), batch_bytes, file_handler.file_path)
+            self._submit_events_parse(executor, event_strs, events_data, records, batch_range)
+        elif self._summary_index is not None and batch_range[1] > batch_range[0]:
+            # All the records read are dropped.
+            self._summary_index.add_batch(*batch_range, entries=[])
+        return finished
+
+    def _load_indexed_records(self, file_handler, executor, events_data):
+        """
+        Load a batch of the records selected from the summary index.
+
+        If the records do not match the index, the index is dropped, and all the files will be reloaded, as the events
+        of the records loaded before do not match the file either.
+
+        Args:
+            file_handler (FileHandler): A file handler.
+            executor (Executor): The executor instance.
+            events_data (EventsData): The container of event data.
+        """
+        resume_offset = file_handler.offset
+        event_strs = []
+        records = []
+        batch_bytes = 0
+        while self._indexed_records and len(event_strs) < MAX_BATCH_RECORDS and batch_bytes < MAX_BATCH_BYTES:
+            offset, length = self._indexed_records.popleft()
+            file_handler.reset_offset(offset)
+            try:
+                event_str = self._event_load(file_handler)
+            except (OSError, exceptions.MindInsightException) as ex:
+                logger.debug("Load indexed record failed, detail: %r.", str(ex))
+                event_str = None
+            if event_str is None or file_handler.offset != offset + length:
+                logger.warning("Summary index does not match the file and will be rebuilt, file path: %s.",
+                               file_handler.file_path)
+                self._indexed_records.clear()
+                self._summary_index.invalidate()
+                self._reload_required = True
+                return
+            event_strs.append(bytes(event_str))
+            records.append((offset, length))
+            batch_bytes += len(event_str)
+
+        file_handler.reset_offset(resume_offset)
+        if event_strs:
+            self._submit_events_parse(executor, event_strs, events_data, records)
+
+    def _submit_events_parse(self, executor, event_strs, events_data, records, batch_range=None):
+        """
+        Submit a batch of event strings to the executor and add the parsed tensor events to `EventsData`.
+
+        Args:
+            executor (Executor): The executor instance.
+            event_strs (list[bytes]): Event strings read from the summary file.
+            events_data (EventsData): The container of event data.
+            records (list[tuple[int, int]]): (offset, length) of the records of event strings.
+            batch_range (Optional[tuple[int, int]]): The start and end offset of the records, to index the records
+                in the range. Default: None.
+        """
+        file_path = FileHandler.join(self._summary_dir, self._latest_filename)
+        # The graphs are kept until the graph references returned are resolved.
+        graphs = GRAPH_CACHE.get_graphs()
+        future = executor.submit(self._events_parse, event_strs, self._latest_filename,
+                                 file_path, [offset for offset, _ in records], frozenset(graphs),
+                                 GraphFileCache(get_graph_file_dir()))
+        summary_index = self._summary_index if batch_range is not None else None
+
+        def _add_tensor_event_callback(future_value):
+            tensor_values, record_ids = future_value.result()
+            if summary_index is not None:
+                summary_index.add_batch(*batch_range, entries=[
+                    (*records[record_id], tensor_value.step, tensor_value.tag, tensor_value.plugin_name)
+                    for tensor_value, record_id in zip(tensor_values, record_ids)])
+            for tensor_value in tensor_values:
+                if tensor_value.plugin_name == PluginNameEnum.GRAPH.value:
+                    graph = GRAPH_CACHE.resolve(tensor_value.value, graphs)
+                    if graph is None:
+                        logger.warning("Load graph failed and ignore it, file name: %s.", tensor_value.filename)
+                        continue
+                    tensor_value = tensor_value._replace(value=graph)
+                    try:
+                        graph_tags = events_data.list_tags_by_plugin(PluginNameEnum.GRAPH.value)
+                    except KeyError:
+                        graph_tags = []
+
+                    summary_tags = self.filter_files(graph_tags)
+                    for tag in summary_tags:
+                        events_data.delete_tensor_event(tag)
+
+                events_data.add_tensor_event(tensor_value)
+
+        future.add_done_callback(exception_no_raise_wrapper(_add_tensor_event_callback))
+
     def _event_load(self, file_handler):
         """
         Load binary string to event string.
@@ -420,52 +875,49 @@ class _SummaryParser(_Parser):
             file_handler (FileHandler): A file handler.
 
         Returns:
-            bytes, MindSpore event in bytes.
+            Union[bytes, memoryview], MindSpore event in bytes.
         """
-        # read the header
-        header_str = file_handler.read(HEADER_SIZE)
-        if not header_str:
+        # read the header and its crc at once
+        header_record = file_handler.read(HEADER_SIZE + CRC_STR_SIZE)
+        if not header_record:
             logger.info("Load summary file finished, file_path=%s.", file_handler.file_path)
             return None
-        header_crc_str = file_handler.read(CRC_STR_SIZE)
-        if not header_crc_str:
-            header_crc_str = ''
 
-        if len(header_str) != HEADER_SIZE or len(header_crc_str) != CRC_STR_SIZE:
+        if len(header_record) != HEADER_SIZE + CRC_STR_SIZE:
             logger.warning("Check header size and crc, record truncated at offset %s, "
                            "file_path=%s.", file_handler.offset, file_handler.file_path)
             return None
+        header_str = header_record[:HEADER_SIZE]
+        header_crc_str = header_record[HEADER_SIZE:]
         if not crc32.CheckValueAgainstData(header_crc_str, header_str, HEADER_SIZE):
             raise exceptions.CRCFailedError()
 
-        # read the event body if integrity of header is verified
+        # read the event body and its crc if integrity of header is verified
         header = struct.unpack('Q', header_str)
         event_len = int(header[0])
 
-        event_str = file_handler.read(event_len)
-        if not event_str:
-            event_str = ''
-        event_crc_str = file_handler.read(CRC_STR_SIZE)
-        if not event_crc_str:
-            event_crc_str = ''
-
-        if len(event_str) != event_len or len(event_crc_str) != CRC_STR_SIZE:
+        event_record = file_handler.read(event_len + CRC_STR_SIZE)
+        if len(event_record) != event_len + CRC_STR_SIZE:
             logger.warning("Check event crc, record truncated at offset %d, file_path: %s.",
                            file_handler.offset, file_handler.file_path)
             return None
+        event_str = event_record[:event_len]
+        event_crc_str = event_record[event_len:]
         if not crc32.CheckValueAgainstData(event_crc_str, event_str, event_len):
             raise exceptions.CRCFailedError()
 
         return event_str
 
     @staticmethod
-    def _parse_summary_value(value, plugin):
+    def _parse_summary_value(value, plugin, image_reference=None):
         """
         Parse summary value and create corresponding container according to plugin.
 
         Args:
             value (Summary.Value): Value message in summary file.
             plugin (str): Plugin value.
+            image_reference (Optional[ImageReference]): Reference of the image value in summary file, so that the
+                encoded image is not kept in memory. Default: None.
 
         Returns:
             Union[Summary.Value, HistogramContainer, TensorContainer, ImageContainer], original summary value
@@ -489,12 +941,53 @@ class _SummaryParser(_Parser):
                 return None
 
         elif plugin == PluginNameEnum.IMAGE.value:
-            tensor_event_value = ImageContainer(tensor_event_value)
+            tensor_event_value = ImageContainer(tensor_event_value, image_reference)
 
         return tensor_event_value
 
     @staticmethod
-    def _event_parse(event_str, latest_file_name):
+    def _events_parse(event_strs, latest_file_name, file_path=None, offsets=None, graph_digests=frozenset(),
+                      graph_file_cache=None):
+        """
+        Transform a batch of `Event` data to tensor events.
+
+        This method is static to avoid sending unnecessary objects to other processes.
+
+        Args:
+            event_strs (list[bytes]): Message event strings in summary proto, data read from file handler.
+            latest_file_name (str): Latest file name.
+            file_path (Optional[str]): Path of the summary file. Default: None.
+            offsets (Optional[list[int]]): Offsets of the records of event strings in summary file, to refer to
+                images instead of keeping them. Default: None.
+            graph_digests (frozenset[str]): Digests of the graphs interned, which are referred to instead of being
+                built again. Default: frozenset().
+            graph_file_cache (Optional[GraphFileCache]): The cache of graph files, to read the pickled graphs instead
+                of building them, and to save the graphs built. Default: None.
+
+        Returns:
+            tuple[list[TensorEvent], list[int]], tensor events of all the given event strings in the order of
+                the records, and the index of the event string each tensor event is parsed from. The event strings
+                failed to parse are skipped.
+        """
+        ret_tensor_events = []
+        record_ids = []
+        for record_id, event_str in enumerate(event_strs):
+            record_reference = (file_path, offsets[record_id]) if offsets is not None else None
+            try:
+                tensor_events = _SummaryParser._event_parse(event_str, latest_file_name, record_reference,
+                                                            graph_digests, graph_file_cache)
+            except Exception as ex:
+                # Only the bad event is dropped, instead of all the events in the batch.
+                logger.warning("Parse event failed and ignore it, detail: %r, file name: %s, record index: %d.",
+                               str(ex), latest_file_name, record_id)
+                continue
+            ret_tensor_events.extend(tensor_events)
+            record_ids.extend([record_id] * len(tensor_events))
+        return ret_tensor_events, record_ids
+
+    @staticmethod
+    def _event_parse(event_str, latest_file_name, record_reference=None, graph_digests=frozenset(),
+                     graph_file_cache=None):
         """
         Transform `Event` data to tensor_event and update it to EventsData.
 
@@ -503,6 +996,12 @@ class _SummaryParser(_Parser):
         Args:
             event_str (str): Message event string in summary proto, data read from file handler.
             latest_file_name (str): Latest file name.
+            record_reference (Optional[tuple[str, int]]): Path of the summary file and offset of the record, to
+                refer to images instead of keeping them. Default: None.
+            graph_digests (frozenset[str]): Digests of the graphs interned, which are referred to instead of being
+                built again. Default: frozenset().
+            graph_file_cache (Optional[GraphFileCache]): The cache of graph files, to read the pickled graph instead
+                of building it, and to save the graph built. Default: None.
         """
 
         plugins = {
@@ -512,18 +1011,34 @@ class _SummaryParser(_Parser):
             'tensor': PluginNameEnum.TENSOR
         }
         logger.debug("Start to parse event string. Event string len: %s.", len(event_str))
+        graph = None
+        graph_def_span = _get_field_span(event_str, _GRAPH_DEF_FIELD_NUMBER)
+        if graph_def_span is not None:
+            # The graph is keyed by the bytes it is parsed from, as serializing it again costs about half of building.
+            field_start, graph_def_start, graph_def_end = graph_def_span
+            digest = get_graph_digest(memoryview(event_str)[graph_def_start:graph_def_end])
+            if digest in graph_digests:
+                graph = GraphReference(digest)
+            elif graph_file_cache is not None:
+                graph = graph_file_cache.read(digest)
+            if graph is not None:
+                # Parsing the graph costs almost as much as building it, so only the other fields are parsed.
+                event_str = event_str[:field_start] + event_str[graph_def_end:]
         event = summary_pb2.Event.FromString(event_str)
         logger.debug("Deserialize event string completed.")
 
         ret_tensor_events = []
         if event.HasField('summary'):
-            for value in event.summary.value:
+            for value_index, value in enumerate(event.summary.value):
                 for plugin in plugins:
                     if not value.HasField(plugin):
                         continue
                     plugin_name_enum = plugins[plugin]
                     logger.debug("Processing plugin value: %s.", plugin_name_enum)
-                    tensor_event_value = _SummaryParser._parse_summary_value(value, plugin)
+                    image_reference = None
+                    if record_reference is not None and plugin_name_enum == PluginNameEnum.IMAGE:
+                        image_reference = ImageReference(*record_reference, value_index)
+                    tensor_event_value = _SummaryParser._parse_summary_value(value, plugin, image_reference)
                     if tensor_event_value is None:
                         continue
 
@@ -537,9 +1052,13 @@ class _SummaryParser(_Parser):
                                  plugin_name_enum, value.tag, event.step)
                     ret_tensor_events.append(tensor_event)
 
-        elif event.HasField('graph_def'):
-            graph = MSGraph()
-            graph.build_graph(event.graph_def)
+        elif graph is not None or event.HasField('graph_def'):
+            if graph is None:
+                graph = MSGraph()
+                graph.build_graph(event.graph_def)
+                graph.digest = digest
+                if graph_file_cache is not None:
+                    graph_file_cache.save(graph)
             tensor_event = TensorEvent(wall_time=event.wall_time,
                                        step=event.step,
                                        tag=latest_file_name,
@@ -14,31 +14,243 @@
 # ============================================================================
 """A reservoir sampling on the values."""
 
+import bisect
+import collections.abc
+import itertools
 import random
 import threading
+import time
+
+import numpy as np
 
 from mindinsight.datavisual.common.log import logger
 from mindinsight.datavisual.common.enums import PluginNameEnum
 from mindinsight.utils.exceptions import ParamValueError
 from mindinsight.datavisual.utils.utils import calc_histogram_bins
 
+# Versions are unique among all the reservoirs, so a version identifies the samples even if the reservoir is recreated.
+# They start from the time in microseconds when the process starts, so the versions got from an earlier process, e.g.
+# before restarting, are less than those of this process.
+_VERSIONS = itertools.count(int(time.time() * 1e6))
+
+# Sample of scalar reservoir, which has the same fields as the samples added.
+ScalarSample = collections.namedtuple('ScalarSample', ['wall_time', 'step', 'value', 'filename'])
+
+# Approximate bytes of a sample with its value object, besides the data held by the value.
+SAMPLE_OVERHEAD_BYTES = 512
+
+# Max number of changes logged by a reservoir, earlier changes are merged.
+_MAX_LOGGED_CHANGES = 256
+
+# Samples changed since a version. `step_ranges` is a list of inclusive [start, end] step ranges, and `samples` are
+# all the samples in them, which replace the samples of those steps got before. If the changes since the version are
+# not known, `step_ranges` is None and `samples` are all the samples.
+SamplesDelta = collections.namedtuple('SamplesDelta', ['version', 'step_ranges', 'samples'])
+
+
+def estimate_sample_bytes(sample):
+    """
+    Estimate the number of bytes of a sample.
+
+    Args:
+        sample (Any): The sample, whose value may tell the bytes of its data by `nbytes`.
+
+    Returns:
+        int, the approximate number of bytes.
+    """
+    return SAMPLE_OVERHEAD_BYTES + int(getattr(sample.value, 'nbytes', 0))
+
+
+class _SortedSamples:
+    """
+    Samples sorted by step, stored in blocks to insert and remove samples in O(log n) time.
+
+    Each block keeps at most `2 * _BLOCK_SIZE` samples and the steps of them. A Fenwick tree over the sizes of the
+    blocks locates the block of a position, it is rebuilt when blocks are split or removed, which happens once per
+    `_BLOCK_SIZE` changes at most.
+
+    Args:
+        samples (Iterable): Samples sorted by step.
+    """
+
+    _BLOCK_SIZE = 512
+
+    def __init__(self, samples=()):
+        samples = list(samples)
+        self._blocks = [samples[start:start + self._BLOCK_SIZE]
+                        for start in range(0, len(samples), self._BLOCK_SIZE)]
+        self._steps = [[sample.step for sample in block] for block in self._blocks]
+        self._max_steps = [steps[-1] for steps in self._steps]
+        self._len = len(samples)
+        self._tree = None
 
-def binary_search(samples, target):
-    """Binary search target in samples."""
-    left = 0
-    right = len(samples) - 1
-    while left <= right:
-        mid = (left + right) // 2
-        if target < samples[mid].step:
-            right = mid - 1
-        elif target > samples[mid].step:
-            left = mid + 1
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        for block in self._blocks:
+            yield from block
+
+    def last(self):
+        """Get the sample of the latest step."""
+        return self._blocks[-1][-1]
+
+    def add(self, sample):
+        """Add a sample, it is inserted before the samples of the same step."""
+        step = sample.step
+        if not self._blocks:
+            self._blocks.append([sample])
+            self._steps.append([step])
+            self._max_steps.append(step)
+            self._len = 1
+            self._tree = None
+            return
+
+        if step > self._max_steps[-1]:
+            block_pos = len(self._blocks)
+        else:
+            block_pos = bisect.bisect_left(self._max_steps, step)
+        if block_pos == len(self._blocks):
+            block_pos -= 1
+            self._blocks[block_pos].append(sample)
+            self._steps[block_pos].append(step)
+            self._max_steps[block_pos] = step
         else:
-            return mid
+            index = bisect.bisect_left(self._steps[block_pos], step)
+            self._blocks[block_pos].insert(index, sample)
+            self._steps[block_pos].insert(index, step)
+        self._len += 1
+
+        if len(self._blocks[block_pos]) > 2 * self._BLOCK_SIZE:
+            self._split(block_pos)
+        elif self._tree is not None:
+            self._update_tree(block_pos, 1)
 
-    # if right is -1, it is less than the first one.
-    # if list is [1, 2, 4], target is 3, right will be 1, so wo will insert by 2.
-    return right + 1
+    def pop(self, index=-1):
+        """Remove the sample at given position, and return it."""
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError('pop index out of range')
+
+        if index == self._len - 1:
+            block_pos, index = len(self._blocks) - 1, len(self._blocks[-1]) - 1
+        else:
+            block_pos, index = self._locate(index)
+        block = self._blocks[block_pos]
+        sample = block.pop(index)
+        self._steps[block_pos].pop(index)
+        self._len -= 1
+
+        if not block:
+            del self._blocks[block_pos]
+            del self._steps[block_pos]
+            del self._max_steps[block_pos]
+            self._tree = None
+            return sample
+        self._max_steps[block_pos] = self._steps[block_pos][-1]
+        if self._tree is not None:
+            self._update_tree(block_pos, -1)
+        return sample
+
+    def _split(self, block_pos):
+        """Split the block into two."""
+        block, steps = self._blocks[block_pos], self._steps[block_pos]
+        self._blocks[block_pos:block_pos + 1] = [block[:self._BLOCK_SIZE], block[self._BLOCK_SIZE:]]
+        self._steps[block_pos:block_pos + 1] = [steps[:self._BLOCK_SIZE], steps[self._BLOCK_SIZE:]]
+        self._max_steps[block_pos:block_pos + 1] = [steps[self._BLOCK_SIZE - 1], steps[-1]]
+        self._tree = None
+
+    def _build_tree(self):
+        """Build the Fenwick tree of the sizes of blocks."""
+        tree = [0] + [len(block) for block in self._blocks]
+        for pos in range(1, len(tree)):
+            parent = pos + (pos & -pos)
+            if parent < len(tree):
+                tree[parent] += tree[pos]
+        self._tree = tree
+
+    def _update_tree(self, block_pos, delta):
+        """Update the size of the block in the Fenwick tree."""
+        tree = self._tree
+        pos = block_pos + 1
+        while pos < len(tree):
+            tree[pos] += delta
+            pos += pos & -pos
+
+    def _locate(self, index):
+        """Get the position of the block holding the sample at given index, and the index in the block."""
+        if self._tree is None:
+            self._build_tree()
+        tree = self._tree
+        block_pos = 0
+        bit = 1 << (len(tree) - 1).bit_length()
+        while bit:
+            next_pos = block_pos + bit
+            if next_pos < len(tree) and tree[next_pos] <= index:
+                block_pos = next_pos
+                index -= tree[next_pos]
+            bit >>= 1
+        return block_pos, index
+
+
+class _ChangeLog:
+    """
+    Log of the step ranges of the samples added, evicted or consolidated at each version of a reservoir.
+
+    When the log is full, the two earliest changes are merged into one covering both, so a client may get more
+    samples than changed, but never miss any. Changes which can not be described by step ranges, such as restoring
+    state, reset the log.
+
+    Args:
+        version (int): The version since which changes are logged.
+    """
+
+    def __init__(self, version):
+        self._since_version = version
+        self._changes = collections.deque()
+
+    def reset(self, version):
+        """Forget the changes, and log changes since the version."""
+        self._since_version = version
+        self._changes.clear()
+
+    def add(self, version, start_step, end_step):
+        """
+        Log the change of the samples in the step range at the version.
+
+        Args:
+            version (int): Version of the reservoir after the change.
+            start_step (int): The first step changed.
+            end_step (int): The last step changed.
+        """
+        self._changes.append((version, start_step, end_step))
+        if len(self._changes) > _MAX_LOGGED_CHANGES:
+            _, first_start, first_end = self._changes.popleft()
+            second_version, second_start, second_end = self._changes.popleft()
+            self._changes.appendleft((second_version, min(first_start, second_start), max(first_end, second_end)))
+
+    def get_step_ranges(self, version):
+        """
+        Get the step ranges changed since the version.
+
+        Args:
+            version (int): The version.
+
+        Returns:
+            Union[list[list[int]], None], sorted and disjoint [start, end] step ranges, None if the changes since the
+                version are not logged.
+        """
+        if version < self._since_version:
+            return None
+        step_ranges = []
+        for start, end in sorted((start, end) for change_version, start, end in self._changes
+                                 if change_version > version):
+            if step_ranges and start <= step_ranges[-1][1] + 1:
+                step_ranges[-1][1] = max(step_ranges[-1][1], end)
+            else:
+                step_ranges.append([start, end])
+        return step_ranges
 
 
 class Reservoir:
@@ -64,15 +276,70 @@ class Reservoir:
             raise ParamValueError('size must be nonnegative integer, was %s' % size)
 
         self._samples_max_size = size
-        self._samples = []
+        self._samples = _SortedSamples()
         self._sample_counter = 0
         self._sample_selector = random.Random(0)
         self._mutex = threading.Lock()
+        self._version = next(_VERSIONS)
+        self._change_log = _ChangeLog(self._version)
+        self._nbytes = 0
+
+    @property
+    def version(self):
+        """Get the version of the samples, which changes whenever the samples change."""
+        return self._version
+
+    @property
+    def nbytes(self):
+        """Get the approximate number of bytes of the samples."""
+        return self._nbytes
 
     def samples(self):
         """Return all stored samples."""
         with self._mutex:
-            return list(self._samples)
+            return self._get_samples()
+
+    def _get_samples(self):
+        """Get all the samples, the mutex should be held."""
+        return list(self._samples)
+
+    def samples_since(self, version):
+        """
+        Get the samples changed since the version, so that clients can update the samples got before incrementally.
+
+        Args:
+            version (int): Version of the reservoir when the samples were got before. As versions are unique among
+                all the reservoirs, the least version of several reservoirs got at different time also works.
+
+        Returns:
+            SamplesDelta, the samples changed, and the version of the reservoir.
+        """
+        with self._mutex:
+            samples = self._get_samples()
+            # A version newer than the reservoir is not got from this process, and the changes since it are unknown.
+            step_ranges = self._change_log.get_step_ranges(version) if version <= self._version else None
+            if step_ranges is not None:
+                samples = self._select_steps(samples, step_ranges)
+            return SamplesDelta(self._version, step_ranges, samples)
+
+    @staticmethod
+    def _select_steps(samples, step_ranges):
+        """Select the samples, which are sorted by step, in the step ranges."""
+        steps = [sample.step for sample in samples]
+        selected = []
+        for start, end in step_ranges:
+            selected += samples[bisect.bisect_left(steps, start):bisect.bisect_right(steps, end)]
+        return selected
+
+    def latest_step(self):
+        """
+        Get the step of the latest sample.
+
+        Returns:
+            Union[int, None], the step of the latest sample, None if there is no sample.
+        """
+        with self._mutex:
+            return self._samples.last().step if self._samples else None
 
     def add_sample(self, sample):
         """
@@ -85,28 +352,61 @@ class Reservoir:
             sample (Any): The sample to add to the Reservoir.
         """
         with self._mutex:
+            evicted_sample = None
             if len(self._samples) < self._samples_max_size or self._samples_max_size == 0:
                 self._add_sample(sample)
             else:
                 # Use the Reservoir Sampling algorithm to replace the old sample.
                 rand_int = self._sample_selector.randint(0, self._sample_counter)
                 if rand_int < self._samples_max_size:
-                    self._samples.pop(rand_int)
+                    evicted_sample = self._evict_sample(rand_int)
                 else:
-                    self._samples = self._samples[:-1]
+                    evicted_sample = self._evict_sample(-1)
                 self._add_sample(sample)
             self._sample_counter += 1
+            self._version = next(_VERSIONS)
+            self._change_log.add(self._version, sample.step, sample.step)
+            if evicted_sample is not None:
+                self._change_log.add(self._version, evicted_sample.step, evicted_sample.step)
 
     def _add_sample(self, sample):
         """Search the index and add sample."""
-        if not self._samples or sample.step > self._samples[-1].step:
-            self._samples.append(sample)
-            return
-        index = binary_search(self._samples, sample.step)
-        if index == len(self._samples):
-            self._samples.append(sample)
-        else:
-            self._samples.insert(index, sample)
+        self._samples.add(sample)
+        self._nbytes += estimate_sample_bytes(sample)
+
+    def _evict_sample(self, index):
+        """Remove the sample at given index to make room for a new one, and return it."""
+        sample = self._samples.pop(index)
+        self._nbytes -= estimate_sample_bytes(sample)
+        return sample
+
+    def get_state(self):
+        """
+        Get the state of Reservoir, which can be restored by `restore_state`.
+
+        Returns:
+            dict, the samples, the sample counter and the state of the sample selector.
+        """
+        with self._mutex:
+            return dict(samples=list(self._samples),
+                        sample_counter=self._sample_counter,
+                        selector_state=self._sample_selector.getstate())
+
+    def restore_state(self, state):
+        """
+        Restore the state of Reservoir.
+
+        Args:
+            state (dict): The state got by `get_state`.
+        """
+        version, internal_state, gauss_next = state['selector_state']
+        with self._mutex:
+            self._samples = _SortedSamples(state['samples'])
+            self._nbytes = sum(map(estimate_sample_bytes, self._samples))
+            self._sample_counter = state['sample_counter']
+            self._sample_selector.setstate((version, tuple(internal_state), gauss_next))
+            self._version = next(_VERSIONS)
+            self._change_log.reset(self._version)
 
     def remove_sample(self, filter_fun):
         """
@@ -125,7 +425,8 @@ class Reservoir:
             before_remove_size = len(self._samples)
             if before_remove_size > 0:
                 # remove samples that meet the filter criteria.
-                self._samples = list(filter(filter_fun, self._samples))
+                self._samples = _SortedSamples(filter(filter_fun, self._samples))
+                self._nbytes = sum(map(estimate_sample_bytes, self._samples))
                 after_remove_size = len(self._samples)
                 remove_size = before_remove_size - after_remove_size
 
@@ -135,9 +436,421 @@ class Reservoir:
                         after_remove_size) / before_remove_size
                     self._sample_counter = int(
                         round(self._sample_counter * sample_remaining_rate))
+                    self._version = next(_VERSIONS)
+                    self._change_log.reset(self._version)
+
+        return remove_size
+
+    def evict_samples(self):
+        """
+        Evict every other sample to free memory, the latest sample is kept.
+
+        The size of the reservoir is limited to the number of samples kept, so the later samples replace the kept ones
+        instead of growing the reservoir again, and the samples are not evicted again in every round of loading. The
+        samples are read directly, without calculating anything on them.
+
+        Returns:
+            int, the approximate number of bytes freed.
+        """
+        with self._mutex:
+            before_evict_size = len(self._samples)
+            if before_evict_size < 2:
+                return 0
+            before_nbytes = self._nbytes
+            samples = list(self._samples)
+            first_step, last_step = samples[0].step, samples[-1].step
+            self._samples = _SortedSamples(samples[(before_evict_size - 1) % 2::2])
+            self._nbytes = sum(map(estimate_sample_bytes, self._samples))
+            self._limit_size(len(self._samples))
+            self._sample_counter = int(round(self._sample_counter * len(self._samples) / before_evict_size))
+            self._version = next(_VERSIONS)
+            self._change_log.add(self._version, first_step, last_step)
+            return before_nbytes - self._nbytes
+
+    def _limit_size(self, size):
+        """Limit the size of the reservoir, the mutex should be held."""
+        self._samples_max_size = size
+
+
+class ScalarSamples(collections.abc.Sequence):
+    """
+    Read-only samples of scalar reservoir, which are stored as columns.
+
+    Samples are built as `ScalarSample` when accessed, while the columns can be read directly.
+
+    Args:
+        wall_times (numpy.ndarray): Wall times of the samples.
+        steps (numpy.ndarray): Steps of the samples.
+        values (numpy.ndarray): Values of the samples.
+        filename_ids (numpy.ndarray): Index of the filename of each sample in `filenames`.
+        filenames (list[str]): Filenames of the samples.
+        version (Optional[int]): Version of the reservoir the samples are got from. Default: None.
+    """
+
+    def __init__(self, wall_times, steps, values, filename_ids, filenames, version=None):
+        self._wall_times = wall_times
+        self._steps = steps
+        self._values = values
+        self._filename_ids = filename_ids
+        self._filenames = filenames
+        self._version = version
+
+    @property
+    def version(self):
+        """Get the version of the reservoir the samples are got from, None if unknown."""
+        return self._version
+
+    @property
+    def wall_times(self):
+        """Get wall times of the samples."""
+        return self._wall_times
+
+    @property
+    def steps(self):
+        """Get steps of the samples."""
+        return self._steps
+
+    @property
+    def values(self):
+        """Get values of the samples."""
+        return self._values
+
+    def __len__(self):
+        return len(self._steps)
+
+    def __getitem__(self, index):
+        if isinstance(index, (slice, np.ndarray)):
+            return ScalarSamples(self._wall_times[index], self._steps[index], self._values[index],
+                                 self._filename_ids[index], self._filenames, self._version)
+        return ScalarSample(wall_time=float(self._wall_times[index]),
+                            step=int(self._steps[index]),
+                            value=float(self._values[index]),
+                            filename=self._filenames[self._filename_ids[index]])
+
+    def __iter__(self):
+        for wall_time, step, value, filename_id in zip(self._wall_times.tolist(), self._steps.tolist(),
+                                                       self._values.tolist(), self._filename_ids.tolist()):
+            yield ScalarSample(wall_time=wall_time, step=step, value=value, filename=self._filenames[filename_id])
+
+
+# Points of scalar reservoir, the filename of a point is stored as its index in the filename table.
+_SCALAR_POINT_DTYPE = np.dtype([('wall_time', '<f8'), ('step', '<i8'), ('value', '<f8'), ('filename_id', '<i4')])
+
+
+def _consolidate(points, group_size, keep_first=False):
+    """
+    Consolidate every `group_size` points into the min and the max points of them.
+
+    Args:
+        points (numpy.ndarray): Points sorted by step.
+        group_size (int): Number of points in a group, the last group may be smaller.
+        keep_first (bool): Whether to keep the first point as well. Default: False.
+
+    Returns:
+        numpy.ndarray, the points kept, sorted by step. NaN is taken as the max of its group, so it is not hidden.
+    """
+    group_ids = np.arange(len(points)) // group_size
+    # Sorted by group, then by value, so the first and the last of each group are the min and the max.
+    order = np.lexsort((points['value'], group_ids))
+    starts = np.arange(0, len(points), group_size)
+    ends = np.append(starts[1:], len(points))
+    kept = [order[starts], order[ends - 1]]
+    if keep_first:
+        kept.append([0])
+    return points[np.unique(np.concatenate(kept))]
+
+
+class _ScalarLevel:
+    """
+    Points of a level of scalar reservoir, sorted by step and stored in a growable structured array.
+
+    Points are removed from the front by moving the start of the points, and they are moved back to the beginning
+    of the array when there is no room at the end.
+    """
+
+    _INITIAL_CAPACITY = 64
+
+    def __init__(self):
+        self._points = np.zeros(self._INITIAL_CAPACITY, dtype=_SCALAR_POINT_DTYPE)
+        self._start = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def nbytes(self):
+        """Get the number of bytes of the array."""
+        return self._points.nbytes
+
+    @property
+    def points(self):
+        """Get the points, which is a view of the array."""
+        return self._points[self._start:self._start + self._count]
+
+    def _reserve(self, count):
+        """Make sure there is room for given number of points after the start."""
+        if self._start + count <= len(self._points):
+            return
+        if count <= len(self._points) // 2:
+            self._points[:self._count] = self._points[self._start:self._start + self._count]
+        else:
+            points = np.zeros(max(count, len(self._points) * 2), dtype=_SCALAR_POINT_DTYPE)
+            points[:self._count] = self._points[self._start:self._start + self._count]
+            self._points = points
+        self._start = 0
+
+    def insert(self, point):
+        """Insert a point of (wall_time, step, value, filename_id) by its step."""
+        self._reserve(self._count + 1)
+        end = self._start + self._count
+        step = point[1]
+        if not self._count or step > self._points['step'][end - 1]:
+            index = end
+        else:
+            index = self._start + int(np.searchsorted(self._points['step'][self._start:end], step))
+            self._points[index + 1:end + 1] = self._points[index:end]
+        self._points[index] = point
+        self._count += 1
+
+    def extend(self, points):
+        """Append points, which are later than the points of this level."""
+        self._reserve(self._count + len(points))
+        end = self._start + self._count
+        self._points[end:end + len(points)] = points
+        self._count += len(points)
+
+    def pop_front(self, count):
+        """Remove the earliest points, and return them."""
+        points = self._points[self._start:self._start + count].copy()
+        self._start += count
+        self._count -= count
+        return points
+
+    def replace(self, points):
+        """Replace all the points."""
+        self._start = 0
+        self._count = 0
+        self.extend(points)
+
+
+class ScalarReservoir(Reservoir):
+    """
+    Reservoir for scalars, which keeps the recent points at full resolution and older points at coarser levels.
+
+    Instead of dropping samples randomly, points are kept in levels covering consecutive ranges of steps, from the
+    coarsest level for the earliest steps to the finest level for the latest ones. Level `i` of the first
+    `_LEVEL_COUNT - 1` levels keeps at most `size / 2 ** (i + 1)` points, and the coarsest level keeps the rest.
+    When the reservoir is full, the earliest `_CONSOLIDATION_SIZE` points of the finest level over its quota are
+    consolidated into their min and max points, which are moved to the next level, so spikes are never lost. If no
+    level is over its quota, the coarsest level consolidates every 4 points into 2 instead. The earliest point is
+    always kept.
+
+    Samples are kept as structured numpy arrays of wall time, step, value and filename instead of objects.
+
+    Args:
+        size (int): Container Size. If the size is 0, the container is not limited.
+    """
+
+    _LEVEL_COUNT = 4
+    _CONSOLIDATION_SIZE = 8
+
+    def __init__(self, size):
+        super().__init__(size)
+        self._levels = [_ScalarLevel() for _ in range(self._LEVEL_COUNT)]
+        self._quotas = []
+        self._limit_size(size)
+        self._filenames = []
+        self._filename_ids = {}
+
+    def _limit_size(self, size):
+        """Limit the size of the reservoir, and the quotas of the levels."""
+        self._samples_max_size = size
+        self._quotas = [size >> (level + 1) for level in range(self._LEVEL_COUNT - 1)]
+        self._quotas.append(size - sum(self._quotas))
+
+    @property
+    def nbytes(self):
+        """Get the number of bytes of the arrays of all the levels."""
+        return sum(level.nbytes for level in self._levels)
+
+    def _count(self):
+        """Get the number of points in all the levels."""
+        return sum(map(len, self._levels))
+
+    def _points(self):
+        """Get the points of all the levels, sorted by step."""
+        points = np.concatenate([level.points for level in reversed(self._levels)])
+        if np.any(points['step'][1:] < points['step'][:-1]):
+            # Points of out-of-order steps may be left in coarser levels.
+            points = points[np.argsort(points['step'], kind='stable')]
+        return points
+
+    def _get_samples(self):
+        """Get all the samples as columns, the mutex should be held."""
+        points = self._points()
+        return ScalarSamples(points['wall_time'].copy(),
+                             points['step'].copy(),
+                             points['value'].copy(),
+                             points['filename_id'].copy(),
+                             list(self._filenames),
+                             self._version)
+
+    @staticmethod
+    def _select_steps(samples, step_ranges):
+        """Select the samples in the step ranges, see parent class for details."""
+        starts, ends = np.array(step_ranges, dtype=np.int64).reshape(-1, 2).T
+        # Step ranges are disjoint, so the samples of each range are a slice.
+        slice_starts = np.searchsorted(samples.steps, starts)
+        slice_ends = np.searchsorted(samples.steps, ends, side='right')
+        positions = [np.arange(start, end) for start, end in zip(slice_starts, slice_ends)]
+        return samples[np.concatenate(positions) if positions else np.arange(0)]
+
+    def latest_step(self):
+        """See parent class for details."""
+        with self._mutex:
+            steps = [int(level.points['step'][-1]) for level in self._levels if len(level)]
+            return max(steps) if steps else None
+
+    def add_sample(self, sample):
+        """
+        Adds sample, and consolidates earlier points if the reservoir is full.
 
+        Args:
+            sample (Any): The sample with `wall_time`, `step`, `value` and `filename`.
+        """
+        with self._mutex:
+            self._add_sample(sample)
+            changed_ranges = [(sample.step, sample.step)]
+            if self._samples_max_size:
+                while self._count() > self._samples_max_size:
+                    changed_ranges.append(self._consolidate_levels())
+            self._sample_counter += 1
+            self._version = next(_VERSIONS)
+            for start_step, end_step in changed_ranges:
+                self._change_log.add(self._version, start_step, end_step)
+
+    def _add_sample(self, sample):
+        """Add sample to the finest level."""
+        filename_id = self._filename_ids.get(sample.filename)
+        if filename_id is None:
+            filename_id = len(self._filenames)
+            self._filenames.append(sample.filename)
+            self._filename_ids[sample.filename] = filename_id
+        self._levels[0].insert((sample.wall_time, sample.step, sample.value, filename_id))
+
+    def _consolidate_levels(self):
+        """
+        Consolidate points of a level to reduce the number of points.
+
+        Returns:
+            tuple[int, int], the first and the last step of the points changed.
+        """
+        for index, level in enumerate(self._levels[:-1]):
+            if len(level) > self._quotas[index] and len(level) >= self._CONSOLIDATION_SIZE:
+                points = level.pop_front(self._CONSOLIDATION_SIZE)
+                # The earliest point is kept, so the curve still starts from the first step.
+                is_earliest = not any(len(coarser_level) for coarser_level in self._levels[index + 1:])
+                self._move_to_level(index + 1, _consolidate(points, self._CONSOLIDATION_SIZE, is_earliest))
+                return int(points['step'][0]), int(points['step'][-1])
+
+        coarsest_level = self._levels[-1]
+        if len(coarsest_level) > 4:
+            points = coarsest_level.points
+            changed_range = int(points['step'][0]), int(points['step'][-1])
+            coarsest_level.replace(_consolidate(points, 4, keep_first=True))
+            return changed_range
+        # The reservoir is too small to consolidate, so the earliest point is dropped.
+        earliest_level = next(level for level in reversed(self._levels) if len(level))
+        step = int(earliest_level.pop_front(1)['step'][0])
+        return step, step
+
+    def _move_to_level(self, index, points):
+        """Move consolidated points, which are later than the points of the level, to the level."""
+        level = self._levels[index]
+        if len(level) and points['step'][0] < level.points['step'][-1]:
+            level.replace(np.sort(np.concatenate((level.points, points)), order='step', kind='stable'))
+        else:
+            level.extend(points)
+
+    def get_state(self):
+        """Gets state, see parent class for details."""
+        state = super().get_state()
+        with self._mutex:
+            points = np.concatenate([level.points for level in reversed(self._levels)])
+            level_sizes = [len(level) for level in reversed(self._levels)]
+            filenames = list(self._filenames)
+        state['samples'] = list(ScalarSamples(points['wall_time'], points['step'], points['value'],
+                                              points['filename_id'], filenames))
+        state['level_sizes'] = level_sizes
+        return state
+
+    def restore_state(self, state):
+        """Restores state, see parent class for details."""
+        samples = state['samples']
+        level_sizes = state.get('level_sizes')
+        if level_sizes is None or len(level_sizes) != self._LEVEL_COUNT or sum(level_sizes) != len(samples):
+            # All the samples are taken as the latest ones, and they will be consolidated when samples are added.
+            level_sizes = [0] * (self._LEVEL_COUNT - 1) + [len(samples)]
+        super().restore_state(dict(state, samples=[]))
+        with self._mutex:
+            self._levels = [_ScalarLevel() for _ in range(self._LEVEL_COUNT)]
+            self._filenames = []
+            self._filename_ids = {}
+            start = 0
+            for level, level_size in zip(reversed(self._levels), level_sizes):
+                for sample in samples[start:start + level_size]:
+                    filename_id = self._filename_ids.setdefault(sample.filename, len(self._filenames))
+                    if filename_id == len(self._filenames):
+                        self._filenames.append(sample.filename)
+                    level.insert((sample.wall_time, sample.step, sample.value, filename_id))
+                start += level_size
+            self._version = next(_VERSIONS)
+            self._change_log.reset(self._version)
+
+    def remove_sample(self, filter_fun):
+        """Removes samples, see parent class for details."""
+        with self._mutex:
+            before_remove_size = self._count()
+            if not before_remove_size:
+                return 0
+            for level in self._levels:
+                points = level.points
+                samples = ScalarSamples(points['wall_time'], points['step'], points['value'], points['filename_id'],
+                                        self._filenames)
+                kept = np.array([bool(filter_fun(sample)) for sample in samples], dtype=bool)
+                if not kept.all():
+                    level.replace(points[kept])
+            after_remove_size = self._count()
+            remove_size = before_remove_size - after_remove_size
+            if remove_size > 0:
+                self._version = next(_VERSIONS)
+                self._change_log.reset(self._version)
+                # update _sample_counter when samples has been removed.
+                self._sample_counter = int(round(self._sample_counter * float(after_remove_size) / before_remove_size))
         return remove_size
 
+    def evict_samples(self):
+        """Evicts every other point of each level, the latest point of each level is kept, see parent class."""
+        with self._mutex:
+            before_evict_size = self._count()
+            if before_evict_size < 2:
+                return 0
+            before_nbytes = self.nbytes
+            steps = self._points()['step']
+            levels = []
+            for level in self._levels:
+                # New levels are created, as the arrays of the levels do not shrink.
+                evicted_level = _ScalarLevel()
+                evicted_level.extend(level.points[(len(level) - 1) % 2::2] if len(level) > 1 else level.points)
+                levels.append(evicted_level)
+            self._levels = levels
+            self._limit_size(self._count())
+            self._sample_counter = int(round(self._sample_counter * self._count() / before_evict_size))
+            self._version = next(_VERSIONS)
+            self._change_log.add(self._version, int(steps[0]), int(steps[-1]))
+            return before_nbytes - self.nbytes
+
 
 class _VisualRange:
     """Simple helper class to merge visual ranges."""
@@ -182,55 +895,117 @@ class HistogramReservoir(Reservoir):
     """
     Reservoir for histogram, which needs updating range over all steps.
 
+    The ranges of the samples added are merged into the visual range when samples are got, as the statistics of
+    tensors are calculated on first access. The visual range is only recalculated over all samples when a sample on
+    its boundary is removed. Histograms are only re-sampled when their visual range changes.
+
     Args:
         size (int): Container Size. If the size is 0, the container is not limited.
     """
     def __init__(self, size):
         super().__init__(size)
-        # Marker to avoid redundant calc for unchanged histograms.
-        self._visual_range_up_to_date = False
+        self._visual_range = _VisualRange()
+        self._max_count = 0
+        # Samples added after the visual range is calculated, by id.
+        self._unmerged_samples = {}
+        # Marker to recalculate visual range over all samples.
+        self._visual_range_up_to_date = True
+        # Version of the samples whose visual range has been set.
+        self._visual_range_version = None
+        # The (max, min, bins) set to the histograms.
+        self._applied_visual_range = None
 
-    def add_sample(self, sample):
+    def _add_sample(self, sample):
         """Adds sample, see parent class for details."""
-        super().add_sample(sample)
-        self._visual_range_up_to_date = False
+        super()._add_sample(sample)
+        if self._visual_range_up_to_date:
+            self._unmerged_samples[id(sample)] = sample
 
-    def samples(self):
-        """Return all stored samples."""
+    def _evict_sample(self, index):
+        """Removes sample and checks whether the visual range shrinks, see parent class for details."""
+        sample = super()._evict_sample(index)
+        if not self._visual_range_up_to_date or self._unmerged_samples.pop(id(sample), None) is not None:
+            return sample
+        histogram_container = sample.value
+        if histogram_container.count and (histogram_container.count >= self._max_count
+                                          or histogram_container.max >= self._visual_range.max
+                                          or histogram_container.min <= self._visual_range.min):
+            self._visual_range_up_to_date = False
+            self._unmerged_samples = {}
+        return sample
+
+    def restore_state(self, state):
+        """Restores state, see parent class for details."""
+        super().restore_state(state)
         with self._mutex:
-            if self._visual_range_up_to_date:
-                return list(self._samples)
-
-            # calc visual range
-            visual_range = _VisualRange()
-            max_count = 0
-            for sample in self._samples:
-                histogram_container = sample.value
-                if histogram_container.count == 0:
-                    # ignore empty tensor
-                    continue
-                max_count = max(histogram_container.count, max_count)
-                visual_range.update(histogram_container.max, histogram_container.min)
-
-            if visual_range.max == visual_range.min and not max_count:
-                logger.debug("Max equals to min. Count is zero.")
-
-            bins = calc_histogram_bins(max_count)
-
-            # update visual range
-            logger.debug(
-                "Visual histogram: min %s, max %s, bins %s, max_count %s.",
-                visual_range.min,
-                visual_range.max,
-                bins,
-                max_count)
-            for sample in self._samples:
-                histogram = sample.value.histogram
-                histogram.set_visual_range(visual_range.max, visual_range.min, bins)
+            self._visual_range_up_to_date = False
+            self._unmerged_samples = {}
 
-            self._visual_range_up_to_date = True
+    def remove_sample(self, filter_fun):
+        """Removes samples, see parent class for details."""
+        remove_size = super().remove_sample(filter_fun)
+        if remove_size:
+            with self._mutex:
+                self._visual_range_up_to_date = False
+                self._unmerged_samples = {}
+        return remove_size
+
+    def evict_samples(self):
+        """Evicts samples, see parent class for details."""
+        freed_bytes = super().evict_samples()
+        if freed_bytes:
+            with self._mutex:
+                self._visual_range_up_to_date = False
+                self._unmerged_samples = {}
+        return freed_bytes
+
+    def _merge_visual_range(self, samples):
+        """Merges the ranges of given samples into visual range."""
+        for sample in samples:
+            histogram_container = sample.value
+            if histogram_container.count == 0:
+                # ignore empty tensor
+                continue
+            self._max_count = max(histogram_container.count, self._max_count)
+            self._visual_range.update(histogram_container.max, histogram_container.min)
+
+    def _get_samples(self):
+        """Get all the samples with the visual range set, the mutex should be held."""
+        if self._visual_range_version == self._version:
             return list(self._samples)
 
+        if not self._visual_range_up_to_date:
+            self._visual_range = _VisualRange()
+            self._max_count = 0
+            self._merge_visual_range(self._samples)
+            self._visual_range_up_to_date = True
+        else:
+            self._merge_visual_range(self._unmerged_samples.values())
+        self._unmerged_samples = {}
+        visual_range = self._visual_range
+        if visual_range.max == visual_range.min and not self._max_count:
+            logger.debug("Max equals to min. Count is zero.")
+
+        bins = calc_histogram_bins(self._max_count)
+
+        # update visual range
+        logger.debug(
+            "Visual histogram: min %s, max %s, bins %s, max_count %s.",
+            visual_range.min,
+            visual_range.max,
+            bins,
+            self._max_count)
+        for sample in self._samples:
+            histogram = sample.value.histogram
+            histogram.set_visual_range(visual_range.max, visual_range.min, bins)
+
+        if (visual_range.max, visual_range.min, bins) != self._applied_visual_range:
+            # All the histograms are re-sampled.
+            self._applied_visual_range = (visual_range.max, visual_range.min, bins)
+            self._change_log.reset(self._version)
+        self._visual_range_version = self._version
+        return list(self._samples)
+
 
 class ReservoirFactory:
     """Factory class to get reservoir instances."""
@@ -247,4 +1022,6 @@ class ReservoirFactory:
         """
         if plugin_name in (PluginNameEnum.HISTOGRAM.value, PluginNameEnum.TENSOR.value):
             return HistogramReservoir(size)
+        if plugin_name == PluginNameEnum.SCALAR.value:
+            return ScalarReservoir(size)
         return Reservoir(size)
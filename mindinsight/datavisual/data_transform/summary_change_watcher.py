@@ -0,0 +1,295 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""
+Summary change watcher module.
+
+Changes of the summary base directory and its direct subdirectories are watched through Linux inotify, so that only
+the train jobs changed are reloaded, instead of walking the whole summary base directory every reload interval.
+"""
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+from mindinsight.datavisual.common.log import logger
+
+# Flags of inotify, see inotify(7).
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+_WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_ONLYDIR
+_BASE_DIR_WATCH_MASK = _WATCH_MASK | IN_DELETE_SELF | IN_MOVE_SELF
+_EVENT_HEADER = struct.Struct('iIII')
+_READ_SIZE = 64 * 1024
+
+# File systems on which changes made by other hosts are not notified.
+_UNSUPPORTED_FS_TYPES = {'nfs', 'nfs4', 'cifs', 'smbfs', 'smb3', '9p', 'afs', 'ceph', 'glusterfs', 'lustre', 'gpfs'}
+
+# Events arrived within this time after the first one are handled together.
+DEBOUNCE_TIME = 0.5
+# Changes not notified, such as those in profiler directories, are picked up by a full reload at this interval.
+FULL_RELOAD_INTERVAL = 600
+
+
+def _get_fs_type(path):
+    """
+    Get the type of the file system where the path is mounted.
+
+    Args:
+        path (str): Path.
+
+    Returns:
+        str, the type of file system, empty if it can not be found.
+    """
+    path = os.path.realpath(path)
+    fs_type = ''
+    mount_point_len = -1
+    try:
+        with open('/proc/mounts', 'r') as mounts_file:
+            for line in mounts_file:
+                fields = line.split()
+                if len(fields) < 3:
+                    continue
+                mount_point = fields[1]
+                is_mounted = path == mount_point or path.startswith(mount_point.rstrip('/') + '/')
+                if is_mounted and len(mount_point) > mount_point_len:
+                    fs_type, mount_point_len = fields[2], len(mount_point)
+    except OSError:
+        return ''
+    return fs_type
+
+
+class SummaryChangeWatcher:
+    """
+    Watch changes of the train jobs in summary base directory through inotify.
+
+    The summary base directory and its direct subdirectories are watched. Events are translated to the train ids
+    of the changed directories, e.g. './' for the summary base directory and './log1' for its subdirectory.
+
+    Args:
+        summary_base_dir (str): Summary base directory.
+    """
+
+    def __init__(self, summary_base_dir):
+        self._summary_base_dir = os.path.realpath(summary_base_dir)
+        self._inotify_fd = -1
+        self._libc = None
+        self._train_id_by_wd = {}
+        self._base_wd = -1
+        self._wake_fds = None
+        self._notified_train_ids = set()
+        self._notified_mutex = threading.Lock()
+        self._latest_full_reload = time.time()
+
+    @staticmethod
+    def is_supported(summary_base_dir):
+        """
+        Check whether changes of summary base directory can be watched.
+
+        Args:
+            summary_base_dir (str): Summary base directory.
+
+        Returns:
+            bool, True if inotify is available and the file system is local.
+        """
+        if not sys.platform.startswith('linux'):
+            return False
+        fs_type = _get_fs_type(summary_base_dir)
+        if fs_type in _UNSUPPORTED_FS_TYPES or fs_type.startswith('fuse'):
+            logger.info("Changes on file system %s are not watched, summary base dir: %s.",
+                        fs_type, summary_base_dir)
+            return False
+        return True
+
+    @property
+    def started(self):
+        """Whether the watcher is started."""
+        return self._inotify_fd >= 0
+
+    def start(self):
+        """
+        Start watching summary base directory and its direct subdirectories.
+
+        Returns:
+            bool, True if the watcher is started, else changes should be found by polling.
+        """
+        if not self.is_supported(self._summary_base_dir):
+            return False
+        try:
+            self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+            self._inotify_fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if self._inotify_fd < 0:
+                raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+            self._base_wd = self._add_watch(self._summary_base_dir, './', _BASE_DIR_WATCH_MASK)
+            for entry in os.scandir(self._summary_base_dir):
+                if entry.is_dir() and not entry.is_symlink():
+                    self._add_watch(entry.path, os.path.join('.', entry.name), _WATCH_MASK)
+            self._wake_fds = os.pipe()
+            for wake_fd in self._wake_fds:
+                os.set_blocking(wake_fd, False)
+        except (OSError, AttributeError) as ex:
+            # AttributeError is raised if inotify functions are not found in libc.
+            logger.warning("Watch summary base dir failed, changes will be found by polling. Detail: %s.", str(ex))
+            self.close()
+            return False
+        logger.info("Start watching %d directories in summary base dir.", len(self._train_id_by_wd))
+        return True
+
+    def close(self):
+        """Stop watching."""
+        if self._inotify_fd >= 0:
+            os.close(self._inotify_fd)
+            self._inotify_fd = -1
+        if self._wake_fds is not None:
+            for wake_fd in self._wake_fds:
+                os.close(wake_fd)
+            self._wake_fds = None
+        self._train_id_by_wd = {}
+
+    def _add_watch(self, path, train_id, mask):
+        """Add watch of the directory, and get the watch descriptor."""
+        watch_descriptor = self._libc.inotify_add_watch(self._inotify_fd, os.fsencode(path), mask)
+        if watch_descriptor < 0:
+            error_no = ctypes.get_errno()
+            raise OSError(error_no, '{}: {}'.format(os.strerror(error_no), path))
+        self._train_id_by_wd[watch_descriptor] = train_id
+        return watch_descriptor
+
+    def notify(self, train_id):
+        """
+        Notify the train job changed, e.g. when it is requested to be cached, to wake up the waiting thread.
+
+        Args:
+            train_id (str): Train ID.
+        """
+        with self._notified_mutex:
+            self._notified_train_ids.add(train_id)
+            if self._wake_fds is None:
+                return
+            try:
+                os.write(self._wake_fds[1], b'\0')
+            except BlockingIOError:
+                # The waiting thread has not read the pipe yet, so it will be woken up anyway.
+                pass
+
+    def wait_changes(self):
+        """
+        Wait until any train job is changed.
+
+        Returns:
+            Union[set[str], None], train ids of the changed train jobs, or None if all the train jobs should be
+                reloaded, e.g. when events are lost or it is time to do a full reload.
+        """
+        changed_train_ids = set()
+        deadline = None
+        while True:
+            now = time.time()
+            full_reload_time = self._latest_full_reload + FULL_RELOAD_INTERVAL
+            if deadline is None and now >= full_reload_time:
+                self._latest_full_reload = now
+                return None
+            timeout = (full_reload_time if deadline is None else deadline) - now
+            if deadline is not None and timeout <= 0:
+                return changed_train_ids
+
+            readable, _, _ = select.select([self._inotify_fd, self._wake_fds[0]], [], [], max(timeout, 0))
+            if self._wake_fds[0] in readable:
+                try:
+                    os.read(self._wake_fds[0], _READ_SIZE)
+                except BlockingIOError:
+                    pass
+                with self._notified_mutex:
+                    changed_train_ids.update(self._notified_train_ids)
+                    self._notified_train_ids.clear()
+            if self._inotify_fd in readable and not self._read_events(changed_train_ids):
+                self._latest_full_reload = time.time()
+                return None
+            if changed_train_ids and deadline is None:
+                deadline = time.time() + DEBOUNCE_TIME
+
+    def _read_events(self, changed_train_ids):
+        """
+        Read inotify events, and add the train ids changed.
+
+        Args:
+            changed_train_ids (set[str]): Train ids of the changed train jobs.
+
+        Returns:
+            bool, False if events may be lost.
+        """
+        try:
+            buffer = os.read(self._inotify_fd, _READ_SIZE)
+        except OSError as ex:
+            if ex.errno == errno.EAGAIN:
+                return True
+            raise
+
+        offset = 0
+        events_lost = False
+        while offset + _EVENT_HEADER.size <= len(buffer):
+            watch_descriptor, mask, _, name_len = _EVENT_HEADER.unpack_from(buffer, offset)
+            name = buffer[offset + _EVENT_HEADER.size:offset + _EVENT_HEADER.size + name_len].rstrip(b'\0')
+            offset += _EVENT_HEADER.size + name_len
+            if mask & IN_Q_OVERFLOW:
+                logger.info("Inotify event queue overflowed.")
+                events_lost = True
+                continue
+            train_id = self._train_id_by_wd.get(watch_descriptor)
+            if train_id is None:
+                continue
+            if mask & IN_IGNORED:
+                self._train_id_by_wd.pop(watch_descriptor)
+                if watch_descriptor == self._base_wd:
+                    events_lost = True
+                continue
+            if watch_descriptor == self._base_wd and mask & IN_ISDIR:
+                train_id = self._handle_subdir_event(os.fsdecode(name), mask)
+            elif watch_descriptor == self._base_wd and mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                events_lost = True
+            changed_train_ids.add(train_id)
+        return not events_lost
+
+    def _handle_subdir_event(self, name, mask):
+        """Watch the subdirectory created in summary base directory, and get its train id."""
+        train_id = os.path.join('.', name)
+        if mask & (IN_CREATE | IN_MOVED_TO):
+            try:
+                self._add_watch(os.path.join(self._summary_base_dir, name), train_id, _WATCH_MASK)
+            except OSError as ex:
+                logger.warning("Watch directory %s failed, detail: %s.", name, str(ex))
+        elif mask & IN_MOVED_FROM:
+            # The directory moved out is still watched, and its events should not be taken as the train job's.
+            for watch_descriptor, watched_train_id in list(self._train_id_by_wd.items()):
+                if watched_train_id == train_id and watch_descriptor != self._base_wd:
+                    self._libc.inotify_rm_watch(self._inotify_fd, watch_descriptor)
+                    self._train_id_by_wd.pop(watch_descriptor)
+        return train_id
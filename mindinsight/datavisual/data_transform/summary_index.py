@@ -0,0 +1,344 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""
+Persistent index of the records in summary files.
+
+The index of a summary file is stored in the workspace, not in the summary directory, as two files:
+
+- `<key>.entries`, fixed size binary entries of (offset, length, step, tag id), one entry for each tensor event
+  parsed from a record. Entries are only appended.
+- `<key>.meta`, a JSON document with the size, mtime and fingerprint of the summary file, the offset up to which
+  all records are indexed, the number of valid entries and the tag table. It is replaced atomically after entries
+  are appended, so entries beyond the recorded number are ignored.
+
+Indexes of summary files which no longer exist are removed, and so are the least recently used ones beyond
+`MAX_INDEX_COUNT`, when the index of a new summary file is saved.
+"""
+import collections
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+
+from mindinsight.conf import settings
+from mindinsight.datavisual.common.enums import PluginNameEnum
+from mindinsight.datavisual.common.log import logger
+from mindinsight.datavisual.data_access.file_handler import FileHandler
+from mindinsight.utils.exceptions import MindInsightException
+
+# Max count of the summary files indexed in the workspace, the indexes least recently used are removed.
+MAX_INDEX_COUNT = 1000
+_INDEX_VERSION = 1
+_FINGERPRINT_SIZE = 4096
+_ENTRY_DTYPE = np.dtype([('offset', '<u8'), ('length', '<u8'), ('step', '<i8'), ('tag_id', '<u4')])
+
+
+def get_index_dir():
+    """Get the directory to store summary indexes."""
+    return os.path.join(settings.WORKSPACE, 'cache', 'summary_index')
+
+
+def calc_fingerprint(file_path, end_offset):
+    """
+    Calculate fingerprint of the indexed content of summary file.
+
+    The head and the tail of the indexed content are hashed, so a file replaced by another one or rewritten
+    will be detected.
+
+    Args:
+        file_path (str): Summary file path.
+        end_offset (int): The offset up to which records are indexed.
+
+    Returns:
+        str, the fingerprint.
+    """
+    file_system = FileHandler.get_file_system(file_path)
+    head_size = min(end_offset, _FINGERPRINT_SIZE)
+    tail_offset = max(end_offset - _FINGERPRINT_SIZE, 0)
+    sha256 = hashlib.sha256()
+    sha256.update(file_system.read(file_path, True, head_size, 0))
+    sha256.update(file_system.read(file_path, True, end_offset - tail_offset, tail_offset))
+    return sha256.hexdigest()
+
+
+def remove_old_indexes():
+    """Remove the indexes of summary files which no longer exist, and the least recently used ones beyond the max."""
+    index_dir = get_index_dir()
+    try:
+        filenames = os.listdir(index_dir)
+    except OSError as ex:
+        logger.debug("List summary indexes failed, detail: %s.", str(ex))
+        return
+    paths_by_key = collections.defaultdict(list)
+    for filename in filenames:
+        paths_by_key[filename.split('.', 1)[0]].append(os.path.join(index_dir, filename))
+
+    access_times = {}
+    removed_keys = []
+    for key, paths in paths_by_key.items():
+        meta_path = os.path.join(index_dir, key + '.meta')
+        try:
+            access_times[key] = max(map(os.path.getmtime, paths))
+            if meta_path in paths:
+                with open(meta_path, 'r') as meta_file:
+                    file_path = json.load(meta_file)['file_path']
+                if not os.path.exists(file_path):
+                    removed_keys.append(key)
+        except (OSError, ValueError, TypeError, KeyError) as ex:
+            # The files may be replaced or removed by other loaders at the same time.
+            logger.debug("Check summary index failed, detail: %s, key: %s.", str(ex), key)
+    kept_keys = sorted(set(access_times) - set(removed_keys), key=access_times.get)
+    removed_keys.extend(kept_keys[:-MAX_INDEX_COUNT])
+
+    for key in removed_keys:
+        for path in paths_by_key[key]:
+            try:
+                os.remove(path)
+            except OSError as ex:
+                logger.debug("Remove summary index failed, detail: %s, path: %s.", str(ex), path)
+    if removed_keys:
+        logger.info("Remove %d old summary indexes.", len(removed_keys))
+
+
+class SummaryIndex:
+    """
+    Index of the records in a summary file.
+
+    Records are indexed after being parsed. Batches of records may be parsed out of order, so `end_offset` only
+    advances when all records before it are indexed, and only entries before `end_offset` are saved.
+
+    Args:
+        file_path (str): Summary file path.
+    """
+
+    def __init__(self, file_path):
+        self._file_path = os.path.realpath(file_path)
+        key = hashlib.sha256(self._file_path.encode('utf-8')).hexdigest()
+        self._meta_path = os.path.join(get_index_dir(), key + '.meta')
+        self._entries_path = os.path.join(get_index_dir(), key + '.entries')
+        self._lock = threading.Lock()
+
+        self._tags = []
+        self._tag_ids = {}
+        self._saved_count = 0
+        self._end_offset = 0
+        self._done_ranges = {}
+        self._pending_entries = []
+        self._dirty = False
+
+    @property
+    def end_offset(self):
+        """Get the offset up to which all records are indexed."""
+        return self._end_offset
+
+    @property
+    def meta_path(self):
+        """Get the path of meta file."""
+        return self._meta_path
+
+    @classmethod
+    def load(cls, file_path):
+        """
+        Load index of given summary file from workspace.
+
+        If the index does not exist or does not match the summary file, an empty index is returned.
+
+        Args:
+            file_path (str): Summary file path.
+
+        Returns:
+            SummaryIndex, the index of summary file.
+        """
+        summary_index = cls(file_path)
+        try:
+            with open(summary_index.meta_path, 'r') as meta_file:
+                meta = json.load(meta_file)
+        except FileNotFoundError:
+            return summary_index
+        except (OSError, ValueError) as ex:
+            logger.warning("Load summary index failed, detail: %s, file path: %s.", str(ex), file_path)
+            return summary_index
+
+        if not summary_index.restore(meta):
+            logger.info("Summary index is out of date and will be rebuilt, file path: %s.", file_path)
+            summary_index.invalidate()
+            return summary_index
+        try:
+            # The modification time is updated to keep the recently used indexes.
+            os.utime(summary_index.meta_path)
+        except OSError as ex:
+            logger.debug("Update summary index time failed, detail: %s, file path: %s.", str(ex), file_path)
+        return summary_index
+
+    def restore(self, meta):
+        """
+        Restore index from meta, after checking it matches the summary file.
+
+        Args:
+            meta (dict): Meta of the index.
+
+        Returns:
+            bool, True if the index is valid.
+        """
+        try:
+            if meta.get('version') != _INDEX_VERSION or meta.get('file_path') != self._file_path:
+                return False
+            end_offset = meta['end_offset']
+            if FileHandler.file_stat(self._file_path).size < end_offset:
+                # The summary file has been truncated.
+                return False
+            if calc_fingerprint(self._file_path, end_offset) != meta['fingerprint']:
+                return False
+            if os.path.getsize(self._entries_path) < meta['entry_count'] * _ENTRY_DTYPE.itemsize:
+                return False
+            tags = [tuple(tag) for tag in meta['tags']]
+        except (KeyError, TypeError, ValueError, OSError, MindInsightException) as ex:
+            logger.debug("Check summary index failed, detail: %s.", str(ex))
+            return False
+
+        self._tags = tags
+        self._tag_ids = {tag: tag_id for tag_id, tag in enumerate(tags)}
+        self._saved_count = meta['entry_count']
+        self._end_offset = end_offset
+        return True
+
+    def invalidate(self):
+        """Drop all the records indexed and remove the index files."""
+        with self._lock:
+            self._tags = []
+            self._tag_ids = {}
+            self._saved_count = 0
+            self._end_offset = 0
+            self._done_ranges = {}
+            self._pending_entries = []
+            self._dirty = False
+        for path in (self._meta_path, self._entries_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as ex:
+                logger.warning("Remove summary index failed, detail: %s, path: %s.", str(ex), path)
+
+    def add_batch(self, start_offset, end_offset, entries):
+        """
+        Add entries of the records in [start_offset, end_offset).
+
+        Args:
+            start_offset (int): Start offset of the first record in the batch.
+            end_offset (int): End offset of the last record in the batch.
+            entries (Iterable[tuple]): Entries of (offset, length, step, tag, plugin_name).
+        """
+        with self._lock:
+            for offset, length, step, tag, plugin_name in entries:
+                tag_id = self._tag_ids.get((tag, plugin_name))
+                if tag_id is None:
+                    tag_id = len(self._tags)
+                    self._tags.append((tag, plugin_name))
+                    self._tag_ids[(tag, plugin_name)] = tag_id
+                self._pending_entries.append((offset, length, step, tag_id))
+
+            self._done_ranges[start_offset] = end_offset
+            while self._end_offset in self._done_ranges:
+                self._end_offset = self._done_ranges.pop(self._end_offset)
+            self._dirty = True
+
+    def select_records(self, get_reservoir_size):
+        """
+        Select records to load to fill the reservoirs.
+
+        For each tag, as many records as the reservoir keeps are selected. Like reservoir sampling, they are spread
+        over the whole file, and the latest record of the tag is always selected. All the records of scalars are
+        selected, as the scalar reservoir keeps the recent steps and the spikes of the earlier ones, which are lost
+        between records selected evenly, and scalar records are small.
+
+        Args:
+            get_reservoir_size (Callable[[str], int]): Get reservoir size by plugin name, 0 for unlimited.
+
+        Returns:
+            list[tuple[int, int]], (offset, length) of the selected records, sorted by offset.
+        """
+        with self._lock:
+            tags = list(self._tags)
+            count = self._saved_count
+        if not count:
+            return []
+
+        entries = np.fromfile(self._entries_path, dtype=_ENTRY_DTYPE, count=count)
+        entries = entries[np.lexsort((entries['offset'], entries['tag_id']))]
+        tag_starts = np.concatenate(([0], np.flatnonzero(np.diff(entries['tag_id'])) + 1))
+        tag_ends = np.append(tag_starts[1:], len(entries))
+        positions = []
+        for tag_start, tag_end in zip(tag_starts, tag_ends):
+            _, plugin_name = tags[entries['tag_id'][tag_start]]
+            size = get_reservoir_size(plugin_name)
+            if size and tag_end - tag_start > size and plugin_name != PluginNameEnum.SCALAR.value:
+                positions.append(np.linspace(tag_start, tag_end - 1, size).round().astype(np.int64))
+            else:
+                positions.append(np.arange(tag_start, tag_end))
+
+        selected = entries[np.concatenate(positions)]
+        # Records holding several tags may be selected more than once.
+        offsets, first_positions = np.unique(selected['offset'], return_index=True)
+        lengths = selected['length'][first_positions]
+        return list(zip(offsets.tolist(), lengths.tolist()))
+
+    def save(self):
+        """Save the entries before `end_offset` to workspace."""
+        with self._lock:
+            if not self._dirty:
+                return
+            end_offset = self._end_offset
+            saved_entries = [entry for entry in self._pending_entries if entry[0] < end_offset]
+            self._pending_entries = [entry for entry in self._pending_entries if entry[0] >= end_offset]
+            tags = list(self._tags)
+            self._dirty = False
+
+        is_new_index = not self._saved_count
+        try:
+            os.makedirs(get_index_dir(), exist_ok=True)
+            with open(self._entries_path, 'ab') as entries_file:
+                # Drop entries written by an interrupted save.
+                entries_file.truncate(self._saved_count * _ENTRY_DTYPE.itemsize)
+                np.array(saved_entries, dtype=_ENTRY_DTYPE).tofile(entries_file)
+
+            stat = FileHandler.file_stat(self._file_path)
+            meta = dict(version=_INDEX_VERSION,
+                        file_path=self._file_path,
+                        size=stat.size,
+                        mtime=stat.mtime,
+                        end_offset=end_offset,
+                        fingerprint=calc_fingerprint(self._file_path, end_offset),
+                        entry_count=self._saved_count + len(saved_entries),
+                        tags=tags)
+            tmp_meta_path = self._meta_path + '.tmp'
+            with open(tmp_meta_path, 'w') as meta_file:
+                json.dump(meta, meta_file)
+            os.replace(tmp_meta_path, self._meta_path)
+        except (OSError, MindInsightException) as ex:
+            logger.warning("Save summary index failed, detail: %s, file path: %s.", str(ex), self._file_path)
+            with self._lock:
+                # Keep the entries to save them next time.
+                self._pending_entries = saved_entries + self._pending_entries
+                self._dirty = True
+            return
+
+        self._saved_count += len(saved_entries)
+        logger.debug("Save summary index, %d entries, end offset %d, file path: %s.",
+                     self._saved_count, end_offset, self._file_path)
+        if is_new_index:
+            remove_old_indexes()
@@ -113,6 +113,40 @@ class SummaryWatcher:
 
         return directories
 
+    def get_summary_directory(self, summary_base_dir, relative_path):
+        """
+        Get info of the given summary directory, without walking the whole summary base directory.
+
+        Args:
+            summary_base_dir (str): Path of summary base directory.
+            relative_path (str): Relative path of summary directory, referring to summary base directory,
+                                starting with "./" .
+
+        Returns:
+            Union[dict, None], summary directory info with the same attributes as the ones listed by
+                `list_summary_directories`, or None if it is not a summary directory.
+        """
+        if contains_null_byte(summary_base_dir=summary_base_dir, relative_path=relative_path):
+            return None
+        if not self._is_valid_summary_directory(summary_base_dir, relative_path):
+            return None
+
+        summary_dict = {}
+        if os.path.normpath(relative_path) == '.':
+            relative_path = os.path.join('.', '')
+            for entry in os.scandir(summary_base_dir):
+                if entry.is_file() and not entry.is_symlink():
+                    self._update_summary_dict(summary_dict, summary_base_dir, relative_path, entry, False)
+        else:
+            entry_name = os.path.basename(os.path.normpath(relative_path))
+            relative_path = os.path.join('.', entry_name)
+            entry_path = os.path.realpath(os.path.join(summary_base_dir, entry_name))
+            self._scan_subdir_entries(summary_dict, summary_base_dir, entry_path, entry_name, Counter(), False)
+
+        if relative_path not in summary_dict:
+            return None
+        return {'relative_path': relative_path, **summary_dict[relative_path]}
+
     def _scan_subdir_entries(self, summary_dict, summary_base_dir, entry_path, entry_name, counter, list_explain):
         """
         Scan subdir entries.
@@ -15,9 +15,10 @@
 """Tensor data container."""
 import numpy as np
 
-from mindinsight.datavisual.data_transform.histogram import Histogram, Bucket
+from mindinsight.datavisual.data_transform.histogram import Histogram
 from mindinsight.datavisual.utils.utils import calc_histogram_bins
 from mindinsight.utils.exceptions import ParamValueError
+from mindinsight.utils.shared_array import from_shared, to_shared
 from mindinsight.utils.tensor import TensorUtils
 
 MAX_TENSOR_COUNT = 10000000
@@ -32,7 +33,7 @@ def calc_original_buckets(np_value, stats):
         stats (Statistics): An instance of Statistics about tensor data.
 
     Returns:
-        list, a list of bucket about tensor data.
+        numpy.ndarray, an array of (left, width, count) of the buckets about tensor data.
 
     Raises:
         ParamValueError, If np_value or stats is None.
@@ -41,7 +42,7 @@ def calc_original_buckets(np_value, stats):
         raise ParamValueError("Invalid input. np_value or stats is None.")
     valid_count = stats.count - stats.nan_count - stats.neg_inf_count - stats.pos_inf_count
     if not valid_count:
-        return []
+        return np.empty((0, 3), dtype=np.float64)
 
     bins = calc_histogram_bins(valid_count)
     first_edge, last_edge = stats.min, stats.max
@@ -53,18 +54,15 @@ def calc_original_buckets(np_value, stats):
     bins = np.linspace(first_edge, last_edge, bins + 1, dtype=np_value.dtype)
     hists, edges = np.histogram(np_value, bins=bins)
 
-    buckets = []
-    for hist, edge1, edge2 in zip(hists, edges, edges[1:]):
-        bucket = Bucket(edge1, edge2 - edge1, hist)
-        buckets.append(bucket)
-
-    return buckets
+    return np.stack((edges[:-1], edges[1:] - edges[:-1], hists), axis=1).astype(np.float64)
 
 
 class TensorContainer:
     """
     Tensor data container.
 
+    Statistics and histogram are calculated on first access and then kept, as most tensors loaded are never viewed.
+
     Args:
         tensor_message (Summary.TensorProto): Tensor message in summary file.
     """
@@ -74,18 +72,29 @@ class TensorContainer:
         self._dims = tuple(tensor_message.dims)
         self._data_type = tensor_message.data_type
         self._np_array = self.get_ndarray(tensor_message.float_data)
-        self._stats = TensorUtils.get_statistics_from_tensor(self._np_array)
-        original_buckets = calc_original_buckets(self._np_array, self._stats)
-        self._count = sum(bucket.count for bucket in original_buckets)
-        self._max = self._stats.max
-        self._min = self._stats.min
-        self._histogram = Histogram(tuple(original_buckets), self._max, self._min, self._count)
+        self._stats = None
+        self._histogram = None
+
+    def __getstate__(self):
+        """Large tensor data is transferred to other process through shared memory, instead of being pickled."""
+        state = self.__dict__.copy()
+        state['_np_array'] = to_shared(self._np_array)
+        return state
+
+    def __setstate__(self, state):
+        state['_np_array'] = from_shared(state['_np_array'])
+        self.__dict__.update(state)
 
     @property
     def size(self):
         """Get size of tensor."""
         return self._np_array.size
 
+    @property
+    def nbytes(self):
+        """Get the number of bytes of tensor data."""
+        return self._np_array.nbytes
+
     @property
     def dims(self):
         """Get dims of tensor."""
@@ -104,40 +113,49 @@ class TensorContainer:
     @property
     def max(self):
         """Get max value of tensor."""
-        return self._max
+        return self.stats.max
 
     @property
     def min(self):
         """Get min value of tensor."""
-        return self._min
+        return self.stats.min
 
     @property
     def stats(self):
         """Get statistics data of tensor."""
+        if self._stats is None:
+            self._stats = TensorUtils.get_statistics_from_tensor(self._np_array)
         return self._stats
 
     @property
     def count(self):
         """Get count value of tensor."""
-        return self._count
+        return self.histogram.count
 
     @property
     def histogram(self):
         """Get histogram data."""
+        if self._histogram is None:
+            stats = self.stats
+            original_buckets = calc_original_buckets(self._np_array, stats)
+            count = int(original_buckets[:, 2].sum())
+            self._histogram = Histogram(original_buckets, stats.max, stats.min, count)
         return self._histogram
 
     def buckets(self):
         """Get histogram buckets."""
-        return self._histogram.buckets()
+        return self.histogram.buckets()
 
     def get_ndarray(self, tensor):
         """
         Get ndarray of tensor.
 
         Args:
-            tensor (mindinsight_anf_ir.proto.DataType): tensor data.
+            tensor (Union[mindinsight_anf_ir.proto.DataType, numpy.ndarray]): tensor data.
 
         Returns:
             numpy.ndarray, ndarray of tensor.
         """
+        if isinstance(tensor, np.ndarray):
+            return tensor.reshape(self.dims)
         return np.array(tuple(tensor)).reshape(self.dims)
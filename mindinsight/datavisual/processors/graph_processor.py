@@ -107,9 +107,9 @@ class GraphProcessor(BaseProcessor):
         """
         offset = Validation.check_offset(offset=offset)
         limit = Validation.check_limit(limit, min_value=1, max_value=1000)
-        nodes = self._graph.search_nodes_by_pattern(search_content)
         real_offset = offset * limit
-        search_nodes = self._graph.get_nodes(nodes[real_offset:real_offset + limit])
+        nodes = self._graph.search_nodes_by_pattern(search_content, offset=real_offset, limit=limit)
+        search_nodes = self._graph.get_nodes(nodes)
 
         return {"nodes": search_nodes}
 
@@ -13,22 +13,32 @@
 # limitations under the License.
 # ============================================================================
 """Histogram Processor APIs."""
+import itertools
+
+import numpy as np
+
 from mindinsight.utils.exceptions import ParamValueError
 from mindinsight.datavisual.common.log import logger
 from mindinsight.datavisual.common.validation import Validation
 from mindinsight.datavisual.common.exceptions import HistogramNotExistError
 from mindinsight.datavisual.processors.base_processor import BaseProcessor
+from mindinsight.datavisual.utils.tools import to_int
 
 
 class HistogramProcessor(BaseProcessor):
     """Histogram Processor."""
-    def get_histograms(self, train_id, tag):
+    def get_histograms(self, train_id, tag, columnar=False, since_version=None):
         """
         Builds a JSON-serializable object with information about histogram data.
 
         Args:
             train_id (str): The ID of the events data.
             tag (str): The name of the tag the histogram data all belong to.
+            columnar (bool): Whether to return `histograms` as a dict of arrays, see `_to_columns`. Default: False.
+            since_version (Union[str, int, None]): Only return the histograms changed since this version, which is
+                the `version` in the previous response, or 0 for the first request. The `histograms` returned replace
+                those in the `step_ranges` got before, or all of them if `reset` is True, e.g. when the visual range
+                changes. Default: None, all the histograms are returned without `version`.
 
         Returns:
             dict, a dict including the `train_id`, `tag`, and `histograms'.
@@ -45,21 +55,31 @@ class HistogramProcessor(BaseProcessor):
                     }
         """
         Validation.check_param_empty(train_id=train_id, tag=tag)
+        if since_version is not None:
+            since_version = to_int(since_version, 'since_version')
         logger.info("Start to process histogram data...")
+        delta = None
         try:
-            tensors = self._data_manager.list_tensors(train_id, tag)
+            if since_version is None:
+                tensors = self._data_manager.list_tensors(train_id, tag)
+            else:
+                delta = self._data_manager.list_tensors_since(train_id, tag, since_version)
+                tensors = delta.samples
         except ParamValueError as err:
             raise HistogramNotExistError(err.message)
 
-        histograms = []
-        for tensor in tensors:
-            histogram = tensor.value
-            buckets = histogram.buckets()
-            histograms.append({
-                "wall_time": tensor.wall_time,
-                "step": tensor.step,
-                "buckets": buckets
-            })
+        if columnar:
+            histograms = _to_columns(tensors)
+        else:
+            histograms = []
+            for tensor in tensors:
+                histogram = tensor.value
+                buckets = histogram.buckets()
+                histograms.append({
+                    "wall_time": tensor.wall_time,
+                    "step": tensor.step,
+                    "buckets": buckets
+                })
 
         logger.info("Histogram data processing is finished!")
         response = {
@@ -67,4 +87,34 @@ class HistogramProcessor(BaseProcessor):
             "tag": tag,
             "histograms": histograms
         }
+        if delta is not None:
+            response.update(version=delta.version, reset=delta.step_ranges is None, step_ranges=delta.step_ranges)
         return response
+
+
+def _to_columns(tensors):
+    """
+    Build the columns of histograms, laid out like a list column of Apache Arrow.
+
+    Args:
+        tensors (list): The list of histogram tensors.
+
+    Returns:
+        dict, a dict of arrays,
+            {
+                "wall_time": float64 array of each histogram,
+                "step": int64 array of each histogram,
+                "bucket_offsets": int64 array, buckets of the i-th histogram are
+                    `buckets[bucket_offsets[i]:bucket_offsets[i + 1]]`,
+                "buckets": float64 array of (left, width, count) of the buckets of all histograms,
+            }
+    """
+    buckets = [tensor.value.buckets() for tensor in tensors]
+    bucket_offsets = np.zeros(len(buckets) + 1, dtype=np.int64)
+    np.cumsum([len(histogram_buckets) for histogram_buckets in buckets], out=bucket_offsets[1:])
+    return {
+        "wall_time": np.array([tensor.wall_time for tensor in tensors], dtype=np.float64),
+        "step": np.array([tensor.step for tensor in tensors], dtype=np.int64),
+        "bucket_offsets": bucket_offsets,
+        "buckets": np.array(list(itertools.chain.from_iterable(buckets)), dtype=np.float64).reshape(-1, 3)
+    }
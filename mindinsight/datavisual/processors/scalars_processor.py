@@ -13,38 +13,99 @@
 # limitations under the License.
 # ============================================================================
 """Scalar Processor APIs."""
+import collections
+import math
+import threading
 from urllib.parse import unquote
 
+import numpy as np
+
 from mindinsight.utils.exceptions import ParamValueError, UrlDecodeError
 from mindinsight.datavisual.common.log import logger
-from mindinsight.datavisual.utils.tools import if_nan_inf_to_none
+from mindinsight.datavisual.utils.tools import if_nan_inf_to_none, to_int
 from mindinsight.datavisual.common.exceptions import ScalarNotExistError
 from mindinsight.datavisual.common.exceptions import TrainJobNotExistError
 from mindinsight.datavisual.common.validation import Validation
+from mindinsight.datavisual.data_transform.reservoir import ScalarSamples
 from mindinsight.datavisual.processors.base_processor import BaseProcessor
+from mindinsight.datavisual.utils.utils import downsample_min_max
+
+# Max number of downsampled scalar lines to be cached.
+MAX_DOWNSAMPLED_CACHE_SIZE = 1000
+
+# Query of a scalar line, the scalars in [start_step, end_step] are downsampled to at most max_points scalars.
+_LineQuery = collections.namedtuple('_LineQuery', ['max_points', 'start_step', 'end_step'])
+
+
+class _DownsampledCache:
+    """
+    LRU cache of downsampled scalar lines.
+
+    Lines are keyed by (train_id, tag, version of reservoir, query), so they are never out of date.
+
+    Args:
+        max_size (int): Max number of lines cached.
+    """
+
+    def __init__(self, max_size):
+        self._max_size = max_size
+        self._lines = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Get the line, None if it is not cached."""
+        with self._lock:
+            line = self._lines.get(key)
+            if line is not None:
+                self._lines.move_to_end(key)
+            return line
+
+    def put(self, key, line):
+        """Cache the line, and evict the least recently used one if the cache is full."""
+        with self._lock:
+            self._lines[key] = line
+            self._lines.move_to_end(key)
+            if len(self._lines) > self._max_size:
+                self._lines.popitem(last=False)
+
+
+_DOWNSAMPLED_CACHE = _DownsampledCache(MAX_DOWNSAMPLED_CACHE_SIZE)
 
 
 class ScalarsProcessor(BaseProcessor):
     """Scalar Processor."""
 
-    def get_metadata_list(self, train_id, tag):
+    def get_metadata_list(self, train_id, tag, max_points=None, start_step=None, end_step=None):
         """
         Builds a JSON-serializable object with information about scalars.
 
         Args:
             train_id (str): The ID of the events data.
             tag (str): The name of the tag the scalars all belonging to.
+            max_points (Union[str, int, None]): Max number of scalars returned, the scalars are downsampled by
+                keeping the min and max of each range of steps if there are more. Default: None, all are returned.
+            start_step (Union[str, int, None]): Only the scalars of this step and later are returned.
+                Default: None, from the first step.
+            end_step (Union[str, int, None]): Only the scalars of this step and earlier are returned.
+                Default: None, to the last step.
 
         Returns:
             list[dict], a list of dictionaries containing the `wall_time`, `step`, `value` for each scalar.
         """
         Validation.check_param_empty(train_id=train_id, tag=tag)
+        line_query = _LineQuery(Validation.check_max_points(max_points),
+                                *Validation.check_step_range(start_step, end_step))
         job_response = []
         try:
             tensors = self._data_manager.list_tensors(train_id, tag)
         except ParamValueError as ex:
             raise ScalarNotExistError(ex.message)
 
+        if isinstance(tensors, ScalarSamples):
+            job_response = [{'wall_time': wall_time, 'step': step, 'value': value}
+                            for wall_time, step, value in _read_line(train_id, tag, tensors, line_query)]
+            return dict(metadatas=job_response)
+
         for tensor in tensors:
             job_response.append({
                 'wall_time': tensor.wall_time,
@@ -52,17 +113,37 @@ class ScalarsProcessor(BaseProcessor):
                 'value': tensor.value})
         return dict(metadatas=job_response)
 
-    def get_scalars(self, train_ids, tags):
+    def get_scalars(self, train_ids, tags, max_points=None, start_step=None, end_step=None, columnar=False,
+                    since_version=None):
         """
         Get scalar data for given train_ids and tags.
 
         Args:
             train_ids (list): Specify list of train job ID.
             tags (list): Specify list of tags.
+            max_points (Union[str, int, None]): Max number of scalars returned for each train job and tag, see
+                `get_metadata_list`. Default: None, all are returned.
+            start_step (Union[str, int, None]): Only the scalars of this step and later are returned.
+                Default: None, from the first step.
+            end_step (Union[str, int, None]): Only the scalars of this step and earlier are returned.
+                Default: None, to the last step.
+            columnar (bool): Whether to return the `values` of each train job and tag as a dict of `wall_time`,
+                `step` and `value` arrays, in which non-finite values are kept, instead of a list of dicts.
+                Default: False.
+            since_version (Union[str, int, None]): Only return the scalars changed since this version, which is
+                the least `version` of the train jobs and tags in the previous response, or 0 for the first request.
+                The `values` returned replace the scalars in the `step_ranges` got before, or all of them if `reset`
+                is True. Changed scalars are not downsampled, they are all read again if there are more than
+                `max_points`. Default: None, all the scalars are returned without `version`.
 
         Returns:
-            list[dict], a list of dictionaries containing the `wall_time`, `step`, `value` for each scalar.
+            list[dict], a list of dictionaries containing the `train_id`, `tag` and `values`, and `version`,
+                `reset` and `step_ranges` if `since_version` is given.
         """
+        line_query = _LineQuery(Validation.check_max_points(max_points),
+                                *Validation.check_step_range(start_step, end_step))
+        if since_version is not None:
+            since_version = to_int(since_version, 'since_version')
         for index, train_id in enumerate(train_ids):
             try:
                 train_id = unquote(train_id, errors='strict')
@@ -73,25 +154,29 @@ class ScalarsProcessor(BaseProcessor):
 
         scalars = []
         for train_id in train_ids:
-            scalars += self._get_train_scalars(train_id, tags)
+            scalars += self._get_train_scalars(train_id, tags, line_query, columnar, since_version)
 
         return scalars
 
-    def _get_train_scalars(self, train_id, tags):
+    def _get_train_scalars(self, train_id, tags, line_query, columnar=False, since_version=None):
         """
         Get scalar data for given train_id and tags.
 
         Args:
             train_id (str): Specify train job ID.
             tags (list): Specify list of tags.
+            line_query (_LineQuery): Query of the scalars returned for each tag.
+            columnar (bool): Whether to return the values as arrays, see `get_scalars`. Default: False.
+            since_version (Optional[int]): Only return the scalars changed since this version, see `get_scalars`.
+                Default: None.
 
         Returns:
-            list[dict], a list of dictionaries containing the `wall_time`, `step`, `value` for each scalar.
+            list[dict], a list of dictionaries containing the `train_id`, `tag` and `values`.
         """
         scalars = []
         for tag in tags:
             try:
-                tensors = self._data_manager.list_tensors(train_id, tag)
+                tensors, delta_info = self._list_scalars(train_id, tag, line_query, since_version)
             except ParamValueError:
                 continue
             except TrainJobNotExistError:
@@ -103,6 +188,24 @@ class ScalarsProcessor(BaseProcessor):
                 'tag': tag,
                 'values': [],
             }
+            if delta_info is not None:
+                scalar.update(delta_info)
+
+            if columnar:
+                samples = _select_line(train_id, tag, _to_scalar_samples(tensors), line_query)
+                scalar['values'] = {'wall_time': samples.wall_times,
+                                    'step': samples.steps,
+                                    'value': samples.values}
+                scalars.append(scalar)
+                continue
+
+            if isinstance(tensors, ScalarSamples):
+                scalar['values'] = [{'wall_time': wall_time,
+                                     'step': step,
+                                     'value': value if math.isfinite(value) else None}
+                                    for wall_time, step, value in _read_line(train_id, tag, tensors, line_query)]
+                scalars.append(scalar)
+                continue
 
             for tensor in tensors:
                 scalar['values'].append({
@@ -114,3 +217,92 @@ class ScalarsProcessor(BaseProcessor):
             scalars.append(scalar)
 
         return scalars
+
+    def _list_scalars(self, train_id, tag, line_query, since_version):
+        """
+        List scalars of the train job and tag, or those changed since the version.
+
+        Args:
+            train_id (str): Specify train job ID.
+            tag (str): Specify tag.
+            line_query (_LineQuery): Query of the scalars returned.
+            since_version (Optional[int]): Only list the scalars changed since this version.
+
+        Returns:
+            tuple[Union[ScalarSamples, list], Union[dict, None]], the scalars, and the `version`, `reset` and
+                `step_ranges` of them if `since_version` is given.
+        """
+        if since_version is None:
+            return self._data_manager.list_tensors(train_id, tag), None
+
+        delta = self._data_manager.list_tensors_since(train_id, tag, since_version)
+        samples = _to_scalar_samples(delta.samples)
+        if delta.step_ranges is not None:
+            samples = _select_line(train_id, tag, samples, line_query._replace(max_points=None))
+            if line_query.max_points is not None and len(samples) > line_query.max_points:
+                # Versions start from 1, so all the scalars are listed again to be downsampled.
+                delta = self._data_manager.list_tensors_since(train_id, tag, 0)
+                samples = _to_scalar_samples(delta.samples)
+        return samples, dict(version=delta.version, reset=delta.step_ranges is None, step_ranges=delta.step_ranges)
+
+
+def _to_scalar_samples(tensors):
+    """Get the scalar tensors as columns, a list of tensors is converted."""
+    if isinstance(tensors, ScalarSamples):
+        return tensors
+    return ScalarSamples(np.array([tensor.wall_time for tensor in tensors], dtype=np.float64),
+                         np.array([tensor.step for tensor in tensors], dtype=np.int64),
+                         np.array([tensor.value for tensor in tensors], dtype=np.float64),
+                         np.zeros(len(tensors), dtype=np.int64), [])
+
+
+def _select_line(train_id, tag, samples, line_query):
+    """
+    Select the scalar samples in the step range, and downsample them if needed.
+
+    Samples of early steps may have been consolidated by the reservoir, so zooming into them gets the min and max
+    scalars of consecutive steps, while zooming into recent steps gets every scalar.
+
+    Args:
+        train_id (str): Train job ID.
+        tag (str): Tag name.
+        samples (ScalarSamples): Scalar samples sorted by step.
+        line_query (_LineQuery): Query of the line.
+
+    Returns:
+        ScalarSamples, the samples selected.
+    """
+    if line_query.start_step is not None or line_query.end_step is not None:
+        start = 0 if line_query.start_step is None else np.searchsorted(samples.steps, line_query.start_step)
+        end = len(samples) if line_query.end_step is None else \
+            np.searchsorted(samples.steps, line_query.end_step, side='right')
+        samples = samples[start:end]
+
+    max_points = line_query.max_points
+    if max_points is None or len(samples) <= max_points:
+        return samples
+
+    key = (train_id, tag, samples.version, line_query)
+    line = _DOWNSAMPLED_CACHE.get(key) if samples.version is not None else None
+    if line is None:
+        line = samples[downsample_min_max(samples.values, max_points)]
+        if samples.version is not None:
+            _DOWNSAMPLED_CACHE.put(key, line)
+    return line
+
+
+def _read_line(train_id, tag, samples, line_query):
+    """
+    Read the scalar samples selected by `_select_line` as rows.
+
+    Args:
+        train_id (str): Train job ID.
+        tag (str): Tag name.
+        samples (ScalarSamples): Scalar samples sorted by step.
+        line_query (_LineQuery): Query of the line.
+
+    Returns:
+        list[tuple], (wall_time, step, value) of each sample.
+    """
+    samples = _select_line(train_id, tag, samples, line_query)
+    return list(zip(samples.wall_times.tolist(), samples.steps.tolist(), samples.values.tolist()))
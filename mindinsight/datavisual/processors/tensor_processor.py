@@ -31,7 +31,7 @@ from mindinsight.datavisual.proto_files import mindinsight_anf_ir_pb2 as anf_ir_
 
 class TensorProcessor(BaseProcessor):
     """Tensor Processor."""
-    def get_tensors(self, train_ids, tags, step, dims, detail):
+    def get_tensors(self, train_ids, tags, step, dims, detail, columnar=False):
         """
         Get tensor data for given train_ids, tags, step, dims and detail.
 
@@ -41,6 +41,8 @@ class TensorProcessor(BaseProcessor):
             step (int): Specify step of tag, it's necessary when detail is equal to 'data'.
             dims (str): Specify dims of step, it's necessary when detail is equal to 'data'.
             detail (str): Specify which data to query, available values: 'stats', 'histogram' and 'data'.
+            columnar (bool): Whether to return `data` and `histogram_buckets` as numpy arrays, in which non-finite
+                values are kept, instead of lists. Default: False.
 
         Returns:
             dict, a dict including the `tensors`.
@@ -60,11 +62,11 @@ class TensorProcessor(BaseProcessor):
 
         tensors = []
         for train_id in train_ids:
-            tensors += self._get_train_tensors(train_id, tags, step, dims, detail)
+            tensors += self._get_train_tensors(train_id, tags, step, dims, detail, columnar)
 
         return {"tensors": tensors}
 
-    def _get_train_tensors(self, train_id, tags, step, dims, detail):
+    def _get_train_tensors(self, train_id, tags, step, dims, detail, columnar=False):
         """
         Get tensor data for given train_id, tags, step, dims and detail.
 
@@ -74,6 +76,7 @@ class TensorProcessor(BaseProcessor):
             step (int): Specify step of tensor, it's necessary when detail is set to 'data'.
             dims (str): Specify dims of tensor, it's necessary when detail is set to 'data'.
             detail (str): Specify which data to query, available values: 'stats', 'histogram' and 'data'.
+            columnar (bool): Whether to return arrays instead of lists, see `get_tensors`. Default: False.
 
         Returns:
             list[dict], a list of dictionaries containing the `train_id`, `tag`, `values`.
@@ -101,9 +104,9 @@ class TensorProcessor(BaseProcessor):
                 # Limit to query max two dimensions for tensor in table view.
                 dims = TensorUtils.parse_shape(dims, limit=MAX_DIMENSIONS_FOR_TENSOR)
                 step = to_int(step, "step")
-                values = self._get_tensors_data(step, dims, tensors)
+                values = self._get_tensors_data(step, dims, tensors, columnar)
             elif detail == 'histogram':
-                values = self._get_tensors_histogram(tensors)
+                values = self._get_tensors_histogram(tensors, columnar)
             else:
                 raise ParamValueError('Can not support this value: {} of detail.'.format(detail))
 
@@ -164,7 +167,7 @@ class TensorProcessor(BaseProcessor):
 
         return values
 
-    def _get_tensors_data(self, step, dims, tensors):
+    def _get_tensors_data(self, step, dims, tensors, columnar=False):
         """
         Builds a JSON-serializable object with information about tensor dims data.
 
@@ -172,6 +175,7 @@ class TensorProcessor(BaseProcessor):
             step (int): Specify step of tensor.
             dims (tuple): Specify dims of tensor.
             tensors (list): The list of _Tensor data.
+            columnar (bool): Whether to return `data` as a numpy array. Default: False.
 
         Returns:
             dict, a dict including the `wall_time`, `step`, and `value' for each tensor.
@@ -207,10 +211,9 @@ class TensorProcessor(BaseProcessor):
                 continue
             step_in_cache = True
             res_data = TensorUtils.get_specific_dims_data(value.ndarray, dims)
-            flatten_data = res_data.flatten().tolist()
-            if len(flatten_data) > MAX_TENSOR_RESPONSE_DATA_SIZE:
+            if res_data.size > MAX_TENSOR_RESPONSE_DATA_SIZE:
                 raise ResponseDataExceedMaxValueError("the size of response data: {} exceed max value: {}."
-                                                      .format(len(flatten_data), MAX_TENSOR_RESPONSE_DATA_SIZE))
+                                                      .format(res_data.size, MAX_TENSOR_RESPONSE_DATA_SIZE))
 
             def transfer(array):
                 if not isinstance(array, np.ndarray):
@@ -233,7 +236,9 @@ class TensorProcessor(BaseProcessor):
                 return transfer_data
 
             stats = TensorUtils.get_statistics_from_tensor(res_data)
-            if stats.nan_count + stats.neg_inf_count + stats.pos_inf_count > 0:
+            if columnar:
+                tensor_data = res_data
+            elif stats.nan_count + stats.neg_inf_count + stats.pos_inf_count > 0:
                 tensor_data = transfer(res_data)
             else:
                 tensor_data = res_data.tolist()
@@ -253,12 +258,13 @@ class TensorProcessor(BaseProcessor):
 
         return values
 
-    def _get_tensors_histogram(self, tensors):
+    def _get_tensors_histogram(self, tensors, columnar=False):
         """
         Builds a JSON-serializable object with information about tensor histogram data.
 
         Args:
             tensors (list): The list of _Tensor data.
+            columnar (bool): Whether to return `histogram_buckets` as a numpy array of shape (N, 3). Default: False.
 
         Returns:
             dict, a dict including the `wall_time`, `step`, and `value' for each tensor.
@@ -286,6 +292,8 @@ class TensorProcessor(BaseProcessor):
             # This value is an instance of TensorContainer
             value = tensor.value
             buckets = value.buckets()
+            if columnar:
+                buckets = np.array(buckets, dtype=np.float64).reshape(-1, 3)
             values.append({
                 "wall_time": tensor.wall_time,
                 "step": tensor.step,
@@ -195,3 +195,13 @@ class TrainTaskManager(BaseProcessor):
             ))
 
         return cache_result
+
+    def get_memory_usage(self):
+        """
+        Get the approximate memory usage of the train jobs in cache.
+
+        Returns:
+            dict, the memory budget `max_bytes`, the `total_bytes`, and `train_jobs` with the `train_id`, `nbytes`
+                and `nbytes_by_plugin` of each train job, sorted by bytes in descending order.
+        """
+        return self._data_manager.get_memory_usage()
@@ -0,0 +1,147 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""
+Columnar binary encoding of responses.
+
+A document is a JSON-serializable object, in which numpy arrays may take the place of lists of numbers. The arrays
+are written as raw typed arrays, which can be viewed directly by `Float64Array` etc. in browsers, and the rest of the
+document is written as JSON. The encoded bytes are laid out as:
+
+- 16 bytes of prefix, the magic `MICOLUMN`, the format version and the header size, as little-endian uint32.
+- The header, a JSON object of `document`, where each array is replaced by `{"$column": <index>}`, and `columns`, the
+  `dtype`, `shape` and `offset` (relative to the end of the header) of each array. It is padded with spaces so that
+  arrays are aligned to 8 bytes.
+- The arrays, little-endian and C-contiguous, each aligned to 8 bytes.
+
+Unlike JSON, NaN and infinities are kept as they are in float arrays.
+"""
+import json
+import struct
+
+import numpy as np
+
+MIMETYPE = 'application/vnd.mindinsight.columnar'
+
+_MAGIC = b'MICOLUMN'
+_VERSION = 1
+_PREFIX = struct.Struct('<8sII')
+_ALIGNMENT = 8
+_COLUMN_KEY = '$column'
+
+# Types of arrays which have typed arrays in browsers. Others are converted to the type mapped.
+_COLUMN_DTYPES = {np.dtype(dtype) for dtype in ('int8', 'uint8', 'int16', 'uint16', 'int32', 'uint32',
+                                                'int64', 'uint64', 'float32', 'float64')}
+_CONVERTED_DTYPES = {np.dtype('bool'): np.dtype('uint8'), np.dtype('float16'): np.dtype('float32')}
+
+
+def _padding(size):
+    """Get the size of padding to align the size."""
+    return -size % _ALIGNMENT
+
+
+def _to_column(array):
+    """Convert the array to a little-endian and C-contiguous array of a type supported."""
+    dtype = _CONVERTED_DTYPES.get(array.dtype, array.dtype)
+    if dtype.newbyteorder('=') not in _COLUMN_DTYPES:
+        raise ValueError("Arrays of type {} can not be encoded.".format(array.dtype))
+    return np.ascontiguousarray(array, dtype=dtype.newbyteorder('<'))
+
+
+def encode(document):
+    """
+    Encode the document to columnar binary.
+
+    Args:
+        document (object): JSON-serializable object, in which lists of numbers can be numpy arrays.
+
+    Returns:
+        bytes, the encoded document.
+
+    Raises:
+        ValueError, if the type of any array is not supported.
+    """
+    columns = []
+    descriptions = []
+    body_size = 0
+
+    def replace_arrays(obj):
+        nonlocal body_size
+        if isinstance(obj, np.ndarray):
+            column = _to_column(obj)
+            descriptions.append(dict(dtype=column.dtype.name, shape=column.shape, offset=body_size))
+            columns.append(column)
+            body_size += column.nbytes + _padding(column.nbytes)
+            return {_COLUMN_KEY: len(columns) - 1}
+        if isinstance(obj, dict):
+            return {key: replace_arrays(value) for key, value in obj.items()}
+        if isinstance(obj, (list, tuple)):
+            return [replace_arrays(value) for value in obj]
+        if isinstance(obj, np.generic):
+            return obj.item()
+        return obj
+
+    header = json.dumps(dict(document=replace_arrays(document), columns=descriptions),
+                        separators=(',', ':')).encode('utf-8')
+    header += b' ' * _padding(len(header))
+
+    encoded = bytearray(_PREFIX.size + len(header) + body_size)
+    _PREFIX.pack_into(encoded, 0, _MAGIC, _VERSION, len(header))
+    encoded[_PREFIX.size:_PREFIX.size + len(header)] = header
+    body_offset = _PREFIX.size + len(header)
+    for column, description in zip(columns, descriptions):
+        offset = body_offset + description['offset']
+        encoded[offset:offset + column.nbytes] = column.tobytes()
+    return bytes(encoded)
+
+
+def decode(encoded):
+    """
+    Decode the document from columnar binary.
+
+    Args:
+        encoded (bytes): The encoded document.
+
+    Returns:
+        object, the document, in which arrays are read-only numpy arrays viewing the encoded bytes.
+
+    Raises:
+        ValueError, if the bytes are not encoded by `encode`.
+    """
+    if len(encoded) < _PREFIX.size:
+        raise ValueError("Encoded document is truncated.")
+    magic, version, header_size = _PREFIX.unpack_from(encoded, 0)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("Encoded document is not of columnar format version {}.".format(_VERSION))
+    header = json.loads(encoded[_PREFIX.size:_PREFIX.size + header_size].decode('utf-8'))
+    body_offset = _PREFIX.size + header_size
+
+    columns = []
+    for description in header['columns']:
+        dtype = np.dtype(description['dtype']).newbyteorder('<')
+        shape = tuple(description['shape'])
+        count = int(np.prod(shape, dtype=np.int64))
+        columns.append(np.frombuffer(encoded, dtype=dtype, count=count,
+                                     offset=body_offset + description['offset']).reshape(shape))
+
+    def restore_arrays(obj):
+        if isinstance(obj, dict):
+            if len(obj) == 1 and _COLUMN_KEY in obj:
+                return columns[obj[_COLUMN_KEY]]
+            return {key: restore_arrays(value) for key, value in obj.items()}
+        if isinstance(obj, list):
+            return [restore_arrays(value) for value in obj]
+        return obj
+
+    return restore_arrays(header['document'])
@@ -68,10 +68,23 @@ bool CheckValueAgainstData(const char* crc_str, const char* data, size_t size) {
   return crc_new == crc_old;
 }
 
+// A function check the crc32c value against data, both held by objects supporting the buffer protocol
+bool CheckValueAgainstBuffer(const pybind11::buffer& crc_buf, const pybind11::buffer& data_buf, size_t size) {
+  pybind11::buffer_info crc_info = crc_buf.request();
+  pybind11::buffer_info data_info = data_buf.request();
+  if (static_cast<size_t>(crc_info.size * crc_info.itemsize) < sizeof(uint32_t) ||
+      static_cast<size_t>(data_info.size * data_info.itemsize) < size) {
+    return false;
+  }
+  return CheckValueAgainstData(static_cast<const char*>(crc_info.ptr), static_cast<const char*>(data_info.ptr), size);
+}
+
 PYBIND11_MODULE(crc32, m) {
   m.doc() = "crc util";
   m.def("GetMaskCrc32cValue", &GetMaskCrc32cValue, "A function return the crc32c value");
   m.def("CheckValueAgainstData", &CheckValueAgainstData, "A function check the crc32c value against data");
+  // Overload for memoryview, so that data mapped from file can be checked without copying.
+  m.def("CheckValueAgainstData", &CheckValueAgainstBuffer, "A function check the crc32c value against data");
 }
 
 #endif  // DATAVISUAL_UTILS_CRC32_CRC32_H_
@@ -14,6 +14,9 @@
 # ============================================================================
 """Utils."""
 import math
+
+import numpy as np
+
 from mindinsight.datavisual.common.log import logger
 
 
@@ -66,3 +69,32 @@ def contains_null_byte(**kwargs):
             return True
 
     return False
+
+
+def downsample_min_max(values, max_points):
+    """
+    Select at most `max_points` points of a line, keeping its shape.
+
+    The first and the last points are kept. The points between are split into buckets of equal size by index, and
+    the min and the max points of each bucket are kept, so that spikes are not lost. NaN is taken as the max of its
+    bucket, so that it is not hidden either.
+
+    Args:
+        values (numpy.ndarray): Values of the points of the line.
+        max_points (int): Max number of points to keep, at least 4.
+
+    Returns:
+        numpy.ndarray, the indexes of the points kept in ascending order.
+    """
+    count = len(values)
+    if count <= max_points:
+        return np.arange(count)
+
+    inner_count = count - 2
+    bucket_count = (max_points - 2) // 2
+    bucket_ids = np.arange(inner_count) * bucket_count // inner_count
+    # Sorted by bucket, then by value, so the first and the last of each bucket are the min and the max.
+    order = np.lexsort((values[1:-1], bucket_ids))
+    starts = np.searchsorted(bucket_ids, np.arange(bucket_count))
+    ends = np.append(starts[1:], inner_count)
+    return np.unique(np.concatenate(([0], order[starts] + 1, order[ends - 1] + 1, [count - 1])))
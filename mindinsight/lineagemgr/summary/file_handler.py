@@ -15,13 +15,16 @@
 """File handler for lineage summary log."""
 import os
 
+from mindinsight.datavisual.data_access.mmap_reader import MmapReader
+
 
 class FileHandler:
     """
     Summary log file handler.
 
     Summary log file handler provides Python APIs to manage file IO, including
-    read, seek. It is not suitable for very large files.
+    read, seek. The file is memory-mapped, so reading does not load the whole
+    file into memory, and the content is returned as memoryview without copying.
 
     Args:
         file_path (str): File path.
@@ -29,7 +32,7 @@ class FileHandler:
 
     def __init__(self, file_path):
         self._size = os.path.getsize(file_path)
-        self._cache = self._read_cache(file_path)
+        self._reader = MmapReader(file_path)
         self._offset = 0
 
     @property
@@ -42,19 +45,6 @@ class FileHandler:
         """
         return self._size
 
-    def _read_cache(self, file_path):
-        """
-        Read file in cache.
-
-        Args:
-            file_path (str): File path.
-
-        Returns:
-            bytes, the file content.
-        """
-        with open(file_path, 'rb') as log_file:
-            return log_file.read()
-
     def seek(self, offset):
         """
         Set the new offset of file.
@@ -75,7 +65,7 @@ class FileHandler:
 
     def read(self, size=-1, offset=None):
         """
-        Read bytes from buffer by size.
+        Read bytes from file by size.
 
         Args:
             size (int): Number of bytes to read. If set -1, read the whole file.
@@ -83,13 +73,20 @@ class FileHandler:
             offset (int): The start offset to read bytes from. Default: None.
 
         Returns:
-            bytes, the content.
+            memoryview, the content.
         """
         if offset is None:
             offset = self._offset
 
-        new_offset = offset + size
-        result = self._cache[offset:new_offset]
-        self._offset = new_offset
+        if size < 0:
+            size = self._size - offset
+
+        # Do not read beyond the size when the file handler is created, to be consistent with `size`.
+        result = self._reader.read(offset, max(min(size, self._size - offset), 0))
+        self._offset = offset + size
 
         return result
+
+    def close(self):
+        """Close the memory mapping of the file."""
+        self._reader.close()
@@ -69,8 +69,11 @@ class SummaryAnalyzer:
         Returns:
             generator, the event generator.
         """
-        while self._has_next():
-            yield self._read_event()
+        try:
+            while self._has_next():
+                yield self._read_event()
+        finally:
+            self.file_handler.close()
 
     def _has_next(self):
         """
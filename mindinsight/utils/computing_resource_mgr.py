@@ -13,11 +13,15 @@
 # limitations under the License.
 # ============================================================================
 """Compute resource manager."""
+import contextlib
+import enum
 import fractions
+import functools
 import math
 import threading
 import multiprocessing
 from concurrent import futures
+from concurrent.futures.process import BrokenProcessPool
 
 from mindinsight.utils.log import utils_logger as logger
 from mindinsight.utils.constant import GeneralErrors
@@ -27,11 +31,25 @@ from mindinsight.utils.exceptions import MindInsightException
 _MP_CONTEXT = multiprocessing.get_context(method="forkserver")
 
 
+class TaskPriority(enum.IntEnum):
+    """
+    Priority of the tasks submitted to executors.
+
+    Foreground tasks can use all the workers of an executor, while background tasks can not use the last one, so
+    that a foreground task submitted later does not wait behind background tasks.
+    """
+    FOREGROUND = 0
+    BACKGROUND = 1
+
+
 class ComputingResourceManager:
     """
     Manager for computing resources.
 
-    This class provides executors for computing tasks. Executors can only be used once.
+    This class provides executors for computing tasks. Executors got by `get_executor` can only be used once.
+
+    A long-lived manager can also lease executors by `lease_executor`, which are returned to the manager when they
+    are closed, so the worker processes are reused across rounds of tasks.
 
     Args:
         executors_cnt (int): Number of executors to be provided by this class.
@@ -48,7 +66,14 @@ class ComputingResourceManager:
             for ind in range(self._executors_cnt)
         }
         self._remaining_executors = len(self._executors)
-        self._backend = futures.ProcessPoolExecutor(max_workers=max_processes_cnt, mp_context=_MP_CONTEXT)
+        self._leased_executors = {}
+        self._next_leased_executor_id = self._executors_cnt
+        self._backend = self._create_backend()
+        # Set when a task of the current process pool fails as the pool is broken.
+        self._broken = False
+        self._restarts_cnt = 0
+        self._running_tasks_cnt = 0
+        self._finished_tasks_cnt = 0
         logger.info("Initialized ComputingResourceManager with executors_cnt=%s, max_processes_cnt=%s.",
                     executors_cnt, max_processes_cnt)
 
@@ -62,8 +87,80 @@ class ComputingResourceManager:
 
         This method is not thread safe.
         """
+        self.shutdown()
+
+    def _create_backend(self):
+        """Create the process pool."""
+        return futures.ProcessPoolExecutor(max_workers=self._max_processes_cnt, mp_context=_MP_CONTEXT)
+
+    def shutdown(self):
+        """Shut down the worker processes."""
         self._backend.shutdown()
 
+    def check_health(self):
+        """
+        Check whether the worker processes are healthy, and restart them if any of them died.
+
+        A process pool is broken when any worker process is terminated abruptly, e.g. killed by OOM killer, and no
+        more tasks can be submitted to it.
+
+        Returns:
+            bool, True if the worker processes are healthy.
+        """
+        with self._lock:
+            return self._check_health()
+
+    def _check_health(self):
+        """Check health of worker processes. Call this method with lock."""
+        if not self._broken:
+            return True
+        logger.warning("Worker processes are broken and will be restarted.")
+        self._backend.shutdown(wait=False)
+        self._backend = self._create_backend()
+        self._broken = False
+        self._restarts_cnt += 1
+        return False
+
+    def lease_executor(self):
+        """
+        Lease an executor, which has all the workers and is returned to this manager when it is closed.
+
+        Executors should be leased one by one, e.g. by a reloading thread, as each of them has all the workers.
+
+        Returns:
+            Executor, which can be used for submitting tasks.
+        """
+        with self._lock:
+            self._check_health()
+            executor_id = self._next_leased_executor_id
+            self._next_leased_executor_id += 1
+            executor = Executor(self, executor_id=executor_id,
+                                available_workers=fractions.Fraction(self._max_processes_cnt))
+            self._leased_executors[executor_id] = executor
+            return executor
+
+    def get_metrics(self):
+        """
+        Get metrics of the worker processes.
+
+        Returns:
+            dict, metrics including the following attributes.
+                - max_processes (int): Max number of worker processes.
+                - running_tasks (int): Number of tasks submitted and not finished.
+                - utilization (float): Ratio of the busy worker processes.
+                - queue_depth (int): Number of tasks waiting for a free slot of executors to be submitted.
+                - finished_tasks (int): Number of tasks finished.
+                - restarts (int): Times the worker processes are restarted.
+        """
+        with self._lock:
+            executors = list(self._executors.values()) + list(self._leased_executors.values())
+            return dict(max_processes=self._max_processes_cnt,
+                        running_tasks=self._running_tasks_cnt,
+                        utilization=min(self._running_tasks_cnt, self._max_processes_cnt) / self._max_processes_cnt,
+                        queue_depth=sum(executor.waiting_tasks_cnt for executor in executors),
+                        finished_tasks=self._finished_tasks_cnt,
+                        restarts=self._restarts_cnt)
+
     def get_executor(self):
         """
         Get an executor.
@@ -88,6 +185,11 @@ class ComputingResourceManager:
             executor_id (int): Id of the executor to be destroyed.
         """
         with self._lock:
+            if executor_id in self._leased_executors:
+                self._leased_executors.pop(executor_id)
+                logger.debug("Leased executor %s is returned.", executor_id)
+                return
+
             released_workers = self._executors[executor_id].available_workers
             self._executors.pop(executor_id)
 
@@ -112,7 +214,26 @@ class ComputingResourceManager:
         This method should only be called by Executor. Users should not call this method directly.
         """
         with self._lock:
-            return self._backend.submit(*args, **kwargs)
+            try:
+                future = self._backend.submit(*args, **kwargs)
+            except BrokenProcessPool:
+                self._broken = True
+                self._check_health()
+                future = self._backend.submit(*args, **kwargs)
+            self._running_tasks_cnt += 1
+            backend = self._backend
+        future.add_done_callback(functools.partial(self._on_task_done, backend))
+        return future
+
+    def _on_task_done(self, backend, future):
+        """Count the finished task, and find the process pool broken if the task fails for it."""
+        with self._lock:
+            self._running_tasks_cnt -= 1
+            self._finished_tasks_cnt += 1
+            # Tasks of a restarted process pool fail too, which should not break the new one.
+            if backend is self._backend and not future.cancelled() and \
+                    isinstance(future.exception(), BrokenProcessPool):
+                self._broken = True
 
 
 class ComputingResourceManagerException(MindInsightException):
@@ -135,10 +256,12 @@ class WrappedFuture:
     Args:
          executor (Executor): The executor which generates this future.
          original_future (futures.Future): Original future object.
+         is_background (bool): Whether the future is of a background task. Default: False.
     """
-    def __init__(self, executor, original_future: futures.Future):
+    def __init__(self, executor, original_future: futures.Future, is_background=False):
         self._original_future = original_future
         self._executor = executor
+        self._is_background = is_background
 
     def add_done_callback(self, callback):
         """
@@ -151,8 +274,10 @@ class WrappedFuture:
             try:
                 return callback(*args, **kwargs)
             finally:
-                self._executor.release_slot()
+                self._executor.release_slot(self._is_background)
                 self._executor.remove_done_future(self._original_future)
+                self._executor.finish_callback()
+        self._executor.add_callback()
         self._original_future.add_done_callback(_wrapped_callback)
 
 
@@ -173,6 +298,12 @@ class Executor:
         self._slots = threading.Semaphore(value=self._effective_workers)
         self._id = executor_id
         self._futures = set()
+        # Callbacks are called after the futures are done, so they are counted to wait for them too.
+        self._pending_callbacks_cnt = 0
+        self._callbacks_done = threading.Condition()
+        self._waiting_tasks_cnt = 0
+        self._priority = TaskPriority.FOREGROUND
+        self._background_slots = threading.Semaphore(value=self._calc_background_workers(self._effective_workers))
 
         self._lock = threading.Lock()
 
@@ -199,23 +330,74 @@ class Executor:
         if self.closed:
             raise ComputingResourceManagerException("Cannot submit task to a closed executor.")
 
+        is_background = self._priority == TaskPriority.BACKGROUND
         # Thread will wait on acquire().
+        self._waiting_tasks_cnt += 1
+        if is_background:
+            self._background_slots.acquire()
         self._slots.acquire()
+        self._waiting_tasks_cnt -= 1
         future = self._mgr.submit(*args, **kwargs)
 
         # set.add is atomic in c-python.
         self._futures.add(future)
-        return WrappedFuture(self, future)
+        return WrappedFuture(self, future, is_background)
 
-    def release_slot(self):
+    @contextlib.contextmanager
+    def priority(self, priority):
+        """
+        Submit the tasks in the context with given priority.
+
+        Args:
+            priority (TaskPriority): Priority of the tasks.
+        """
+        original_priority = self._priority
+        self._priority = priority
+        try:
+            yield self
+        finally:
+            self._priority = original_priority
+
+    def release_slot(self, is_background=False):
         """
         Release a slot for new tasks to be submitted.
 
         Semaphore is itself thread safe, so no lock is needed.
 
         This method should only be called by ExecutorFuture.
+
+        Args:
+            is_background (bool): Whether the slot is released by a background task. Default: False.
         """
         self._slots.release()
+        if is_background:
+            self._background_slots.release()
+
+    def add_callback(self):
+        """
+        Count a callback added to a future, which is waited for until it returns.
+
+        This method should only be called by WrappedFuture.
+        """
+        with self._callbacks_done:
+            self._pending_callbacks_cnt += 1
+
+    def finish_callback(self):
+        """
+        Count a callback returned.
+
+        This method should only be called by WrappedFuture.
+        """
+        with self._callbacks_done:
+            self._pending_callbacks_cnt -= 1
+            if not self._pending_callbacks_cnt:
+                self._callbacks_done.notify_all()
+
+    def _wait_futures(self):
+        """Wait for the futures to be done, and for their callbacks to return."""
+        futures.wait(self._futures)
+        with self._callbacks_done:
+            self._callbacks_done.wait_for(lambda: not self._pending_callbacks_cnt)
 
     def remove_done_future(self, future):
         """
@@ -230,14 +412,23 @@ class Executor:
     def _calc_effective_workers(available_workers):
         return 1 if available_workers <= 1 else math.floor(available_workers)
 
+    @staticmethod
+    def _calc_background_workers(effective_workers):
+        return max(effective_workers - 1, 1)
+
     def _close(self):
         self.closed = True
         logger.debug("Executor is being closed, futures to wait: %s", self._futures)
-        futures.wait(self._futures)
+        self._wait_futures()
         logger.debug("Executor wait futures completed.")
         self._mgr.destroy_executor(self._id)
         logger.debug("Executor is closed.")
 
+    @property
+    def waiting_tasks_cnt(self):
+        """Get the number of tasks waiting for a free slot to be submitted."""
+        return self._waiting_tasks_cnt
+
     @property
     def available_workers(self):
         """Get available workers."""
@@ -253,6 +444,10 @@ class Executor:
             if new_effective_workers > self._effective_workers:
                 for _ in range(new_effective_workers - self._effective_workers):
                     self._slots.release()
+                added_background_workers = self._calc_background_workers(new_effective_workers) - \
+                    self._calc_background_workers(self._effective_workers)
+                for _ in range(added_background_workers):
+                    self._background_slots.release()
 
             self._effective_workers = new_effective_workers
 
@@ -262,4 +457,4 @@ class Executor:
 
         This method is not thread safe.
         """
-        futures.wait(self._futures)
+        self._wait_futures()
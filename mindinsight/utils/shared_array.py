@@ -0,0 +1,142 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""
+Transfer large numpy arrays between processes through shared memory.
+
+The producer, e.g. a worker process, copies the array into a `multiprocessing.shared_memory` segment, and only a
+handle is pickled. The consumer maps the segment and unlinks its name at once, so the memory belongs to the mapping,
+which is unmapped when the last array viewing it is garbage collected, e.g. after the sample holding it is evicted
+from a reservoir. Segments never attached are unlinked by the resource tracker when the processes exit.
+"""
+import mmap
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from mindinsight.utils.log import utils_logger as logger
+
+# Arrays smaller than this are pickled, as creating a segment costs more than copying them.
+SHARED_ARRAY_MIN_BYTES = 1024 * 1024
+
+# Shared memory segments are files in this directory on Linux, which are mapped directly, as the mapping of
+# `SharedMemory` is closed when it is garbage collected, even if arrays are still viewing it.
+_SHM_DIR = '/dev/shm'
+
+
+def is_supported():
+    """
+    Check whether arrays can be transferred through shared memory.
+
+    Returns:
+        bool, True if shared memory segments can be mapped.
+    """
+    return os.path.isdir(_SHM_DIR)
+
+
+class SharedArray:
+    """
+    Picklable handle of a numpy array in a shared memory segment.
+
+    Args:
+        name (str): Name of the shared memory segment.
+        shape (tuple[int]): Shape of the array.
+        dtype (str): Data type of the array.
+    """
+
+    def __init__(self, name, shape, dtype):
+        self._name = name
+        self._shape = tuple(shape)
+        self._dtype = dtype
+
+    @property
+    def name(self):
+        """Get name of the shared memory segment."""
+        return self._name
+
+    @classmethod
+    def create(cls, array):
+        """
+        Copy the array into a new shared memory segment.
+
+        Args:
+            array (numpy.ndarray): The array.
+
+        Returns:
+            SharedArray, the handle of the array.
+        """
+        array = np.ascontiguousarray(array)
+        segment = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        try:
+            np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)[...] = array
+        except BaseException:
+            segment.unlink()
+            raise
+        finally:
+            segment.close()
+        return cls(segment.name, array.shape, array.dtype.str)
+
+    def attach(self):
+        """
+        Map the array in shared memory and unlink the segment, so it can be attached only once.
+
+        Returns:
+            numpy.ndarray, the array, which is writable and copied on write.
+        """
+        segment = shared_memory.SharedMemory(name=self._name)
+        try:
+            with open(os.path.join(_SHM_DIR, segment.name.lstrip('/')), 'rb') as segment_file:
+                buffer = mmap.mmap(segment_file.fileno(), segment.size, access=mmap.ACCESS_COPY)
+        finally:
+            segment.unlink()
+            segment.close()
+        dtype = np.dtype(self._dtype)
+        count = int(np.prod(self._shape, dtype=np.int64))
+        return np.frombuffer(buffer, dtype=dtype, count=count).reshape(self._shape)
+
+
+def to_shared(array):
+    """
+    Get the object to pickle for the array, which is a `SharedArray` for large arrays.
+
+    Args:
+        array (numpy.ndarray): The array.
+
+    Returns:
+        Union[SharedArray, numpy.ndarray], the handle of the array in shared memory, or the array itself if it is
+            small or shared memory is not available.
+    """
+    if array.nbytes < SHARED_ARRAY_MIN_BYTES or not is_supported():
+        return array
+    try:
+        return SharedArray.create(array)
+    except OSError as ex:
+        logger.warning("Copy array to shared memory failed, it will be pickled. Detail: %s.", str(ex))
+        return array
+
+
+def from_shared(value):
+    """
+    Get the array from the object unpickled.
+
+    Args:
+        value (Union[SharedArray, numpy.ndarray]): The object got by `to_shared`.
+
+    Returns:
+        numpy.ndarray, the array.
+    """
+    if isinstance(value, SharedArray):
+        return value.attach()
+    return value
@@ -206,6 +206,18 @@ class TensorUtils:
         Returns:
              an instance of Statistics.
         """
+        tensor_sum = tensors.sum(dtype=np.float64)
+        if np.isfinite(tensor_sum) and tensors.size:
+            # There is no NAN or INF in the tensor, so the masked array, which costs several passes, is not needed.
+            tensor_min, tensor_max = tensors.min(), tensors.max()
+            if tensor_min < F32_MIN or tensor_max > F32_MAX:
+                logger.warning('Values(%f, %f) are too large, you may encounter some undefined '
+                               'behaviours hereafter.', tensor_min, tensor_max)
+            return Statistics(max_value=tensor_max,
+                              min_value=tensor_min,
+                              avg_value=tensor_sum / tensors.size,
+                              count=tensors.size)
+
         ma_value = np.ma.masked_invalid(tensors)
         total, valid = tensors.size, ma_value.count()
         invalids = []
@@ -0,0 +1,40 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""
+Description: Keep the files written by tests, such as summary indexes, events snapshots and graph caches,
+out of the real workspace.
+"""
+import pytest
+
+from mindinsight.conf import settings
+
+
+@pytest.fixture(scope='session', autouse=True)
+def session_workspace(tmp_path_factory):
+    """
+    Use a temp workspace for the session scoped fixtures.
+
+    It is not restored, as data managers save their snapshots on exit, after the session ends.
+    """
+    settings.WORKSPACE = str(tmp_path_factory.mktemp('workspace'))
+
+
+@pytest.fixture(autouse=True)
+def workspace(monkeypatch, tmp_path):
+    """Use a temp workspace for each test."""
+    workspace_path = tmp_path / 'workspace'
+    workspace_path.mkdir()
+    monkeypatch.setattr(settings, 'WORKSPACE', str(workspace_path))
+    return str(workspace_path)
@@ -40,5 +40,7 @@ TRAIN_ROUTES = dict(
     image_metadata='/v1/mindinsight/datavisual/image/metadata',
     image_single_image='/v1/mindinsight/datavisual/image/single-image',
     scalar_metadata='/v1/mindinsight/datavisual/scalar/metadata',
-    histograms='/v1/mindinsight/datavisual/histograms'
+    histograms='/v1/mindinsight/datavisual/histograms',
+    scalars='/v1/mindinsight/datavisual/scalars',
+    memory_usage='/v1/mindinsight/datavisual/memory-usage'
 )
@@ -37,7 +37,7 @@ class TestErrorHandler:
         text = 'Test Message'
 
         # NotFound
-        def get_metadata_list(train_ids, tag):
+        def get_metadata_list(train_ids, tag, max_points=None, start_step=None, end_step=None):
             raise NotFound("%s" % text)
 
         mock_scalar_processor.side_effect = get_metadata_list
@@ -59,7 +59,7 @@ class TestErrorHandler:
         text = 'Test Message'
 
         # MethodNotAllowed
-        def get_metadata_list(train_ids, tag):
+        def get_metadata_list(train_ids, tag, max_points=None, start_step=None, end_step=None):
             raise MethodNotAllowed("%s" % text)
 
         mock_scalar_processor.side_effect = get_metadata_list
@@ -81,7 +81,7 @@ class TestErrorHandler:
         text = 'Test Message'
 
         # Other errors
-        def get_metadata_list(train_ids, tag):
+        def get_metadata_list(train_ids, tag, max_points=None, start_step=None, end_step=None):
             raise KeyError("%s" % text)
 
         mock_scalar_processor.side_effect = get_metadata_list
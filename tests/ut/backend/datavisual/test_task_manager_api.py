@@ -184,3 +184,23 @@ class TestTrainTask:
         assert response.status_code == 200
         results = response.get_json()
         assert results == f'{train_id}{manual_update}'
+
+    @patch.object(TrainTaskManager, 'get_memory_usage')
+    def test_query_memory_usage(self, mock_get_memory_usage, client):
+        """
+        Test query memory usage of the train jobs in cache.
+
+        Test Params:
+        request route: GET('/v1/mindinsight/datavisual/memory-usage').
+
+        Expect:
+        response status code: 200.
+        response json: the memory usage.
+        """
+        memory_usage = dict(max_bytes=1000, total_bytes=300,
+                            train_jobs=[dict(train_id='./job', nbytes=300, nbytes_by_plugin={'scalar': 300})])
+        mock_get_memory_usage.return_value = memory_usage
+
+        response = client.get(TRAIN_ROUTES['memory_usage'])
+        assert response.status_code == 200
+        assert response.get_json() == memory_usage
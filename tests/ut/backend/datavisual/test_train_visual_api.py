@@ -18,14 +18,19 @@ Function:
 Usage:
     pytest tests/ut/datavisual
 """
+import gzip
 from unittest.mock import Mock, patch
 
+import numpy as np
 import pytest
 
+from mindinsight.backend import application
+from mindinsight.datavisual.data_transform.data_manager import DataManager
 from mindinsight.datavisual.processors.graph_processor import GraphProcessor
 from mindinsight.datavisual.processors.images_processor import ImageProcessor
 from mindinsight.datavisual.processors.scalars_processor import ScalarsProcessor
 from mindinsight.datavisual.processors.histogram_processor import HistogramProcessor
+from mindinsight.datavisual.utils import columnar
 
 from ....utils.tools import get_url
 from .conftest import TRAIN_ROUTES
@@ -451,3 +456,73 @@ class TestTrainVisual:
         assert response.status_code == 200
         results = response.get_json()
         assert results == expect_resp
+
+    @patch.object(ScalarsProcessor, 'get_scalars')
+    def test_scalars_content_negotiation(self, mock_get_scalars, client):
+        """Test scalars are returned in columnar binary only if it is preferred to JSON."""
+        def get_scalars(train_ids, tags, *args, columnar=False, **kwargs):
+            values = dict(wall_time=np.array([1.0, 2.0]), step=np.array([1, 2]), value=np.array([0.5, np.nan]))
+            if not columnar:
+                values = [dict(wall_time=1.0, step=1, value=0.5), dict(wall_time=2.0, step=2, value=None)]
+            return [dict(train_id=train_ids[0], tag=tags[0], values=values)]
+        mock_get_scalars.side_effect = get_scalars
+
+        url = get_url(TRAIN_ROUTES['scalars'], dict(train_id='aa', tag='bb'))
+        response = client.get(url, headers={'Accept': 'text/html,*/*;q=0.8'})
+        assert response.status_code == 200
+        assert response.mimetype == 'application/json'
+        assert 'Accept' in response.headers['Vary']
+        assert response.get_json()['scalars'][0]['values'][1] == dict(wall_time=2.0, step=2, value=None)
+
+        response = client.get(url, headers={'Accept': columnar.MIMETYPE + ', application/json;q=0.9'})
+        assert response.status_code == 200
+        assert response.mimetype == columnar.MIMETYPE
+        assert 'Accept' in response.headers['Vary']
+        values = columnar.decode(response.get_data())['scalars'][0]['values']
+        assert values['step'].tolist() == [1, 2]
+        assert np.isnan(values['value'][1])
+
+    @patch.object(DataManager, 'get_data_version')
+    @patch.object(ScalarsProcessor, 'get_scalars')
+    def test_scalars_cached_by_data_version(self, mock_get_scalars, mock_get_data_version, client):
+        """Test scalars are compressed, cached and validated by the version of data."""
+        values = [dict(wall_time=1.0, step=step, value=0.5) for step in range(application.COMPRESS_MIN_BYTES)]
+        mock_get_scalars.return_value = [dict(train_id='aa', tag='bb', values=values)]
+        mock_get_data_version.return_value = ('DONE', (('CACHED', 1, 10),))
+        application._RESPONSE_CACHE.clear()
+
+        url = get_url(TRAIN_ROUTES['scalars'], dict(train_id='aa', tag='bb'))
+        response = client.get(url, headers={'Accept-Encoding': 'gzip'})
+        assert response.status_code == 200
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert response.headers['Cache-Control'] == 'private, no-cache'
+        body = response.get_data()
+        assert gzip.decompress(body).decode('utf-8').count('"step"') == len(values)
+        etag, _ = response.get_etag()
+
+        response = client.get(url, headers={'Accept-Encoding': 'gzip'})
+        assert response.get_data() == body
+        assert response.get_etag() == (etag, False)
+        assert mock_get_scalars.call_count == 1
+
+        response = client.get(url, headers={'Accept-Encoding': 'gzip', 'If-None-Match': '"{}"'.format(etag)})
+        assert response.status_code == 304
+        assert not response.get_data()
+
+        mock_get_data_version.return_value = ('DONE', (('CACHED', 1, 11),))
+        response = client.get(url, headers={'Accept-Encoding': 'gzip', 'If-None-Match': '"{}"'.format(etag)})
+        assert response.status_code == 200
+        assert response.get_etag()[0] != etag
+        assert mock_get_scalars.call_count == 2
+
+        response = client.get(url)
+        assert 'Content-Encoding' not in response.headers
+        assert response.get_json()['scalars'][0]['values'] == values
+
+    def test_compress_datavisual_responses_only(self):
+        """Test only the responses of datavisual blueprints are compressed."""
+        after_request_funcs = application.APP.after_request_funcs
+        assert application.compress_response not in after_request_funcs.get(None, [])
+        assert application.compress_response in after_request_funcs['train_visual']
+        assert application.compress_response in after_request_funcs['task_manager']
@@ -0,0 +1,139 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""
+Function:
+    Test mindinsight.datavisual.data_transform.graph.graph_cache.
+Usage:
+    pytest tests/ut/datavisual
+"""
+import gc
+import os
+import shutil
+import tempfile
+
+from mindinsight.datavisual.data_transform.graph import MSGraph
+from mindinsight.datavisual.data_transform.graph import graph_cache
+from mindinsight.datavisual.data_transform.graph.graph_cache import GraphCache, GraphReference, get_graph_digest
+from mindinsight.datavisual.data_transform.graph.graph_cache import GraphFileCache, PickledGraph
+
+
+def _create_graph(proto_bytes):
+    """Create an empty graph with the digest of given bytes."""
+    graph = MSGraph()
+    graph.digest = get_graph_digest(proto_bytes)
+    return graph
+
+
+class TestGraphCache:
+    """Test graph cache."""
+
+    def test_intern(self):
+        """Test graphs of the same digest are interned as one."""
+        cache = GraphCache()
+        graph = _create_graph(b'graph')
+        assert cache.intern(graph) is graph
+        assert cache.intern(_create_graph(b'graph')) is graph
+        other_graph = _create_graph(b'other graph')
+        assert cache.intern(other_graph) is other_graph
+
+        graph_without_digest = MSGraph()
+        assert cache.intern(graph_without_digest) is graph_without_digest
+        assert len(cache) == 2
+
+    def test_release(self):
+        """Test a graph is dropped when it is not referred to, unless the graphs got are kept."""
+        cache = GraphCache()
+        digest = cache.intern(_create_graph(b'graph')).digest
+        gc.collect()
+        assert not cache.get_graphs()
+
+        graph = cache.intern(_create_graph(b'graph'))
+        graphs = cache.get_graphs()
+        del graph
+        gc.collect()
+        assert cache.resolve(GraphReference(digest), graphs) is graphs[digest]
+
+
+class TestGraphFileCache:
+    """Test graph file cache."""
+
+    def setup_method(self):
+        """Create the directory of graph files."""
+        self._file_dir = tempfile.mkdtemp()
+        self._cache = GraphFileCache(os.path.join(self._file_dir, 'graph'))
+
+    def teardown_method(self):
+        """Delete the directory of graph files."""
+        shutil.rmtree(self._file_dir)
+
+    def test_save_and_load(self):
+        """Test a graph saved is loaded by its digest."""
+        graph = _create_graph(b'graph')
+        assert self._cache.load(graph.digest) is None
+        assert self._cache.save(graph)
+        loaded_graph = self._cache.load(graph.digest)
+        assert isinstance(loaded_graph, MSGraph)
+        assert loaded_graph.digest == graph.digest
+        assert self._cache.load(get_graph_digest(b'other graph')) is None
+
+    def test_load_invalid_file(self, monkeypatch):
+        """Test graph files broken or of other versions are not loaded."""
+        graph = _create_graph(b'graph')
+        self._cache.save(graph)
+        monkeypatch.setattr(graph_cache, '_GRAPH_FILE_VERSION', graph_cache._GRAPH_FILE_VERSION + 1)
+        assert self._cache.load(graph.digest) is None
+
+        with open(os.path.join(self._file_dir, 'graph', graph.digest + '.pkl'), 'wb') as graph_file:
+            graph_file.write(b'broken')
+        assert self._cache.load(graph.digest) is None
+
+    def test_read_and_resolve(self):
+        """Test a graph read from graph file is unpickled once, when it is not interned yet."""
+        graph = _create_graph(b'graph')
+        self._cache.save(graph)
+        pickled_graph = self._cache.read(graph.digest)
+        assert isinstance(pickled_graph, PickledGraph)
+
+        cache = GraphCache()
+        loaded_graph = cache.resolve(pickled_graph, {})
+        assert loaded_graph.digest == graph.digest
+        assert cache.resolve(pickled_graph, {}) is loaded_graph
+        assert GraphCache().resolve(pickled_graph._replace(data=b'broken'), {}) is None
+
+    def test_save_failed(self, monkeypatch):
+        """Test a graph failed to pickle or to write is not saved, and leaves no temp file."""
+        graph = _create_graph(b'graph')
+        graph.unpicklable = lambda: None
+        assert not self._cache.save(graph)
+
+        def mock_replace(src, dst):
+            raise OSError('mock replace failed, {} -> {}'.format(src, dst))
+
+        monkeypatch.setattr(os, 'replace', mock_replace)
+        assert not self._cache.save(_create_graph(b'graph'))
+        assert not os.listdir(os.path.join(self._file_dir, 'graph'))
+
+    def test_remove_old_files(self, monkeypatch):
+        """Test the least recently used graph files are removed."""
+        monkeypatch.setattr(graph_cache, 'MAX_GRAPH_FILE_COUNT', 2)
+        graphs = [_create_graph(str(index).encode()) for index in range(3)]
+        for mtime, graph in enumerate(graphs[:2]):
+            self._cache.save(graph)
+            os.utime(os.path.join(self._file_dir, 'graph', graph.digest + '.pkl'), (mtime, mtime))
+        self._cache.load(graphs[0].digest)
+        self._cache.save(graphs[2])
+        assert self._cache.load(graphs[0].digest) is not None
+        assert self._cache.load(graphs[1].digest) is None
+        assert self._cache.load(graphs[2].digest) is not None
@@ -0,0 +1,59 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""
+Function:
+    Test mindinsight.datavisual.data_transform.graph.node.
+Usage:
+    pytest tests/ut/datavisual
+"""
+import pickle
+
+import pytest
+
+from mindinsight.datavisual.data_transform.graph.node import Node
+
+
+class TestNode:
+    """Test node."""
+
+    def test_proxies(self):
+        """Test proxy inputs and outputs are empty until any is added."""
+        node = Node('Default/add1', node_id='1')
+        assert not node.proxy_inputs and not node.proxy_outputs
+        assert node.to_dict()['proxy_input'] == {}
+        with pytest.raises(KeyError):
+            node.delete_proxy_inputs('Default/add2')
+
+        node.add_proxy_inputs('Default/add2', dict(edge_type='data'))
+        node.add_proxy_outputs('Default/add3', dict(edge_type='data'))
+        assert node.to_dict()['proxy_input'] == {'Default/add2': dict(edge_type='data')}
+        assert dict(node.proxy_outputs) == {'Default/add3': dict(edge_type='data')}
+        node.delete_proxy_outputs('Default/add3')
+        assert not node.proxy_outputs
+        assert not Node('Default/add2', node_id='2').proxy_inputs
+
+    def test_pickle(self):
+        """Test node is pickled with all its fields, as graphs are sent to other processes."""
+        node = Node('Default/add1', node_id='1')
+        node.type = 'Add'
+        node.scope = 'Default'
+        node.add_attr({'format': 'NCHW'})
+        node.add_inputs('Default/x', dict(edge_type='data'))
+        node.add_proxy_outputs('Default/y', dict(edge_type='data'))
+
+        restored_node = pickle.loads(pickle.dumps(node))
+        assert restored_node.node_id == '1'
+        assert restored_node.scope == 'Default'
+        assert restored_node.to_dict() == node.to_dict()
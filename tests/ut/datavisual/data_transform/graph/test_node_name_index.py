@@ -0,0 +1,71 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""
+Function:
+    Test mindinsight.datavisual.data_transform.graph.node_name_index.
+Usage:
+    pytest tests/ut/datavisual
+"""
+import pytest
+
+from mindinsight.datavisual.data_transform.graph.node import Node
+from mindinsight.datavisual.data_transform.graph.node_name_index import NodeNameIndex
+
+NODE_NAMES = ['Default', 'Default/ops', 'Default/ops/Weight', 'Default/Conv2D-op1', 'Default/opsConv/ReLU-op2',
+              'Gradients/Default/ops', 'Gradients/Default/ReLU-OPS3', 'Default/İnput']
+LEAF_NODE_NAMES = {'Default/ops/Weight', 'Default/Conv2D-op1', 'Default/opsConv/ReLU-op2', 'Gradients/Default/ops',
+                   'Gradients/Default/ReLU-OPS3', 'Default/İnput'}
+
+
+class TestNodeNameIndex:
+    """Test node name index."""
+
+    def setup_method(self):
+        """Build the index of the nodes."""
+        self._nodes = [Node(name, node_id=name) for name in NODE_NAMES]
+        self._index = NodeNameIndex(self._nodes, LEAF_NODE_NAMES)
+
+    @pytest.mark.parametrize('pattern', ['ops', 'OPS', 'default/', 'op', 'relu', 'input', 't/o', 'missing', ''])
+    def test_search(self, pattern):
+        """Test nodes are searched as matching every name."""
+        lowercase_pattern = pattern.lower()
+        expected_names = [name for name in NODE_NAMES if lowercase_pattern in name.lower()]
+        assert [node.name for node in self._index.search(pattern)] == expected_names
+
+        expected_names = [name for name in expected_names if name in LEAF_NODE_NAMES]
+        assert [node.name for node in self._index.search(pattern, leaf_only=True)] == expected_names
+
+    @pytest.mark.parametrize('pattern', ['ops', 'default', 'Default/o', 'ault/ops', 'relu', 'weight', 'missing'])
+    def test_search_in_last_segment(self, pattern):
+        """Test nodes whose last match of the pattern ends in the last segment of the name are searched."""
+        lowercase_pattern = pattern.lower()
+        expected_names = []
+        for name in NODE_NAMES:
+            name_index = name.lower().rfind(lowercase_pattern)
+            if name_index >= 0 and name.lower().find('/', name_index + len(lowercase_pattern)) == -1:
+                expected_names.append(name)
+        searched_nodes = self._index.search(pattern, in_last_segment=True)
+        assert [node.name for node in searched_nodes] == expected_names
+
+    def test_search_lazily(self):
+        """Test nodes are searched only when they are iterated."""
+        searched_nodes = self._index.search('default')
+        assert next(searched_nodes) is self._nodes[0]
+        assert next(searched_nodes) is self._nodes[1]
+
+    def test_search_separator(self):
+        """Test no node is searched by a pattern spanning two names, or if there is no node."""
+        assert not list(self._index.search('Default\0Default'))
+        assert not list(NodeNameIndex([], set()).search(''))
@@ -18,6 +18,7 @@ Function:
 Usage:
     pytest tests/ut/datavisual
 """
+import datetime
 import os
 import shutil
 import tempfile
@@ -211,3 +212,150 @@ class TestDataManager:
         assert sorted(current_loader_ids) == sorted(expected_loader_ids)
 
         shutil.rmtree(summary_base_dir)
+
+    def test_load_changed_train_jobs(self):
+        """Test only the changed train jobs are loaded."""
+        summary_base_dir = tempfile.mkdtemp()
+        for i in range(2):
+            self._make_path_and_file_list(os.path.join(summary_base_dir, f'dir{i}'))
+        mock_manager = data_manager.DataManager(summary_base_dir)
+        mock_manager.start_load_data().join()
+        assert sorted(mock_manager.get_brief_cache().get_train_jobs()) == ['./dir0', './dir1']
+
+        self._make_path_and_file_list(os.path.join(summary_base_dir, 'dir2'))
+        shutil.rmtree(os.path.join(summary_base_dir, 'dir1'))
+        mock_manager._detail_cache._execute_loader = Mock(return_value=True)
+        mock_manager._load_data({'./dir1', './dir2'})
+
+        assert sorted(mock_manager.get_brief_cache().get_train_jobs()) == ['./dir0', './dir2']
+        loaded_ids = sorted(call[0][0] for call in mock_manager._detail_cache._execute_loader.call_args_list)
+        assert loaded_ids == ['./dir1', './dir2']
+        shutil.rmtree(summary_base_dir)
+
+    def test_get_data_version_not_accessing(self):
+        """Test getting the version of data does not count as accessing the train job."""
+        summary_base_dir = tempfile.mkdtemp()
+        self._make_path_and_file_list(os.path.join(summary_base_dir, 'dir0'))
+        mock_manager = data_manager.DataManager(summary_base_dir)
+        mock_manager.start_load_data().join()
+        brief_cache = mock_manager.get_brief_cache()
+        last_access_time = brief_cache.get_last_access_time('./dir0')
+
+        mock_manager.get_data_version(['./dir0'])
+        assert brief_cache.get_last_access_time('./dir0') == last_access_time
+        mock_manager.shutdown()
+        shutil.rmtree(summary_base_dir)
+
+    def test_shutdown(self):
+        """Test the snapshots are saved and the worker processes are shut down, and created again by the next load."""
+        summary_base_dir = tempfile.mkdtemp()
+        self._make_path_and_file_list(os.path.join(summary_base_dir, 'dir0'))
+        mock_manager = data_manager.DataManager(summary_base_dir)
+        mock_manager.start_load_data().join()
+        computing_resource_mgr = mock_manager._computing_resource_mgr
+        computing_resource_mgr.shutdown = Mock(wraps=computing_resource_mgr.shutdown)
+        mock_manager._detail_cache.save_snapshots = Mock()
+
+        mock_manager.shutdown()
+        mock_manager._detail_cache.save_snapshots.assert_called_once_with(force=True)
+        computing_resource_mgr.shutdown.assert_called_once()
+        assert mock_manager._computing_resource_mgr is None
+
+        mock_manager.start_load_data().join()
+        assert mock_manager._computing_resource_mgr not in (None, computing_resource_mgr)
+        assert mock_manager.get_train_job('./dir0') is not None
+        mock_manager.shutdown()
+        shutil.rmtree(summary_base_dir)
+
+    def test_load_foreground_train_jobs_first(self, monkeypatch):
+        """Test the train jobs accessed recently are loaded first, and the others are loaded in turn meanwhile."""
+        summary_base_dir = tempfile.mkdtemp()
+        for i in range(3):
+            self._make_path_and_file_list(os.path.join(summary_base_dir, f'dir{i}'))
+        mock_manager = data_manager.DataManager(summary_base_dir)
+        mock_manager.start_load_data().join()
+
+        loaded_ids = []
+        def execute_loader(loader_id, _):
+            loaded_ids.append(loader_id)
+            # The foreground train job is finished loading in the third round.
+            return loaded_ids.count(loader_id) > 2 or loader_id != './dir1'
+
+        monkeypatch.setattr(data_manager, 'BACKGROUND_TIME_SLICE_RATIO', 0)
+        mock_manager.get_brief_cache().update_access_time('./dir1')
+        mock_manager._detail_cache._execute_loader = execute_loader
+        mock_manager._load_data()
+
+        # One background train job is loaded in turn in each round until the foreground one is finished.
+        assert loaded_ids[0:5:2] == ['./dir1', './dir1', './dir1']
+        assert sorted(loaded_ids[1:4:2]) == ['./dir0', './dir2']
+        assert sorted(loaded_ids[5:]) == ['./dir0', './dir2']
+        shutil.rmtree(summary_base_dir)
+
+    def test_evict_over_memory_budget(self, monkeypatch):
+        """Test background train jobs and then samples of heavy plugins are evicted when memory budget is exceeded."""
+        summary_base_dir = tempfile.mkdtemp()
+        loader_dict = self._make_loader_dict(summary_base_dir, 3)
+        nbytes_by_loader = {'./job0': {'scalar': 300, 'image': 500},
+                            './job1': {'scalar': 300, 'tensor': 2000},
+                            './job2': {'scalar': 300, 'image': 700}}
+        evicted_plugins = []
+
+        def evict_samples(plugin_name):
+            evicted_plugins.append(plugin_name)
+            nbytes_by_loader['./job1'][plugin_name] //= 2
+            return nbytes_by_loader['./job1'][plugin_name]
+
+        for loader_id, loader in loader_dict.items():
+            loader.data_loader.get_nbytes_by_plugin = Mock(return_value=nbytes_by_loader[loader_id])
+        loader_dict['./job1'].data_loader.get_events_data = Mock(return_value=Mock(evict_samples=evict_samples))
+        monkeypatch.setattr(data_manager.settings, 'MAX_DETAIL_CACHE_BYTES', 2000)
+        detail_cache = data_manager._DetailCacheManager(summary_base_dir, lambda train_id: train_id == './job1')
+        detail_cache._deal_loaders(list(loader_dict.items()))
+
+        detail_cache._check_memory_budget()
+        assert sorted(detail_cache._loader_pool) == ['./job1', './job2']
+        assert evicted_plugins == ['tensor', 'tensor']
+        assert detail_cache.get_memory_usage()['total_bytes'] == 1800
+
+        # The evicted train job is not loaded again until it is requested to be cached.
+        detail_cache._deal_loaders(list(loader_dict.items()))
+        assert sorted(detail_cache._loader_pool) == ['./job1', './job2']
+        shutil.rmtree(summary_base_dir)
+
+    def test_evict_least_recently_accessed(self, monkeypatch):
+        """Test the least recently accessed train job is evicted first, and readmitted when memory frees up."""
+        summary_base_dir = tempfile.mkdtemp()
+        loader_dict = self._make_loader_dict(summary_base_dir, 3)
+        nbytes_by_loader = {'./job0': {'scalar': 1000},
+                            './job1': {'scalar': 1000},
+                            './job2': {'scalar': 1000}}
+        for loader_id, loader in loader_dict.items():
+            loader.data_loader.get_nbytes_by_plugin = Mock(side_effect=lambda loader_id=loader_id:
+                                                           nbytes_by_loader[loader_id])
+        # The latest updated train job is accessed least recently.
+        now = datetime.datetime.utcnow()
+        access_times = {'./job0': now - datetime.timedelta(minutes=1),
+                        './job2': now - datetime.timedelta(minutes=2)}
+        monkeypatch.setattr(data_manager.settings, 'MAX_DETAIL_CACHE_BYTES', 2500)
+        detail_cache = data_manager._DetailCacheManager(summary_base_dir, get_last_access_time=access_times.get)
+        detail_cache._deal_loaders(list(loader_dict.items()))
+
+        detail_cache._check_memory_budget()
+        assert sorted(detail_cache._loader_pool) == ['./job0', './job2']
+        detail_cache._deal_loaders(list(loader_dict.items()))
+        assert sorted(detail_cache._loader_pool) == ['./job0', './job2']
+
+        # The evicted train job is readmitted when the events data shrink to half of the budget.
+        nbytes_by_loader['./job0']['scalar'] = nbytes_by_loader['./job2']['scalar'] = 500
+        detail_cache._check_memory_budget()
+        detail_cache._deal_loaders(list(loader_dict.items()))
+        assert sorted(detail_cache._loader_pool) == ['./job0', './job1', './job2']
+
+        # The deleted train job is forgotten.
+        nbytes_by_loader['./job0']['scalar'] = nbytes_by_loader['./job2']['scalar'] = 1000
+        detail_cache._check_memory_budget()
+        assert sorted(detail_cache._loader_pool) == ['./job0', './job2']
+        detail_cache.delete_train_job('./job1')
+        assert not detail_cache._evicted_loader_ids
+        shutil.rmtree(summary_base_dir)
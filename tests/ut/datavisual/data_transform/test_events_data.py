@@ -26,6 +26,8 @@ import pytest
 from mindinsight.conf import settings
 from mindinsight.datavisual.data_transform import events_data
 from mindinsight.datavisual.data_transform.events_data import EventsData, TensorEvent, _Tensor
+from mindinsight.datavisual.data_transform.image_container import ImageContainer
+from mindinsight.datavisual.proto_files.mindinsight_summary_pb2 import Summary
 
 from ..mock import MockLogger
 
@@ -46,6 +48,11 @@ class MockReservoir:
 
         return self._samples
 
+    def latest_step(self):
+        """Replace the latest_step function."""
+
+        return self._samples[-1].step if self._samples else None
+
     def add_sample(self, sample):
         """Replace the add_sample function."""
 
@@ -122,7 +129,7 @@ class TestEventsData:
     def test_add_tensor_event_out_of_order(self):
         """Test add_tensor_event success for out_of_order summaries."""
         wall_time = 1
-        value = '1'
+        value = 1.0
         tag = 'tag'
         plugin_name = 'scalar'
         file1 = 'file1'
@@ -168,3 +175,38 @@ class TestEventsData:
         for step, sample in zip(steps, samples):
             filename = file2 if sample.step in new_steps_2 else file1
             assert sample == _Tensor(wall_time, step, value, filename)
+
+    def test_evict_samples(self):
+        """Test every other sample of the plugin is evicted, and the latest one is kept."""
+        ev_data = EventsData()
+        for step in range(1, 6):
+            image = ImageContainer(Summary.Image(height=1, width=1, colorspace=1, encoded_image=b'\0' * 10000))
+            for tag, plugin_name, value in (('input', 'image', image), ('loss', 'scalar', 1.0)):
+                ev_data.add_tensor_event(TensorEvent(wall_time=1, step=step, tag=tag, plugin_name=plugin_name,
+                                                     value=value, filename='file'))
+        nbytes_by_plugin = ev_data.get_nbytes_by_plugin()
+        assert nbytes_by_plugin['image'] > 5 * 10000
+        assert ev_data.nbytes == sum(nbytes_by_plugin.values())
+
+        freed_bytes = ev_data.evict_samples('image')
+        assert [tensor.step for tensor in ev_data.tensors('input')] == [1, 3, 5]
+        assert [tensor.step for tensor in ev_data.tensors('loss')] == [1, 2, 3, 4, 5]
+        assert freed_bytes > 2 * 10000
+        assert ev_data.get_nbytes_by_plugin()['image'] == nbytes_by_plugin['image'] - freed_bytes
+
+    def test_version(self):
+        """Test the version changes whenever samples are added or removed, or tags are deleted."""
+        ev_data = EventsData()
+        versions = [ev_data.version]
+        for step in range(1, 3):
+            for tag in ('loss', 'lr'):
+                ev_data.add_tensor_event(TensorEvent(wall_time=1, step=step, tag=tag, plugin_name='scalar',
+                                                     value=1.0, filename='file'))
+                versions.append(ev_data.version)
+        assert ev_data.version == versions[-1]
+
+        ev_data.evict_samples('scalar')
+        versions.append(ev_data.version)
+        ev_data.delete_tensor_event('lr')
+        versions.append(ev_data.version)
+        assert len(set(versions)) == len(versions)
@@ -0,0 +1,197 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""
+Function:
+    Test mindinsight.datavisual.data_transform.events_snapshot.
+Usage:
+    pytest tests/ut/datavisual
+"""
+import os
+import shutil
+import tempfile
+import types
+
+import numpy as np
+import pytest
+
+from mindinsight.datavisual.common.enums import PluginNameEnum
+from mindinsight.datavisual.data_transform import events_snapshot
+from mindinsight.datavisual.data_transform.events_data import EventsData, TensorEvent
+from mindinsight.datavisual.data_transform.histogram_container import HistogramContainer
+from mindinsight.datavisual.data_transform.image_container import ImageContainer, ImageReference
+from mindinsight.datavisual.data_transform.tensor_container import TensorContainer
+from mindinsight.datavisual.proto_files import mindinsight_anf_ir_pb2 as anf_ir_pb2
+from mindinsight.datavisual.proto_files.mindinsight_summary_pb2 import Summary
+
+
+def _build_events_data():
+    """Build events data with samples of scalar, image, histogram and tensor."""
+    image = Summary.Image(height=2, width=3, colorspace=3, encoded_image=b'\x89PNG')
+    histogram = Summary.Histogram(max=3.0, min=-1.0)
+    for left, width, count in ((1.0, 2.0, 5), (-1.0, 2.0, 3)):
+        histogram.buckets.add(left=left, width=width, count=count)
+    tensor = anf_ir_pb2.TensorProto(dims=[2, 2], data_type=11, float_data=[1.0, 2.0, 3.0, 4.5])
+
+    events_data = EventsData()
+    for step in range(1, 4):
+        for tag, plugin_name, value in (('loss', PluginNameEnum.SCALAR.value, step * 0.5),
+                                        ('input', PluginNameEnum.IMAGE.value, ImageContainer(image)),
+                                        ('weight', PluginNameEnum.HISTOGRAM.value, HistogramContainer(histogram)),
+                                        ('bias', PluginNameEnum.TENSOR.value, TensorContainer(tensor))):
+            events_data.add_tensor_event(TensorEvent(wall_time=100.0 + step, step=step, tag=tag,
+                                                     plugin_name=plugin_name, value=value,
+                                                     filename='summary.{}'.format(step % 2)))
+    return events_data
+
+
+class TestEventsSnapshot:
+    """Test events snapshot."""
+
+    @pytest.fixture(autouse=True)
+    def temp_summary_dir(self):
+        """Use a temp summary directory, as snapshots of missing directories are removed."""
+        self.summary_dir = tempfile.mkdtemp()
+        yield
+        shutil.rmtree(self.summary_dir)
+
+    def test_save_and_load(self):
+        """Test the events data saved is restored."""
+        events_data = _build_events_data()
+        loader_state = dict(valid_filenames=['summary.0', 'summary.1'])
+        assert events_snapshot.save_snapshot(self.summary_dir, loader_state, events_data.get_state())
+
+        restored_loader_state, events_state = events_snapshot.load_snapshot(self.summary_dir)
+        assert restored_loader_state == loader_state
+        restored_events_data = EventsData()
+        restored_events_data.restore_state(events_state)
+
+        for plugin_name in (PluginNameEnum.SCALAR.value, PluginNameEnum.IMAGE.value,
+                            PluginNameEnum.HISTOGRAM.value, PluginNameEnum.TENSOR.value):
+            assert restored_events_data.list_tags_by_plugin(plugin_name) == \
+                   events_data.list_tags_by_plugin(plugin_name)
+
+        tensors = restored_events_data.tensors('loss')
+        assert [(tensor.step, tensor.wall_time, tensor.value, tensor.filename) for tensor in tensors] == \
+               [(1, 101.0, 0.5, 'summary.1'), (2, 102.0, 1.0, 'summary.0'), (3, 103.0, 1.5, 'summary.1')]
+
+        image = restored_events_data.tensors('input')[0].value
+        assert (image.height, image.width, image.colorspace, image.encoded_image) == (2, 3, 3, b'\x89PNG')
+
+        histogram = restored_events_data.tensors('weight')[0].value
+        expected_histogram = events_data.tensors('weight')[0].value
+        assert (histogram.max, histogram.min, histogram.count) == (3.0, -1.0, 8)
+        assert histogram.buckets() == expected_histogram.buckets()
+
+        tensor = restored_events_data.tensors('bias')[0].value
+        assert tensor.dims == (2, 2)
+        assert tensor.data_type == 11
+        assert np.array_equal(tensor.ndarray, np.array([[1.0, 2.0], [3.0, 4.5]]))
+
+    def test_load_other_summary_dir(self):
+        """Test no snapshot is loaded for another summary directory."""
+        events_data = _build_events_data()
+        assert events_snapshot.save_snapshot(self.summary_dir, {}, events_data.get_state())
+        assert events_snapshot.load_snapshot('/other_summary_dir') is None
+
+    def test_save_image_reference(self):
+        """Test the reference of image is saved instead of the encoded image."""
+        image = Summary.Image(height=2, width=3, colorspace=3)
+        reference = ImageReference('/summary_dir/summary.1', 1024, 1)
+        events_data = EventsData()
+        events_data.add_tensor_event(TensorEvent(wall_time=1.0, step=1, tag='input',
+                                                 plugin_name=PluginNameEnum.IMAGE.value,
+                                                 value=ImageContainer(image, reference), filename='summary.1'))
+        assert events_snapshot.save_snapshot(self.summary_dir, {}, events_data.get_state())
+
+        _, events_state = events_snapshot.load_snapshot(self.summary_dir)
+        restored_events_data = EventsData()
+        restored_events_data.restore_state(events_state)
+        restored_image = restored_events_data.tensors('input')[0].value
+        assert restored_image.reference == reference
+        assert (restored_image.height, restored_image.width) == (2, 3)
+
+    def test_save_changed_tags_only(self):
+        """Test only the tags whose samples change are saved again."""
+        events_data = _build_events_data()
+        assert events_snapshot.save_snapshot(self.summary_dir, {}, events_data.get_state())
+        snapshot_path = events_snapshot.get_snapshot_path(self.summary_dir)
+        inodes = {filename: os.stat(os.path.join(snapshot_path, filename)).st_ino
+                  for filename in os.listdir(snapshot_path)}
+        assert len(inodes) == 5
+
+        events_data.add_tensor_event(TensorEvent(wall_time=104.0, step=4, tag='loss',
+                                                 plugin_name=PluginNameEnum.SCALAR.value, value=2.0,
+                                                 filename='summary.0'))
+        assert events_snapshot.save_snapshot(self.summary_dir, {}, events_data.get_state())
+        changed_filenames = [filename for filename, inode in inodes.items()
+                             if os.stat(os.path.join(snapshot_path, filename)).st_ino != inode]
+        assert len(changed_filenames) == 2
+        assert 'meta.json' in changed_filenames
+        assert any(filename.startswith('scalar.') for filename in changed_filenames)
+
+        _, events_state = events_snapshot.load_snapshot(self.summary_dir)
+        restored_events_data = EventsData()
+        restored_events_data.restore_state(events_state)
+        assert [tensor.step for tensor in restored_events_data.tensors('loss')] == [1, 2, 3, 4]
+        assert len(restored_events_data.tensors('input')) == 3
+
+    def test_save_tensor_as_float32(self):
+        """Test tensors are stored as float32, and restored as float64 as they are loaded."""
+        events_data = _build_events_data()
+        assert events_snapshot.save_snapshot(self.summary_dir, {}, events_data.get_state())
+        snapshot_path = events_snapshot.get_snapshot_path(self.summary_dir)
+        tensor_filename = next(filename for filename in os.listdir(snapshot_path) if filename.startswith('tensor.'))
+        with np.load(os.path.join(snapshot_path, tensor_filename)) as arrays:
+            assert arrays['data'].dtype == np.float32
+
+        _, events_state = events_snapshot.load_snapshot(self.summary_dir)
+        assert events_state['reservoirs']['bias']['samples'][0].value.ndarray.dtype == np.float64
+
+    def test_load_pickle_writable_by_others(self):
+        """Test pickled values are not loaded from a file writable by others, and the snapshot is saved again."""
+        events_data = EventsData()
+        events_data.add_tensor_event(TensorEvent(wall_time=1.0, step=1, tag='graph',
+                                                 plugin_name=PluginNameEnum.GRAPH.value,
+                                                 value=types.SimpleNamespace(digest=None, name='graph'),
+                                                 filename='summary.1'))
+        assert events_snapshot.save_snapshot(self.summary_dir, {}, events_data.get_state())
+        snapshot_path = events_snapshot.get_snapshot_path(self.summary_dir)
+        graph_file_path = next(os.path.join(snapshot_path, filename) for filename in os.listdir(snapshot_path)
+                               if filename.startswith('graph.'))
+        os.chmod(graph_file_path, 0o666)
+        assert events_snapshot.load_snapshot(self.summary_dir) is None
+
+        assert events_snapshot.save_snapshot(self.summary_dir, {}, events_data.get_state())
+        _, events_state = events_snapshot.load_snapshot(self.summary_dir)
+        assert events_state['reservoirs']['graph']['samples'][0].value.name == 'graph'
+
+    def test_remove_old_snapshots(self, monkeypatch):
+        """Test snapshots of removed summary directories, of older versions and beyond the max count are removed."""
+        events_data = _build_events_data()
+        summary_dirs = [tempfile.mkdtemp(dir=self.summary_dir) for _ in range(3)]
+        for index, summary_dir in enumerate(summary_dirs):
+            assert events_snapshot.save_snapshot(summary_dir, {}, events_data.get_state())
+            meta_path = os.path.join(events_snapshot.get_snapshot_path(summary_dir), 'meta.json')
+            os.utime(meta_path, (index, index))
+        old_snapshot_path = events_snapshot.get_snapshot_path(self.summary_dir) + '.npz'
+        with open(old_snapshot_path, 'wb'):
+            pass
+        shutil.rmtree(summary_dirs[2])
+        monkeypatch.setattr(events_snapshot, 'MAX_SNAPSHOT_COUNT', 2)
+
+        assert events_snapshot.save_snapshot(self.summary_dir, {}, events_data.get_state())
+        assert sorted(os.listdir(events_snapshot.get_snapshot_dir())) == sorted(
+            os.path.basename(events_snapshot.get_snapshot_path(summary_dir))
+            for summary_dir in (summary_dirs[1], self.summary_dir))
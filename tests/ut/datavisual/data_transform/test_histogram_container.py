@@ -103,3 +103,36 @@ class TestHistogram:
             (0.0, 0.6666666666666666, 1),
             (0.6666666666666666, 0.6666666666666666, 3),
             (1.3333333333333333, 0.6666666666666666, 0))
+
+    def test_re_sample_buckets_overlapped(self):
+        """Test overlapped buckets when re-sampling."""
+        mocked_input = mock.MagicMock()
+        mocked_input.buckets = []
+        for left, width, count in ((0, 2, 4), (1, 0.5, 2), (2, 1, 3)):
+            mocked_bucket = mock.MagicMock()
+            mocked_bucket.left = left
+            mocked_bucket.width = width
+            mocked_bucket.count = count
+            mocked_input.buckets.append(mocked_bucket)
+        histogram_container = hist.HistogramContainer(mocked_input)
+        histogram_container.histogram.set_visual_range(max_val=3, min_val=0, bins=4)
+        buckets = histogram_container.buckets()
+        assert buckets == ((0.0, 0.75, 2), (0.75, 0.75, 2), (1.5, 0.75, 2), (2.25, 0.75, 3))
+
+    def test_re_sample_buckets_only_when_range_changed(self):
+        """Test buckets are only re-sampled when visual range changed."""
+        mocked_input = mock.MagicMock()
+        mocked_bucket = mock.MagicMock()
+        mocked_bucket.left = 0
+        mocked_bucket.width = 1
+        mocked_bucket.count = 1
+        mocked_input.buckets = [mocked_bucket]
+        histogram_container = hist.HistogramContainer(mocked_input)
+        histogram_container.histogram.set_visual_range(max_val=1, min_val=1, bins=1)
+        buckets = histogram_container.buckets()
+        assert buckets == ((0.5, 1.0, 1),)
+
+        histogram_container.histogram.set_visual_range(max_val=1, min_val=1, bins=1)
+        assert histogram_container.buckets() is buckets
+        histogram_container.histogram.set_visual_range(max_val=1, min_val=0, bins=2)
+        assert histogram_container.buckets() == ((0.0, 0.5, 1), (0.5, 0.5, 1))
@@ -0,0 +1,78 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""
+Function:
+    Test mindinsight.datavisual.data_transform.image_container.
+Usage:
+    pytest tests/ut/datavisual
+"""
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from mindinsight.datavisual.data_transform import image_container
+from mindinsight.datavisual.data_transform.image_container import ImageContainer, ImageReference
+from mindinsight.datavisual.proto_files.mindinsight_summary_pb2 import Event
+
+from ....utils.log_generators.log_generator import LogGenerator
+
+
+class TestImageContainer:
+    """Test image container."""
+
+    @pytest.fixture(autouse=True)
+    def summary_file(self):
+        """Write two records holding images to a summary file."""
+        summary_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(summary_dir, 'test.summary.1')
+        self.offsets = []
+        for step in range(2):
+            event = Event(wall_time=1.0, step=step)
+            event.summary.value.add(tag='loss', scalar_value=0.1)
+            value = event.summary.value.add(tag='input')
+            value.image.height, value.image.width, value.image.colorspace = 2, 3, 3
+            value.image.encoded_image = b'image-%d' % step
+            self.offsets.append(os.path.getsize(self.file_path) if os.path.exists(self.file_path) else 0)
+            # pylint: disable=protected-access
+            LogGenerator._write_log_from_event(self.file_path, event)
+        yield
+        shutil.rmtree(summary_dir)
+
+    def test_read_encoded_image(self):
+        """Test the encoded image is read from summary file by reference."""
+        message = Event(step=0).summary.value.add().image
+        message.height, message.width, message.colorspace = 2, 3, 3
+        container = ImageContainer(message, ImageReference(self.file_path, self.offsets[1], 1))
+
+        assert (container.height, container.width, container.colorspace) == (2, 3, 3)
+        assert container.encoded_image == b'image-1'
+
+        # The value referred to is not an image.
+        container = ImageContainer(message, ImageReference(self.file_path, self.offsets[0], 0))
+        assert container.encoded_image is None
+
+    def test_image_cache(self, monkeypatch):
+        """Test the cache evicts the least recently used images when it is full."""
+        cache = image_container._EncodedImageCache(max_bytes=10)
+        monkeypatch.setattr(image_container, '_IMAGE_CACHE', cache)
+        references = [ImageReference(self.file_path, offset, 1) for offset in self.offsets]
+        message = Event(step=0).summary.value.add().image
+
+        assert ImageContainer(message, references[0]).encoded_image == b'image-0'
+        assert ImageContainer(message, references[1]).encoded_image == b'image-1'
+        assert cache.get(references[0]) is None
+        assert cache.get(references[1]) == b'image-1'
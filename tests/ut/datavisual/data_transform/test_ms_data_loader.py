@@ -18,21 +18,32 @@ Function:
 Usage:
     pytest tests/ut/datavisual
 """
+import json
 import os
 import shutil
 import tempfile
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import pytest
+from google.protobuf.message import DecodeError
 
+from mindinsight.conf import settings
+from mindinsight.datavisual.data_transform import events_data as events_data_module
 from mindinsight.datavisual.data_transform import ms_data_loader
 from mindinsight.datavisual.data_transform.ms_data_loader import MSDataLoader
 from mindinsight.datavisual.data_transform.ms_data_loader import _PbParser
+from mindinsight.datavisual.data_transform.ms_data_loader import _SummaryParser
 from mindinsight.datavisual.data_transform.events_data import TensorEvent
+from mindinsight.datavisual.data_transform.graph.graph_cache import GraphFileCache, GraphReference, PickledGraph
+from mindinsight.datavisual.data_transform.graph.graph_cache import load_pickled_graph
+from mindinsight.datavisual.data_transform.summary_index import SummaryIndex
 from mindinsight.datavisual.common.enums import PluginNameEnum
+from mindinsight.datavisual.proto_files import mindinsight_summary_pb2 as summary_pb2
 
 from ..mock import MockLogger
+from ....utils.log_generators.graph_log_generator import GraphLogGenerator
 from ....utils.log_generators.graph_pb_generator import create_graph_pb_file
+from ....utils.log_generators.scalars_log_generator import ScalarsLogGenerator
 
 # bytes of 3 scalar events
 SCALAR_RECORD = (b'\x1e\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\t\x96\xe1\xeb)>}\xd7A\x10\x01*'
@@ -41,6 +52,8 @@ SCALAR_RECORD = (b'\x1e\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\t\x96\xe1\xe
                  b'\xac`\x85>\x00\x00\x00\x00\x1e\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\t\x96'
                  b'\xe1\xeb)>}\xd7A\x10\x05*\x11\n\x0f\n\x08tag_name\x1d\xf80y?\x00\x00\x00\x00')
 RECORD_LEN = len(SCALAR_RECORD)
+# Each record contains 8 bytes header, 4 bytes header crc, 30 bytes event and 4 bytes event crc.
+SINGLE_RECORD_LEN = RECORD_LEN // 3
 
 
 class TestMsDataLoader:
@@ -91,6 +104,217 @@ class TestMsDataLoader:
         tensors = ms_loader.get_events_data().tensors(tag[0])
         assert len(tensors) == 3
 
+    @pytest.mark.usefixtures('crc_pass')
+    def test_load_success_with_small_batch(self, monkeypatch):
+        """Test load success when records are split into several batches."""
+        monkeypatch.setattr(ms_data_loader, 'MAX_BATCH_RECORDS', 2)
+        summary_dir = tempfile.mkdtemp()
+        file1 = os.path.join(summary_dir, 'summary.01')
+        write_file(file1, SCALAR_RECORD)
+        ms_loader = MSDataLoader(summary_dir)
+        ms_loader.load()
+        shutil.rmtree(summary_dir)
+        tag = ms_loader.get_events_data().list_tags_by_plugin('scalar')
+        tensors = ms_loader.get_events_data().tensors(tag[0])
+        assert [tensor.step for tensor in tensors] == [1, 3, 5]
+
+    @pytest.mark.usefixtures('crc_pass')
+    def test_load_appended_records(self):
+        """Test load records appended to the summary file after the last load."""
+        summary_dir = tempfile.mkdtemp()
+        file1 = os.path.join(summary_dir, 'summary.01')
+        write_file(file1, SCALAR_RECORD[:SINGLE_RECORD_LEN + 10])
+        ms_loader = MSDataLoader(summary_dir)
+        ms_loader.load()
+        tag = ms_loader.get_events_data().list_tags_by_plugin('scalar')
+        assert len(ms_loader.get_events_data().tensors(tag[0])) == 1
+
+        with open(file1, 'ab') as file:
+            file.write(SCALAR_RECORD[SINGLE_RECORD_LEN + 10:])
+        ms_loader.load()
+        shutil.rmtree(summary_dir)
+        tensors = ms_loader.get_events_data().tensors(tag[0])
+        assert [tensor.step for tensor in tensors] == [1, 3, 5]
+
+    @pytest.mark.usefixtures('crc_pass')
+    def test_load_with_summary_index(self):
+        """Test a new loader loads the records selected from the summary index and resumes at its end offset."""
+        summary_dir = tempfile.mkdtemp()
+        file1 = os.path.join(summary_dir, 'summary.01')
+        write_file(file1, SCALAR_RECORD[:SINGLE_RECORD_LEN * 2])
+        MSDataLoader(summary_dir).load()
+        assert SummaryIndex.load(file1).end_offset == SINGLE_RECORD_LEN * 2
+
+        with open(file1, 'ab') as file:
+            file.write(SCALAR_RECORD[SINGLE_RECORD_LEN * 2:])
+        ms_loader = MSDataLoader(summary_dir)
+        ms_loader.load()
+        shutil.rmtree(summary_dir)
+        tag = ms_loader.get_events_data().list_tags_by_plugin('scalar')
+        tensors = ms_loader.get_events_data().tensors(tag[0])
+        assert [tensor.step for tensor in tensors] == [1, 3, 5]
+
+    @pytest.mark.usefixtures('crc_pass')
+    def test_load_with_mismatched_summary_index(self, monkeypatch):
+        """Test the events loaded by the summary index are dropped, and all files are reloaded if it is mismatched."""
+        monkeypatch.setattr(ms_data_loader, 'MAX_BATCH_RECORDS', 1)
+        summary_dir = tempfile.mkdtemp()
+        file1 = os.path.join(summary_dir, 'summary.01')
+        write_file(file1, SCALAR_RECORD)
+        MSDataLoader(summary_dir).load()
+        # The second record selected does not match the file.
+        monkeypatch.setattr(SummaryIndex, 'select_records', lambda *_: [(0, SINGLE_RECORD_LEN),
+                                                                        (SINGLE_RECORD_LEN, SINGLE_RECORD_LEN + 1)])
+
+        ms_loader = MSDataLoader(summary_dir)
+        events_data = ms_loader.get_events_data()
+        ms_loader.load()
+        shutil.rmtree(summary_dir)
+        assert ms_loader.get_events_data() is not events_data
+        assert MockLogger.log_msg['warning'] == "The events data loaded do not match the files, " \
+                                                "we will reload all files in path {}.".format(summary_dir)
+        tag = ms_loader.get_events_data().list_tags_by_plugin('scalar')
+        tensors = ms_loader.get_events_data().tensors(tag[0])
+        assert [tensor.step for tensor in tensors] == [1, 3, 5]
+
+    @pytest.mark.usefixtures('crc_pass')
+    def test_restore_snapshot(self):
+        """Test a new loader restores the events snapshot and continues loading from where it ended."""
+        summary_dir = tempfile.mkdtemp()
+        file1 = os.path.join(summary_dir, 'summary.01')
+        write_file(file1, SCALAR_RECORD[:SINGLE_RECORD_LEN * 2])
+        ms_loader = MSDataLoader(summary_dir)
+        ms_loader.load()
+        ms_loader.save_snapshot(force=True)
+
+        with open(file1, 'ab') as file:
+            file.write(SCALAR_RECORD[SINGLE_RECORD_LEN * 2:])
+        ms_loader = MSDataLoader(summary_dir)
+        assert ms_loader.restore_snapshot()
+        tag = ms_loader.get_events_data().list_tags_by_plugin('scalar')
+        assert [tensor.step for tensor in ms_loader.get_events_data().tensors(tag[0])] == [1, 3]
+
+        ms_loader.load()
+        shutil.rmtree(summary_dir)
+        assert [tensor.step for tensor in ms_loader.get_events_data().tensors(tag[0])] == [1, 3, 5]
+
+    @pytest.mark.usefixtures('crc_pass')
+    def test_save_snapshot_when_idle(self, monkeypatch):
+        """Test the snapshot is saved only when nothing is loaded since the last check, or on force."""
+        summary_dir = tempfile.mkdtemp()
+        file1 = os.path.join(summary_dir, 'summary.01')
+        write_file(file1, SCALAR_RECORD[:SINGLE_RECORD_LEN * 2])
+        ms_loader = MSDataLoader(summary_dir)
+        save_snapshot = Mock(return_value=True)
+        monkeypatch.setattr(ms_data_loader.events_snapshot, 'save_snapshot', save_snapshot)
+        ms_loader.load()
+        ms_loader.save_snapshot()
+        assert not save_snapshot.called
+
+        with open(file1, 'ab') as file:
+            file.write(SCALAR_RECORD[SINGLE_RECORD_LEN * 2:])
+        ms_loader.load()
+        ms_loader.save_snapshot()
+        assert not save_snapshot.called
+        ms_loader.save_snapshot()
+        assert save_snapshot.call_count == 1
+        ms_loader.save_snapshot(force=True)
+        assert save_snapshot.call_count == 1
+        shutil.rmtree(summary_dir)
+
+    @pytest.mark.usefixtures('crc_pass')
+    def test_restore_snapshot_after_file_rewritten(self):
+        """Test the events snapshot is ignored when the summary file is rewritten."""
+        summary_dir = tempfile.mkdtemp()
+        file1 = os.path.join(summary_dir, 'summary.01')
+        write_file(file1, SCALAR_RECORD)
+        ms_loader = MSDataLoader(summary_dir)
+        ms_loader.load()
+        ms_loader.save_snapshot(force=True)
+
+        write_file(file1, SCALAR_RECORD[SINGLE_RECORD_LEN:])
+        ms_loader = MSDataLoader(summary_dir)
+        restored = ms_loader.restore_snapshot()
+        shutil.rmtree(summary_dir)
+        assert not restored
+        assert not ms_loader.get_events_data().get_state()['tags']
+
+    def test_restored_samples_match_cold_load(self, monkeypatch, tmp_path):
+        """Test the samples of loaders restored from the snapshot or the summary index match a cold load."""
+        monkeypatch.setitem(events_data_module.CONFIG['max_step_sizes_per_tag'], PluginNameEnum.SCALAR.value, 40)
+        summary_dir = tempfile.mkdtemp()
+        file1 = os.path.join(summary_dir, 'summary.01')
+        scalars_log_generator = ScalarsLogGenerator()
+        scalars_log_generator.generate_log(file1, range(1, 201), 'tag_name')
+        ms_loader = MSDataLoader(summary_dir)
+        ms_loader.load()
+        ms_loader.save_snapshot(force=True)
+        scalars_log_generator.generate_log(file1, range(201, 261), 'tag_name')
+
+        def get_samples(loader):
+            tag = loader.get_events_data().list_tags_by_plugin(PluginNameEnum.SCALAR.value)[0]
+            tensors = loader.get_events_data().tensors(tag)
+            return [(tensor.step, tensor.wall_time, tensor.value) for tensor in tensors]
+
+        snapshot_loader = MSDataLoader(summary_dir)
+        assert snapshot_loader.restore_snapshot()
+        snapshot_loader.load()
+        index_loader = MSDataLoader(summary_dir)
+        index_loader.load()
+        monkeypatch.setattr(settings, 'WORKSPACE', str(tmp_path / 'cold_workspace'))
+        cold_loader = MSDataLoader(summary_dir)
+        cold_loader.load()
+        shutil.rmtree(summary_dir)
+
+        samples = get_samples(cold_loader)
+        assert len(samples) <= 40
+        # The recent steps are kept at full resolution.
+        assert [sample[0] for sample in samples[-10:]] == list(range(251, 261))
+        assert get_samples(snapshot_loader) == samples
+        assert get_samples(index_loader) == samples
+
+    def test_events_parse(self):
+        """Test parse a batch of event strings."""
+        event_strs = [SCALAR_RECORD[offset + 12:offset + SINGLE_RECORD_LEN - 4]
+                      for offset in range(0, RECORD_LEN, SINGLE_RECORD_LEN)]
+        tensor_events, record_ids = _SummaryParser._events_parse(event_strs, 'summary.01')
+        assert [tensor_event.step for tensor_event in tensor_events] == [1, 3, 5]
+        assert record_ids == [0, 1, 2]
+        assert all(tensor_event.filename == 'summary.01' for tensor_event in tensor_events)
+
+    def test_events_parse_with_bad_event(self):
+        """Test a bad event string in a batch is skipped, and the others are parsed."""
+        event_strs = [SCALAR_RECORD[offset + 12:offset + SINGLE_RECORD_LEN - 4]
+                      for offset in range(0, RECORD_LEN, SINGLE_RECORD_LEN)]
+        event_strs.insert(1, b'\x0a\xff\xff')
+        tensor_events, record_ids = _SummaryParser._events_parse(event_strs, 'summary.01')
+        assert [tensor_event.step for tensor_event in tensor_events] == [1, 3, 5]
+        assert record_ids == [0, 2, 3]
+
+    def test_events_parse_graph_built(self):
+        """Test parse a graph event whose graph is built by other train jobs."""
+        graph_path = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, os.pardir, 'utils',
+                                  'log_generators', 'graph_base.json')
+        with open(graph_path, 'r') as graph_file:
+            graph_dict = json.load(graph_file)
+        event = GraphLogGenerator().generate_event(dict(graph=graph_dict))
+        event_str = event.SerializeToString()
+        tensor_events, _ = _SummaryParser._events_parse([event_str], 'summary.01')
+        graph = tensor_events[0].value
+        assert graph.list_node_by_scope()
+
+        tensor_events, _ = _SummaryParser._events_parse([event_str], 'summary.01',
+                                                        graph_digests=frozenset([graph.digest]))
+        assert tensor_events[0].value == GraphReference(graph.digest)
+        assert tensor_events[0].wall_time == event.wall_time
+
+    @pytest.mark.parametrize('event_str', [b'\x0a\xff\xff', b'\x09\x00', b'\x10\x80', b'\x22\x05\x00', b'\x80'])
+    def test_get_field_span_of_malformed_event(self, event_str):
+        """Test malformed event strings are left to the parser to report."""
+        assert ms_data_loader._get_field_span(event_str, ms_data_loader._GRAPH_DEF_FIELD_NUMBER) is None
+        with pytest.raises(DecodeError):
+            summary_pb2.Event.FromString(event_str)
+
     @pytest.mark.usefixtures('crc_fail')
     def test_load_with_crc_fail(self):
         """Test when crc_fail and will not go to func _event_parse."""
@@ -131,6 +355,26 @@ class TestMsDataLoader:
         assert len(plugins) == 1
         assert plugins[0] == filename
 
+    def test_load_same_graph_of_train_jobs(self):
+        """Test the same graph of train jobs is built once and shared."""
+        filename = 'ms_output.pb'
+        summary_dirs = [tempfile.mkdtemp(), tempfile.mkdtemp()]
+        graphs = []
+        for summary_dir in summary_dirs:
+            create_graph_pb_file(output_dir=summary_dir, filename=filename)
+            ms_loader = MSDataLoader(summary_dir)
+            ms_loader.load()
+            graphs.append(ms_loader.get_events_data().tensors(filename)[0].value)
+            shutil.rmtree(summary_dir)
+        assert graphs[0] is graphs[1]
+        assert graphs[0].digest is not None
+
+        summary_dir = tempfile.mkdtemp()
+        create_graph_pb_file(output_dir=summary_dir, filename=filename)
+        tensor_event = _PbParser._parse_pb_file(summary_dir, filename, frozenset([graphs[0].digest]))
+        shutil.rmtree(summary_dir)
+        assert tensor_event.value == GraphReference(graphs[0].digest)
+
 
 class TestPbParser:
     """Test pb parser"""
@@ -152,6 +396,22 @@ class TestPbParser:
         tensor_event = parser._parse_pb_file(self._summary_dir, filename)
         assert isinstance(tensor_event, TensorEvent)
 
+    def test_parse_pb_file_with_graph_file_cache(self):
+        """Test the graph built from pb file is saved, and loaded instead of being built again."""
+        filename = 'ms_output.pb'
+        create_graph_pb_file(output_dir=self._summary_dir, filename=filename)
+        graph_file_cache = GraphFileCache(os.path.join(self._summary_dir, 'graph'))
+        graph = _PbParser._parse_pb_file(self._summary_dir, filename, graph_file_cache=graph_file_cache).value
+
+        with patch.object(_PbParser, '_build_graph') as mock_build_graph:
+            pickled_graph = _PbParser._parse_pb_file(self._summary_dir, filename,
+                                                     graph_file_cache=graph_file_cache).value
+        mock_build_graph.assert_not_called()
+        assert isinstance(pickled_graph, PickledGraph)
+        loaded_graph = load_pickled_graph(pickled_graph)
+        assert loaded_graph.digest == graph.digest
+        assert loaded_graph.list_node_by_scope() == graph.list_node_by_scope()
+
     def test_set_latest_file(self):
         """Test set latest file."""
         filename = 'ms_output.pb'
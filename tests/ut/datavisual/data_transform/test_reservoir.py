@@ -13,11 +13,80 @@
 # limitations under the License.
 # ============================================================================
 """Test reservoir."""
+import bisect
+import random
 import unittest.mock as mock
 
 import mindinsight.datavisual.data_transform.reservoir as reservoir
 
 
+def _apply_delta(samples, delta):
+    """Apply the samples changed to the samples got before, as a client does."""
+    if delta.step_ranges is None:
+        return list(delta.samples)
+    kept = [sample for sample in samples
+            if not any(start <= sample.step <= end for start, end in delta.step_ranges)]
+    return sorted(kept + list(delta.samples), key=lambda sample: sample.step)
+
+
+class TestReservoir:
+    """Test reservoir."""
+    @mock.patch.object(reservoir._SortedSamples, '_BLOCK_SIZE', 4)
+    def test_samples_sorted_by_step(self):
+        """Test samples are sorted by step after adding and evicting samples across blocks."""
+        my_reservoir = reservoir.Reservoir(size=50)
+        expected_samples = []
+        sample_selector = random.Random(0)
+        step_generator = random.Random(1)
+        for sample_counter in range(1000):
+            sample = reservoir.ScalarSample(wall_time=0.0, step=step_generator.randint(0, 2000), value=0.0,
+                                            filename=str(sample_counter))
+            my_reservoir.add_sample(sample)
+
+            if len(expected_samples) >= 50:
+                rand_int = sample_selector.randint(0, sample_counter)
+                expected_samples.pop(rand_int if rand_int < 50 else -1)
+            index = bisect.bisect_left([expected.step for expected in expected_samples], sample.step)
+            expected_samples.insert(index, sample)
+
+        assert my_reservoir.samples() == expected_samples
+        assert my_reservoir.latest_step() == expected_samples[-1].step
+
+    @mock.patch.object(reservoir, '_MAX_LOGGED_CHANGES', 4)
+    def test_samples_since(self):
+        """Test samples got incrementally are the same as all the samples, and removing samples resets them."""
+        my_reservoir = reservoir.Reservoir(size=20)
+        client_samples = []
+        version = 0
+        steps = random.Random(0).sample(range(5000), 500)
+        for index, step in enumerate(steps):
+            my_reservoir.add_sample(reservoir.ScalarSample(wall_time=0.0, step=step, value=0.0, filename='file'))
+            if index % 7 == 0:
+                delta = my_reservoir.samples_since(version)
+                assert (delta.step_ranges is None) == (version == 0)
+                client_samples = _apply_delta(client_samples, delta)
+                assert client_samples == my_reservoir.samples()
+                version = delta.version
+
+        delta = my_reservoir.samples_since(my_reservoir.version)
+        assert delta == reservoir.SamplesDelta(my_reservoir.version, [], [])
+
+        my_reservoir.remove_sample(lambda sample: sample.step % 2)
+        delta = my_reservoir.samples_since(version)
+        assert delta.step_ranges is None
+        assert delta.samples == my_reservoir.samples()
+
+    def test_samples_since_version_of_other_process(self):
+        """Test versions not got from this process, e.g. before restarting, reset the samples."""
+        my_reservoir = reservoir.Reservoir(size=20)
+        for step in range(3):
+            my_reservoir.add_sample(reservoir.ScalarSample(wall_time=0.0, step=step, value=0.0, filename='file'))
+        for version in [1, 10 ** 9, my_reservoir.version + 1, my_reservoir.version * 2]:
+            delta = my_reservoir.samples_since(version)
+            assert delta.step_ranges is None
+            assert delta.samples == my_reservoir.samples()
+
+
 class TestHistogramReservoir:
     """Test histogram reservoir."""
     def test_samples(self):
@@ -39,3 +108,145 @@ class TestHistogramReservoir:
         my_reservoir.add_sample(sample2)
         samples = my_reservoir.samples()
         assert len(samples) == 2
+
+    def test_visual_range_updated_incrementally(self):
+        """Test visual range is updated when samples are added or removed, and only set when samples change."""
+        my_reservoir = reservoir.ReservoirFactory().create_reservoir(reservoir.PluginNameEnum.HISTOGRAM.value, size=2)
+        samples = []
+        for step, (max_val, min_val) in enumerate(((3.0, 0.0), (1.0, -2.0), (2.0, 1.0)), start=1):
+            sample = mock.MagicMock()
+            sample.value.count = 100
+            sample.value.max = max_val
+            sample.value.min = min_val
+            sample.step = step
+            samples.append(sample)
+
+        my_reservoir.add_sample(samples[0])
+        my_reservoir.add_sample(samples[1])
+        my_reservoir.samples()
+        samples[0].value.histogram.set_visual_range.assert_called_once_with(3.0, -2.0, 11)
+        version = my_reservoir.version
+        assert my_reservoir.samples_since(version).step_ranges == []
+        my_reservoir.samples()
+        samples[0].value.histogram.set_visual_range.assert_called_once_with(3.0, -2.0, 11)
+
+        # The sample of step 2 is evicted, so the visual range shrinks, and all the histograms are changed.
+        my_reservoir.add_sample(samples[2])
+        assert my_reservoir.samples() == [samples[0], samples[2]]
+        samples[2].value.histogram.set_visual_range.assert_called_once_with(3.0, 0.0, 11)
+        assert my_reservoir.samples_since(version).step_ranges is None
+
+        my_reservoir.remove_sample(lambda sample: sample.step != 1)
+        my_reservoir.samples()
+        samples[2].value.histogram.set_visual_range.assert_called_with(2.0, 1.0, 11)
+
+    def test_ranges_not_read_when_adding(self):
+        """Test the ranges of samples are not read until samples are got, as they may be calculated on access."""
+        my_reservoir = reservoir.ReservoirFactory().create_reservoir(reservoir.PluginNameEnum.TENSOR.value, size=2)
+        count = mock.PropertyMock(return_value=100)
+        for step in range(1, 5):
+            sample = mock.MagicMock()
+            type(sample.value).count = count
+            sample.value.max = float(step)
+            sample.value.min = 0.0
+            sample.step = step
+            my_reservoir.add_sample(sample)
+        count.assert_not_called()
+        assert len(my_reservoir.samples()) == 2
+        assert count.call_count
+
+    def test_evict_samples(self):
+        """Test every other sample is evicted without reading ranges, and the reservoir does not grow again."""
+        my_reservoir = reservoir.ReservoirFactory().create_reservoir(reservoir.PluginNameEnum.TENSOR.value, size=0)
+        count = mock.PropertyMock(return_value=100)
+        for step in range(1, 6):
+            sample = mock.MagicMock(step=step)
+            type(sample.value).count = count
+            sample.value.configure_mock(nbytes=1000, max=float(step), min=0.0)
+            my_reservoir.add_sample(sample)
+        my_reservoir.samples()
+        count.reset_mock()
+        version = my_reservoir.version
+
+        assert my_reservoir.evict_samples() == 2 * (1000 + reservoir.SAMPLE_OVERHEAD_BYTES)
+        count.assert_not_called()
+        # The change is logged by steps, and the visual range does not change, so clients do not get a reset.
+        assert my_reservoir.samples_since(version).step_ranges == [[1, 5]]
+        assert [sample.step for sample in my_reservoir.samples()] == [1, 3, 5]
+
+        for step in range(6, 10):
+            sample = mock.MagicMock(step=step)
+            sample.value.configure_mock(count=100, nbytes=1000, max=float(step), min=0.0)
+            my_reservoir.add_sample(sample)
+        steps = [sample.step for sample in my_reservoir.samples()]
+        assert len(steps) == 3
+        assert steps[-1] == 9
+
+
+class TestScalarReservoir:
+    """Test scalar reservoir."""
+    @staticmethod
+    def _add_samples(my_reservoir, steps):
+        """Add scalar samples of given steps."""
+        for step in steps:
+            my_reservoir.add_sample(reservoir.ScalarSample(wall_time=step + 0.5, step=step, value=step * 0.1,
+                                                           filename='file{}'.format(step % 3)))
+
+    def test_keep_recent_steps_and_spikes(self):
+        """Test recent steps are all kept, and spikes of early steps are kept after consolidation."""
+        my_reservoir = reservoir.ReservoirFactory().create_reservoir(reservoir.PluginNameEnum.SCALAR.value,
+                                                                     size=100)
+        assert isinstance(my_reservoir, reservoir.ScalarReservoir)
+        for step in range(1, 10001):
+            value = 100.0 if step == 1234 else float(step % 2)
+            my_reservoir.add_sample(reservoir.ScalarSample(wall_time=float(step), step=step, value=value,
+                                                           filename='file'))
+
+        samples = my_reservoir.samples()
+        assert len(samples) <= 100
+        steps = samples.steps.tolist()
+        assert steps == sorted(steps)
+        assert steps[0] == 1
+        assert steps[-40:] == list(range(9961, 10001))
+        assert samples.values.max() == 100.0
+        assert samples.values.min() == 0.0
+        assert my_reservoir.latest_step() == 10000
+
+    def test_remove_sample(self):
+        """Test removing samples."""
+        my_reservoir = reservoir.ScalarReservoir(size=0)
+        self._add_samples(my_reservoir, range(100))
+        assert my_reservoir.remove_sample(lambda sample: sample.filename != 'file0') == 34
+        assert [sample.step % 3 for sample in my_reservoir.samples()] == [1, 2] * 33
+
+    def test_restore_state(self):
+        """Test the state is restored."""
+        my_reservoir = reservoir.ScalarReservoir(size=10)
+        self._add_samples(my_reservoir, range(50))
+        restored_reservoir = reservoir.ScalarReservoir(size=10)
+        version = my_reservoir.version
+        restored_reservoir.restore_state(my_reservoir.get_state())
+        self._add_samples(my_reservoir, range(50, 60))
+        self._add_samples(restored_reservoir, range(50, 60))
+        assert list(restored_reservoir.samples()) == list(my_reservoir.samples())
+        # Changes before restoring are unknown.
+        assert restored_reservoir.samples_since(version).step_ranges is None
+
+    def test_samples_since(self):
+        """Test scalars got incrementally are the same as all the scalars, though they are consolidated."""
+        my_reservoir = reservoir.ScalarReservoir(size=50)
+        client_samples = []
+        version = 0
+        for step in range(1000):
+            self._add_samples(my_reservoir, [step])
+            if step % 5 == 0:
+                delta = my_reservoir.samples_since(version)
+                client_samples = _apply_delta(client_samples, delta)
+                assert client_samples == list(my_reservoir.samples())
+                version = delta.version
+
+        # Only the latest steps are changed, though earlier scalars are consolidated.
+        self._add_samples(my_reservoir, [1000, 1001])
+        delta = my_reservoir.samples_since(version)
+        assert delta.step_ranges[-1] == [996, 1001]
+        assert len(delta.samples) < 20
@@ -0,0 +1,73 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""
+Function:
+    Test mindinsight.datavisual.data_transform.summary_change_watcher.
+Usage:
+    pytest tests/ut/datavisual
+"""
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from mindinsight.datavisual.data_transform import summary_change_watcher
+from mindinsight.datavisual.data_transform.summary_change_watcher import SummaryChangeWatcher
+
+
+class TestSummaryChangeWatcher:
+    """Test summary change watcher."""
+
+    @pytest.fixture(autouse=True)
+    def change_watcher(self, monkeypatch):
+        """Start watching a temp summary base dir."""
+        monkeypatch.setattr(summary_change_watcher, 'DEBOUNCE_TIME', 0.05)
+        self.summary_base_dir = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.summary_base_dir, 'run1'))
+        self.watcher = SummaryChangeWatcher(self.summary_base_dir)
+        if not self.watcher.start():
+            shutil.rmtree(self.summary_base_dir)
+            pytest.skip("Inotify is not supported.")
+        yield
+        self.watcher.close()
+        shutil.rmtree(self.summary_base_dir)
+
+    def test_wait_file_changes(self):
+        """Test changes of files are translated to train ids."""
+        with open(os.path.join(self.summary_base_dir, 'run1', 'test.summary.1'), 'wb') as file:
+            file.write(b'summary')
+        with open(os.path.join(self.summary_base_dir, 'test.summary.1'), 'wb') as file:
+            file.write(b'summary')
+        assert self.watcher.wait_changes() == {'./run1', './'}
+
+    def test_wait_new_directory(self):
+        """Test new directory is watched."""
+        os.mkdir(os.path.join(self.summary_base_dir, 'run2'))
+        assert self.watcher.wait_changes() == {'./run2'}
+
+        with open(os.path.join(self.summary_base_dir, 'run2', 'test.summary.1'), 'wb') as file:
+            file.write(b'summary')
+        assert self.watcher.wait_changes() == {'./run2'}
+
+    def test_notify(self):
+        """Test train id notified is returned."""
+        self.watcher.notify('./run3')
+        assert self.watcher.wait_changes() == {'./run3'}
+
+    def test_full_reload(self, monkeypatch):
+        """Test None is returned when it is time to do a full reload."""
+        monkeypatch.setattr(summary_change_watcher, 'FULL_RELOAD_INTERVAL', 0)
+        assert self.watcher.wait_changes() is None
@@ -0,0 +1,127 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""
+Function:
+    Test mindinsight.datavisual.data_transform.summary_index.
+Usage:
+    pytest tests/ut/datavisual
+"""
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from mindinsight.datavisual.data_transform import summary_index as summary_index_module
+from mindinsight.datavisual.data_transform.summary_index import SummaryIndex
+
+FILE_CONTENT = bytes(range(100)) * 100
+
+
+class TestSummaryIndex:
+    """Test summary index."""
+
+    @pytest.fixture(autouse=True)
+    def summary_file(self):
+        """Create a summary file."""
+        summary_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(summary_dir, 'summary.01')
+        with open(self.file_path, 'wb') as file:
+            file.write(FILE_CONTENT)
+        yield
+        shutil.rmtree(summary_dir)
+
+    def _build_index(self):
+        """Index 10 records of 2 tags, and the last batch is not finished."""
+        summary_index = SummaryIndex(self.file_path)
+        summary_index.add_batch(500, 1000, [(offset, 100, offset // 100, 'loss', 'scalar')
+                                            for offset in range(500, 1000, 100)])
+        summary_index.add_batch(0, 500, [(offset, 100, offset // 100, 'loss', 'scalar')
+                                         for offset in range(0, 500, 100)])
+        summary_index.add_batch(0, 1000, [(0, 100, 0, 'image', 'image')])
+        summary_index.add_batch(2000, 2100, [(2000, 100, 20, 'loss', 'scalar')])
+        return summary_index
+
+    def test_save_and_load(self):
+        """Test the index saved is loaded, except the entries after the end offset."""
+        summary_index = self._build_index()
+        assert summary_index.end_offset == 1000
+        summary_index.save()
+
+        summary_index = SummaryIndex.load(self.file_path)
+        assert summary_index.end_offset == 1000
+        records = summary_index.select_records(lambda plugin_name: 0)
+        assert records == [(offset, 100) for offset in range(0, 1000, 100)]
+
+    def test_select_records(self):
+        """Test records are selected over the whole file, including the latest one."""
+        summary_index = SummaryIndex(self.file_path)
+        summary_index.add_batch(0, 1000, [(offset, 100, offset // 100, 'weight', 'histogram')
+                                          for offset in range(0, 1000, 100)])
+        summary_index.save()
+        records = summary_index.select_records(lambda plugin_name: 3)
+        assert records == [(0, 100), (400, 100), (900, 100)]
+
+    def test_select_all_scalar_records(self):
+        """Test all the records of scalars are selected, so the scalar reservoir keeps them as a cold load does."""
+        summary_index = self._build_index()
+        summary_index.save()
+        records = summary_index.select_records(lambda plugin_name: 3)
+        assert records == [(offset, 100) for offset in range(0, 1000, 100)]
+
+    def test_remove_old_indexes(self, monkeypatch):
+        """Test indexes of removed summary files and the least recently used ones are removed."""
+        file_paths = []
+        for index in range(4):
+            file_path = '{}.{}'.format(self.file_path, index)
+            shutil.copyfile(self.file_path, file_path)
+            summary_index = SummaryIndex(file_path)
+            summary_index.add_batch(0, 100, [(0, 100, 0, 'loss', 'scalar')])
+            summary_index.save()
+            index_path = os.path.splitext(summary_index.meta_path)[0]
+            for path in (index_path + '.meta', index_path + '.entries'):
+                os.utime(path, (index, index))
+            file_paths.append(file_path)
+        os.remove(file_paths[3])
+        monkeypatch.setattr(summary_index_module, 'MAX_INDEX_COUNT', 2)
+        SummaryIndex.load(file_paths[0])
+
+        summary_index = SummaryIndex(self.file_path)
+        summary_index.add_batch(0, 100, [(0, 100, 0, 'loss', 'scalar')])
+        summary_index.save()
+        kept_file_paths = [file_path for file_path in file_paths + [self.file_path]
+                           if os.path.exists(SummaryIndex(file_path).meta_path)]
+        assert kept_file_paths == [file_paths[0], self.file_path]
+        assert len(os.listdir(summary_index_module.get_index_dir())) == 4
+
+    def test_load_after_file_rewritten(self):
+        """Test the index is dropped when the summary file is rewritten."""
+        self._build_index().save()
+        with open(self.file_path, 'wb') as file:
+            file.write(FILE_CONTENT[::-1])
+
+        summary_index = SummaryIndex.load(self.file_path)
+        assert summary_index.end_offset == 0
+        assert not os.path.exists(summary_index.meta_path)
+
+    def test_load_after_file_truncated(self):
+        """Test the index is dropped when the summary file is truncated."""
+        self._build_index().save()
+        with open(self.file_path, 'wb') as file:
+            file.write(FILE_CONTENT[:800])
+
+        summary_index = SummaryIndex.load(self.file_path)
+        assert summary_index.end_offset == 0
+        assert summary_index.select_records(lambda plugin_name: 0) == []
@@ -115,3 +115,18 @@ class TestSummaryWatcher:
         summaries = summary_watcher.list_summaries(summary_base_dir, './\x00')
         assert not summaries
         shutil.rmtree(summary_base_dir)
+
+    def test_get_summary_directory(self):
+        """Test get_summary_directory method success."""
+        summary_base_dir = tempfile.mkdtemp()
+        file_count = 10
+        directory_count = 2
+        gen_directories_and_files(summary_base_dir, file_count, directory_count)
+
+        summary_watcher = SummaryWatcher()
+        directories = {directory['relative_path']: directory
+                       for directory in summary_watcher.list_summary_directories(summary_base_dir)}
+        assert summary_watcher.get_summary_directory(summary_base_dir, './') == directories['./']
+        assert summary_watcher.get_summary_directory(summary_base_dir, './run') == directories['./run']
+        assert summary_watcher.get_summary_directory(summary_base_dir, './not_exist') is None
+        shutil.rmtree(summary_base_dir)
@@ -13,6 +13,7 @@
 # limitations under the License.
 # ============================================================================
 """Test tensor container."""
+import pickle
 import unittest.mock as mock
 
 import numpy as np
@@ -51,5 +52,36 @@ class TestTensorContainer:
         statistics = TensorUtils.get_statistics_from_tensor(ndarray)
         buckets = tensor.calc_original_buckets(ndarray, statistics)
 
-        assert (buckets[0].left, buckets[0].width, buckets[0].count) == (1, 2, 2)
-        assert (buckets[1].left, buckets[1].width, buckets[1].count) == (3, 2, 3)
+        assert tuple(buckets[0]) == (1, 2, 2)
+        assert tuple(buckets[1]) == (3, 2, 3)
+
+    def test_pickle_large_tensor(self):
+        """Tests large tensor data is transferred through shared memory when pickled."""
+        mocked_input = mock.MagicMock()
+        mocked_input.float_data = np.arange(400000, dtype=np.float64)
+        mocked_input.dims = [400, 1000]
+        mocked_input.data_type = 11
+        tensor_container = tensor.TensorContainer(mocked_input)
+
+        pickled_container = pickle.dumps(tensor_container)
+        assert len(pickled_container) < tensor_container.ndarray.nbytes // 100
+        restored_container = pickle.loads(pickled_container)
+
+        assert restored_container.dims == (400, 1000)
+        assert np.array_equal(restored_container.ndarray, tensor_container.ndarray)
+        assert restored_container.max == tensor_container.max
+
+    def test_lazy_statistics(self):
+        """Tests statistics and histogram are calculated on first access."""
+        mocked_input = mock.MagicMock()
+        mocked_input.float_data = [1, 2, 3, 4, 5, 6]
+        mocked_input.dims = [2, 3]
+        with mock.patch.object(TensorUtils, 'get_statistics_from_tensor',
+                               wraps=TensorUtils.get_statistics_from_tensor) as mocked_get_statistics:
+            tensor_container = tensor.TensorContainer(mocked_input)
+            assert not mocked_get_statistics.called
+
+            assert (tensor_container.max, tensor_container.min, tensor_container.count) == (6, 1, 6)
+            assert tensor_container.stats.avg == 3.5
+            assert tensor_container.histogram is tensor_container.histogram
+            assert mocked_get_statistics.call_count == 1
@@ -136,6 +136,26 @@ class TestGraphProcessor:
         expected_file_path = os.path.join(self.graph_results_dir, result_file)
         compare_result_with_file(results, expected_file_path)
 
+    @pytest.mark.usefixtures('load_graph_record')
+    def test_get_nodes_of_every_scope(self):
+        """Test nodes listed by scope are the children of the scope, after nodes are renamed too."""
+        graph_processor = GraphProcessor(self._train_id, self._mock_data_manager)
+        graph = graph_processor._graph
+        for scope in {node.scope for node in graph._normal_node_map.values()}:
+            expected_nodes = [node.to_dict() for node in graph._normal_node_map.values() if node.scope == scope]
+            assert graph_processor.list_nodes(scope or None)['nodes'] == expected_nodes
+
+        nodes = graph_processor.list_nodes(None)['nodes']
+        nodes[0]['watched'] = True
+        assert 'watched' not in graph_processor.list_nodes(None)['nodes'][0]
+
+        leaf_node = next(node for node in graph._leaf_nodes.values() if node.scope)
+        origin_name = leaf_node.name
+        graph._update_node_name_of_cache(leaf_node, f'{leaf_node.scope}/renamed')
+        node_names = [node['name'] for node in graph_processor.list_nodes(leaf_node.scope)['nodes']]
+        assert f'{leaf_node.scope}/renamed' in node_names
+        assert origin_name not in node_names
+
     @pytest.mark.usefixtures('load_graph_record')
     @pytest.mark.parametrize("search_content, result_file",
                              [(None, 'test_search_node_names_with_search_content_expected_results1.json'),
@@ -111,3 +111,18 @@ class TestHistogramProcessor:
         for recv_values, expected_values in zip(recv_metadata, self._histograms):
             assert recv_values.get('wall_time') == expected_values.get('wall_time')
             assert recv_values.get('step') == expected_values.get('step')
+
+    @pytest.mark.usefixtures('load_histogram_record')
+    def test_get_histograms_columnar(self):
+        """Get histogram data as columns."""
+        processor = HistogramProcessor(self._mock_data_manager)
+        histograms = processor.get_histograms(self._train_id, self._complete_tag_name).get('histograms')
+        columns = processor.get_histograms(self._train_id, self._complete_tag_name, columnar=True).get('histograms')
+
+        assert columns['step'].tolist() == [histogram['step'] for histogram in histograms]
+        assert columns['wall_time'].tolist() == [histogram['wall_time'] for histogram in histograms]
+        bucket_offsets = columns['bucket_offsets']
+        assert len(bucket_offsets) == len(histograms) + 1
+        for index, histogram in enumerate(histograms):
+            buckets = columns['buckets'][bucket_offsets[index]:bucket_offsets[index + 1]]
+            assert buckets.tolist() == [list(bucket) for bucket in histogram['buckets']]
@@ -27,8 +27,10 @@ from mindinsight.datavisual.common.enums import PluginNameEnum
 from mindinsight.datavisual.common.exceptions import TrainJobNotExistError
 from mindinsight.datavisual.common.exceptions import ScalarNotExistError
 from mindinsight.datavisual.data_transform import data_manager
+from mindinsight.datavisual.data_transform.reservoir import ScalarReservoir, ScalarSample
 from mindinsight.datavisual.processors.scalars_processor import ScalarsProcessor
 from mindinsight.datavisual.utils import crc32
+from mindinsight.utils.exceptions import ParamValueError
 
 from ....utils.log_operations import LogOperations
 from ....utils.tools import delete_files_or_dirs
@@ -128,3 +130,67 @@ class TestScalarsProcessor:
             assert recv_values.get('wall_time') == expected_values.get('wall_time')
             assert recv_values.get('step') == expected_values.get('step')
             assert abs(recv_values.get('value') - expected_values.get('value')) < 1e-6
+
+    def test_get_scalars_with_max_points(self):
+        """Get scalars downsampled by max points."""
+        scalar_reservoir = ScalarReservoir(size=0)
+        for step in range(1000):
+            value = 100.0 if step == 500 else float(step % 10)
+            scalar_reservoir.add_sample(ScalarSample(wall_time=float(step), step=step, value=value, filename='file'))
+        mock_data_manager = Mock()
+        mock_data_manager.list_tensors.side_effect = lambda train_id, tag: scalar_reservoir.samples()
+
+        scalar_processor = ScalarsProcessor(mock_data_manager)
+        values = scalar_processor.get_scalars(['./run'], [self._complete_tag_name], max_points='50')[0]['values']
+        assert len(values) <= 50
+        steps = [value['step'] for value in values]
+        assert steps == sorted(steps)
+        assert {0, 500, 999}.issubset(steps)
+        assert max(value['value'] for value in values) == 100.0
+
+        metadatas = scalar_processor.get_metadata_list('./run', self._complete_tag_name, 50)['metadatas']
+        assert [metadata['step'] for metadata in metadatas] == steps
+
+        metadatas = scalar_processor.get_metadata_list('./run', self._complete_tag_name, 50,
+                                                       start_step='490', end_step='510')['metadatas']
+        assert [metadata['step'] for metadata in metadatas] == list(range(490, 511))
+
+        columns = scalar_processor.get_scalars(['./run'], [self._complete_tag_name], max_points='50',
+                                               columnar=True)[0]['values']
+        assert columns['step'].tolist() == steps
+        assert columns['value'].tolist() == [value['value'] for value in values]
+
+        with pytest.raises(ParamValueError):
+            scalar_processor.get_scalars(['./run'], [self._complete_tag_name], max_points=1)
+        with pytest.raises(ParamValueError):
+            scalar_processor.get_scalars(['./run'], [self._complete_tag_name], start_step=10, end_step=1)
+
+    def test_get_scalars_since_version(self):
+        """Get scalars changed since the version of the previous response."""
+        scalar_reservoir = ScalarReservoir(size=0)
+        mock_data_manager = Mock()
+        mock_data_manager.list_tensors_since.side_effect = \
+            lambda train_id, tag, version: scalar_reservoir.samples_since(version)
+        scalar_processor = ScalarsProcessor(mock_data_manager)
+        for step in range(10):
+            scalar_reservoir.add_sample(ScalarSample(wall_time=float(step), step=step, value=0.5, filename='file'))
+
+        scalar = scalar_processor.get_scalars(['./run'], [self._complete_tag_name], since_version='0')[0]
+        assert scalar['reset']
+        assert [value['step'] for value in scalar['values']] == list(range(10))
+
+        for step in (10, 11):
+            scalar_reservoir.add_sample(ScalarSample(wall_time=float(step), step=step, value=0.5, filename='file'))
+        delta_scalar = scalar_processor.get_scalars(['./run'], [self._complete_tag_name],
+                                                    since_version=scalar['version'])[0]
+        assert not delta_scalar['reset']
+        assert delta_scalar['step_ranges'] == [[10, 11]]
+        assert [value['step'] for value in delta_scalar['values']] == [10, 11]
+
+        # Changed scalars are more than max points, so all of them are downsampled.
+        for step in range(12, 20):
+            scalar_reservoir.add_sample(ScalarSample(wall_time=float(step), step=step, value=0.5, filename='file'))
+        delta_scalar = scalar_processor.get_scalars(['./run'], [self._complete_tag_name], max_points=4,
+                                                    since_version=delta_scalar['version'])[0]
+        assert delta_scalar['reset']
+        assert len(delta_scalar['values']) <= 4
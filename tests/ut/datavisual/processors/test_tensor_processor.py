@@ -187,6 +187,21 @@ class TestTensorProcessor:
                 assert recv_tensor.shape == expected_tensor.shape
                 assert np.allclose(recv_tensor, expected_tensor, rtol=1e-6)
 
+    @pytest.mark.usefixtures('load_tensor_record')
+    def test_get_tensor_data_columnar(self):
+        """Get tensor data as array."""
+        processor = TensorProcessor(self._mock_data_manager)
+        results = processor.get_tensors([self._train_id], [self._complete_tag_name], step='1', dims='[0,0,:-1,:]',
+                                        detail='data', columnar=True)
+        expected_results = processor.get_tensors([self._train_id], [self._complete_tag_name], step='1',
+                                                 dims='[0,0,:-1,:]', detail='data')
+
+        recv_value = results.get('tensors')[0].get('values')[0].get('value')
+        expected_value = expected_results.get('tensors')[0].get('values')[0].get('value')
+        assert isinstance(recv_value.get('data'), np.ndarray)
+        assert recv_value.get('data').tolist() == expected_value.get('data')
+        assert recv_value.get('statistics') == expected_value.get('statistics')
+
     @pytest.mark.usefixtures('load_tensor_record')
     def test_get_tensor_stats_success(self):
         """Get tensor stats success."""
@@ -228,7 +243,7 @@ class TestTensorProcessor:
             expected_buckets = calc_original_buckets(expected_data, expected_statistic)
             recv_buckets = recv_values.get('value').get("histogram_buckets")
 
-            for recv_bucket, expected_bucket in zip(recv_buckets, expected_buckets):
-                assert recv_bucket[0] - expected_bucket.left < 1e-6
-                assert recv_bucket[1] - expected_bucket.width < 1e-6
-                assert recv_bucket[2] - expected_bucket.count <= 1
+            for recv_bucket, (left, width, count) in zip(recv_buckets, expected_buckets):
+                assert recv_bucket[0] - left < 1e-6
+                assert recv_bucket[1] - width < 1e-6
+                assert recv_bucket[2] - count <= 1
@@ -0,0 +1,80 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""
+Function:
+    Test mindinsight.datavisual.utils.columnar.
+Usage:
+    pytest tests/ut/datavisual
+"""
+import numpy as np
+import pytest
+
+from mindinsight.datavisual.utils import columnar
+
+
+class TestColumnar:
+    """Test columnar encoding."""
+
+    def test_encode_and_decode(self):
+        """Test arrays in the document are encoded as aligned typed arrays and restored."""
+        document = {
+            'scalars': [{
+                'train_id': './run',
+                'tag': 'loss',
+                'values': {
+                    'wall_time': np.array([1.5, 2.5, 3.5]),
+                    'step': np.array([1, 2, 3], dtype=np.int64),
+                    'value': np.array([0.5, np.nan, np.inf]),
+                },
+            }],
+            'data': np.arange(6, dtype='>f4').reshape(2, 3),
+            'mask': np.array([True, False]),
+            'empty': np.array([], dtype=np.float64),
+            'count': np.int64(3),
+        }
+        encoded = columnar.encode(document)
+        decoded = columnar.decode(encoded)
+
+        values = decoded['scalars'][0]['values']
+        assert decoded['scalars'][0]['tag'] == 'loss'
+        assert values['step'].dtype == np.int64
+        assert values['step'].tolist() == [1, 2, 3]
+        assert values['wall_time'].tolist() == [1.5, 2.5, 3.5]
+        assert np.array_equal(values['value'], document['scalars'][0]['values']['value'], equal_nan=True)
+        assert decoded['data'].dtype == np.dtype('<f4')
+        assert np.array_equal(decoded['data'], document['data'])
+        assert decoded['mask'].dtype == np.uint8
+        assert decoded['mask'].tolist() == [1, 0]
+        assert decoded['empty'].shape == (0,)
+        assert decoded['count'] == 3
+
+        # Arrays view the encoded bytes after the header, aligned to 8 bytes.
+        header_end = 16 + int.from_bytes(encoded[12:16], 'little')
+        encoded_address = np.frombuffer(encoded, dtype=np.uint8).ctypes.data
+        for array in (values['wall_time'], values['step'], values['value'], decoded['data']):
+            offset = array.ctypes.data - encoded_address
+            assert offset >= header_end and offset % 8 == 0
+
+    def test_encode_unsupported_array(self):
+        """Test arrays which can not be viewed as typed arrays are rejected."""
+        with pytest.raises(ValueError):
+            columnar.encode({'names': np.array(['a', 'b'])})
+
+    def test_decode_invalid_bytes(self):
+        """Test bytes not encoded in columnar format are rejected."""
+        with pytest.raises(ValueError):
+            columnar.decode(b'{"scalars": []}')
+        with pytest.raises(ValueError):
+            columnar.decode(b'{"scalars": [], "tag": "loss"}')
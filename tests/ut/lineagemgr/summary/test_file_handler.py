@@ -13,7 +13,10 @@
 # limitations under the License.
 # ============================================================================
 """Test file_handler.py."""
-from unittest import mock, TestCase
+import os
+import shutil
+import tempfile
+from unittest import TestCase
 
 from mindinsight.lineagemgr.summary.file_handler import FileHandler
 
@@ -21,11 +24,15 @@ from mindinsight.lineagemgr.summary.file_handler import FileHandler
 class TestFileHandler(TestCase):
     """Test file_handler.py"""
 
-    @mock.patch("os.path.getsize", return_value=12)
-    @mock.patch("builtins.open")
-    def setUp(self, *args):
-        args[0].return_value.__enter__.return_value.read.return_value = b'\x0a\x0b\x0c' * 4
-        self.file_handler = FileHandler("fake_path.log")
+    def setUp(self):
+        self.summary_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.summary_dir, "fake_path.log")
+        with open(self.file_path, 'wb') as file:
+            file.write(b'\x0a\x0b\x0c' * 4)
+        self.file_handler = FileHandler(self.file_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.summary_dir)
 
     def test_seek(self):
         """Test seek method."""
@@ -43,7 +50,38 @@ class TestFileHandler(TestCase):
         res = self.file_handler.read(3, 1)
         self.assertEqual(res, b'\x0b\x0c\x0a')
 
+    def test_read_beyond_size(self):
+        """Test read method does not return bytes appended after the file handler is created."""
+        with open(self.file_path, 'ab') as file:
+            file.write(b'\x0d' * 3)
+        res = self.file_handler.read(6, 9)
+        self.assertEqual(res, b'\x0a\x0b\x0c')
+        self.assertEqual(self.file_handler.tell(), 15)
+
     def test_size(self):
         """Test size property."""
         size = self.file_handler.size
         self.assertEqual(size, 12)
+
+    def test_read_truncated_file(self):
+        """Test read method does not access the pages beyond the end of a truncated file."""
+        res = self.file_handler.read(3)
+        with open(self.file_path, 'r+b') as file:
+            file.truncate(6)
+        self.assertEqual(self.file_handler.read(3, 3), b'\x0a\x0b\x0c')
+        self.assertEqual(self.file_handler.read(3, 6), b'')
+        self.assertEqual(res, b'\x0a\x0b\x0c')
+
+    def test_close(self):
+        """Test close method closes the memory mapping once the bytes read are released."""
+        res = self.file_handler.read(3)
+        mapped_file = self.file_handler._reader._mmap
+        self.file_handler.close()
+        self.assertFalse(mapped_file.closed)
+        self.assertEqual(res, b'\x0a\x0b\x0c')
+
+        res = self.file_handler.read(3)
+        mapped_file = self.file_handler._reader._mmap
+        del res
+        self.file_handler.close()
+        self.assertTrue(mapped_file.closed)
@@ -0,0 +1,116 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""
+Function:
+    Test mindinsight.utils.computing_resource_mgr.
+Usage:
+    pytest tests/ut/utils
+"""
+import os
+import signal
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+from mindinsight.utils.computing_resource_mgr import ComputingResourceManager, TaskPriority
+
+
+class TestComputingResourceManager:
+    """Test computing resource manager."""
+
+    def test_lease_executor(self):
+        """Test leased executors reuse the worker processes."""
+        with ComputingResourceManager(max_processes_cnt=2) as mgr:
+            pids = set()
+            for _ in range(3):
+                with mgr.lease_executor() as executor:
+                    future = executor.submit(os.getpid)
+                    future.add_done_callback(lambda future_value: pids.add(future_value.result()))
+                    executor.wait_all_tasks_finish()
+            metrics = mgr.get_metrics()
+
+        assert len(pids) <= 2
+        assert metrics['finished_tasks'] == 3
+        assert metrics['running_tasks'] == 0
+        assert metrics['queue_depth'] == 0
+        assert metrics['restarts'] == 0
+
+    def test_wait_for_callbacks(self):
+        """Test waiting for tasks returns after their callbacks return."""
+        results = []
+
+        def slow_callback(future_value):
+            time.sleep(0.5)
+            results.append(future_value.result())
+
+        with ComputingResourceManager(max_processes_cnt=1) as mgr:
+            with mgr.lease_executor() as executor:
+                executor.submit(os.getpid).add_done_callback(slow_callback)
+                executor.wait_all_tasks_finish()
+                assert len(results) == 1
+
+    def test_background_tasks_keep_one_worker(self):
+        """Test background tasks can not use the last worker, which is kept for foreground tasks."""
+        with ComputingResourceManager(max_processes_cnt=2) as mgr:
+            with mgr.lease_executor() as executor:
+                with executor.priority(TaskPriority.BACKGROUND):
+                    executor.submit(time.sleep, 0.5).add_done_callback(lambda future: future.result())
+                    # pylint: disable=protected-access
+                    assert not executor._background_slots.acquire(blocking=False)
+                assert executor._slots.acquire(blocking=False)
+                executor.release_slot()
+
+                executor.wait_all_tasks_finish()
+                assert executor._background_slots.acquire(blocking=False)
+                executor._background_slots.release()
+
+    def test_restart_dead_workers(self):
+        """Test worker processes are restarted after one of them is killed."""
+        pids = []
+        with ComputingResourceManager(max_processes_cnt=1) as mgr:
+            with mgr.lease_executor() as executor:
+                executor.submit(os.getpid).add_done_callback(lambda future: pids.append(future.result()))
+                executor.wait_all_tasks_finish()
+            os.kill(pids[0], signal.SIGKILL)
+
+            # The task fails if it is submitted before the pool is found broken, else it is resubmitted.
+            with mgr.lease_executor() as executor:
+                executor.submit(os.getpid).add_done_callback(lambda future: future.exception())
+                executor.wait_all_tasks_finish()
+
+            with mgr.lease_executor() as executor:
+                executor.submit(os.getpid).add_done_callback(lambda future: pids.append(future.result()))
+                executor.wait_all_tasks_finish()
+            assert mgr.check_health()
+            assert mgr.get_metrics()['restarts'] == 1
+
+        assert pids[1] != pids[0]
+
+    def test_restart_after_task_failed_for_dead_worker(self):
+        """Test worker processes are restarted after a running task fails as its worker is killed."""
+        pids = []
+        errors = []
+        with ComputingResourceManager(max_processes_cnt=1) as mgr:
+            with mgr.lease_executor() as executor:
+                executor.submit(os.getpid).add_done_callback(lambda future: pids.append(future.result()))
+                executor.wait_all_tasks_finish()
+                executor.submit(time.sleep, 10).add_done_callback(lambda future: errors.append(future.exception()))
+                time.sleep(0.5)
+                os.kill(pids[0], signal.SIGKILL)
+                executor.wait_all_tasks_finish()
+
+            assert isinstance(errors[0], BrokenProcessPool)
+            assert not mgr.check_health()
+            assert mgr.check_health()
+            assert mgr.get_metrics()['restarts'] == 1
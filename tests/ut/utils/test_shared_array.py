@@ -0,0 +1,55 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""
+Function:
+    Test mindinsight.utils.shared_array.
+Usage:
+    pytest tests/ut/utils
+"""
+import gc
+import os
+import pickle
+
+import numpy as np
+
+from mindinsight.utils.shared_array import SharedArray, from_shared, to_shared
+
+
+class TestSharedArray:
+    """Test shared array."""
+
+    def test_transfer_large_array(self):
+        """Test large array is transferred through shared memory, and the segment is unlinked once attached."""
+        array = np.arange(300000, dtype=np.float32).reshape(300, 1000)
+        shared_array = pickle.loads(pickle.dumps(to_shared(array)))
+        assert isinstance(shared_array, SharedArray)
+        assert os.path.exists(os.path.join('/dev/shm', shared_array.name.lstrip('/')))
+
+        restored_array = from_shared(shared_array)
+        assert not os.path.exists(os.path.join('/dev/shm', shared_array.name.lstrip('/')))
+        del shared_array
+        gc.collect()
+
+        assert restored_array.dtype == np.float32
+        assert np.array_equal(restored_array, array)
+        # The copy is private.
+        restored_array[0, 0] = -1
+        assert array[0, 0] == 0
+
+    def test_transfer_small_array(self):
+        """Test small array is pickled."""
+        array = np.arange(10)
+        assert to_shared(array) is array
+        assert from_shared(array) is array